@@ -1,15 +1,31 @@
 import os
+from contextlib import contextmanager
 from dotenv import load_dotenv
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional
 
 import duckdb
 
 
-def connect(read_only: bool = False) -> duckdb.DuckDBPyConnection:
+@lru_cache(maxsize=None)
+def database_path() -> Optional[str]:
+    """DUCKDB_PATH from the environment or .env, read once per process."""
     load_dotenv()
-    DUCKDB_PATH: Optional[str] = os.getenv("DUCKDB_PATH")
+    return os.getenv("DUCKDB_PATH")
 
-    print(f"DEBUG: DUCKDB_PATH = {DUCKDB_PATH}")  
-    print(f"DEBUG: .env loaded from: {os.getcwd()}") 
 
-    return duckdb.connect(database=DUCKDB_PATH, read_only=read_only)
\ No newline at end of file
+def connect(read_only: bool = False, config: Optional[Dict[str, Any]] = None) -> duckdb.DuckDBPyConnection:
+    return duckdb.connect(database=database_path(), read_only=read_only, config=config or {})
+
+
+@contextmanager
+def connection(conn: Optional[duckdb.DuckDBPyConnection] = None) -> Iterator[duckdb.DuckDBPyConnection]:
+    """Use conn if the caller passed one (and leave it open), otherwise open and close a new one."""
+    if conn is not None:
+        yield conn
+        return
+    conn = connect()
+    try:
+        yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,128 @@
+# data/assets/fetch_retry.py
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+
+# (attempts allowed, seconds before the first retry); the wait doubles after each attempt
+RETRY_POLICY: Dict[str, Tuple[int, float]] = {
+    "timeout": (4, 3600),
+    "network": (4, 3600),          # Connection refused, DNS failures
+    "server_error": (4, 3600),     # 5xx, and 429 Too Many Requests
+    "blocked": (2, 86400),         # 401/402/403/451: bot protection and paywalls
+    "client_error": (1, 0),        # Other 4xx, e.g. 404: the page is gone
+    "parse_error": (2, 86400),
+    "other": (3, 3600),
+}
+MAX_BACKOFF = 7 * 86400
+
+# Failures that say something about the whole site rather than one page, and so count
+# towards a domain's circuit breaker
+DOMAIN_FAILURES = {"timeout", "network", "server_error", "blocked"}
+# Stories skipped because their domain's circuit was open are tried again after this,
+# without using up an attempt
+CIRCUIT_OPEN = "circuit_open"
+CIRCUIT_COOLDOWN = 3600
+
+STATUS_RE = re.compile(r"\b([45]\d\d) (?:Client|Server) Error")
+BLOCKED_STATUSES = {401, 402, 403, 451}
+
+# Stories to fetch: never fetched, or failed with a retry due. Failed rows with no
+# fetch_retry row predate retries and are tried once more.
+FETCH_DUE_QUERY = """
+    SELECT s.id, s.url
+    FROM stage_story s
+    LEFT JOIN stage_newspaper n ON n.media_cloud_id = s.id
+    WHERE (n.media_cloud_id IS NULL OR NOT n.success)
+    AND NOT EXISTS (
+        SELECT 1 FROM fetch_retry r
+        WHERE r.media_cloud_id = s.id
+        AND (r.next_attempt_at IS NULL OR r.next_attempt_at > current_localtimestamp())
+    )
+"""
+
+
+def ensure_fetch_retry_table(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS fetch_retry (
+            media_cloud_id   VARCHAR   PRIMARY KEY,
+            error_class      VARCHAR   NOT NULL,   -- A RETRY_POLICY key, or circuit_open
+            error            VARCHAR,
+            attempts         INTEGER   NOT NULL,
+            next_attempt_at  TIMESTAMP,            -- NULL once out of attempts
+            updated_at       TIMESTAMP NOT NULL
+        )
+    """)
+
+
+def classify_error(error: Optional[str]) -> str:
+    """RETRY_POLICY class for a download error message, as fetch_story reports them."""
+    error = error or ""
+    if error.startswith("CircuitOpen"):
+        return CIRCUIT_OPEN
+    match = STATUS_RE.search(error)
+    if match:
+        status = int(match.group(1))
+        if status in BLOCKED_STATUSES:
+            return "blocked"
+        if status >= 500 or status == 429:
+            return "server_error"
+        return "client_error"
+    lowered = error.lower()
+    if "timed out" in lowered or "timeout" in lowered:
+        return "timeout"
+    if "connection" in lowered or "resolve" in lowered or "max retries exceeded" in lowered:
+        return "network"
+    return "other"
+
+
+def classify_failure(html: Optional[str], article: Dict) -> Optional[str]:
+    """None for a successful article, otherwise why it failed."""
+    if article.get("success"):
+        return None
+    if html:
+        return "parse_error"
+    return classify_error(article.get("error"))
+
+
+def next_attempt(error_class: str, attempts: int, now: datetime) -> Optional[datetime]:
+    """When to try again after `attempts` tries failed with error_class, or None to give up."""
+    if error_class == CIRCUIT_OPEN:
+        return now + timedelta(seconds=CIRCUIT_COOLDOWN)
+    max_attempts, base = RETRY_POLICY.get(error_class, RETRY_POLICY["other"])
+    if attempts >= max_attempts:
+        return None
+    return now + timedelta(seconds=min(base * 2 ** (attempts - 1), MAX_BACKOFF))
+
+
+def record_fetch_results(
+    conn: duckdb.DuckDBPyConnection,
+    results: List[Tuple[str, Optional[str], Optional[str]]],
+) -> None:
+    """Update retry state for (media_cloud_id, error_class, error) results; error_class
+    None means the story succeeded and needs no more retries."""
+    if not results:
+        return
+    ensure_fetch_retry_table(conn)
+    ids = [media_cloud_id for media_cloud_id, _, _ in results]
+    previous = dict(conn.execute(
+        "SELECT media_cloud_id, attempts FROM fetch_retry WHERE media_cloud_id IN (SELECT UNNEST(?))",
+        [ids]
+    ).fetchall())
+
+    now = datetime.now()
+    succeeded = [media_cloud_id for media_cloud_id, error_class, _ in results if error_class is None]
+    rows = []
+    for media_cloud_id, error_class, error in results:
+        if error_class is None:
+            continue
+        attempts = previous.get(media_cloud_id, 0)
+        if error_class != CIRCUIT_OPEN:
+            attempts += 1
+        rows.append([media_cloud_id, error_class, error, attempts, next_attempt(error_class, attempts, now), now])
+
+    if succeeded:
+        conn.execute("DELETE FROM fetch_retry WHERE media_cloud_id IN (SELECT UNNEST(?))", [succeeded])
+    if rows:
+        conn.executemany("INSERT OR REPLACE INTO fetch_retry VALUES (?, ?, ?, ?, ?, ?)", rows)
@@ -0,0 +1,121 @@
+# data/assets/fetch_scheduler.py
+import heapq
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+def domain_of(url: str) -> str:
+    """Host name used for politeness, without a leading www."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads sharing it."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_time)
+            self.next_time = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class DomainScheduler:
+    """Runs fetches on a bounded thread pool, never hitting the same domain twice at once
+    and waiting `domain_delay` seconds after each fetch before the next one to that domain.
+
+    Items are (key, url, ...) tuples. Results are yielded on the calling thread, so the
+    caller can write to DuckDB without sharing the connection across threads.
+
+    With breaker_threshold set, a domain whose last breaker_threshold fetches all failed
+    (as judged by run's `failed`) is given up on for the scheduler's lifetime: its
+    remaining items, and its items in later calls to run, are yielded with skipped(item)
+    as their result instead of being fetched.
+    """
+
+    def __init__(self, concurrency: int = 8, domain_delay: float = 2.0, breaker_threshold: int = 0):
+        self.concurrency = max(1, concurrency)
+        self.domain_delay = domain_delay
+        self.breaker_threshold = breaker_threshold
+        # Consecutive failures per domain, and domains given up on, with how many items they skipped
+        self.failures: Dict[str, int] = {}
+        self.open_domains: Dict[str, int] = {}
+
+    def run(
+        self,
+        items: Iterable[Tuple[Any, ...]],
+        fetch: Callable[[Tuple[Any, ...]], Any],
+        failed: Optional[Callable[[Any], bool]] = None,
+        skipped: Optional[Callable[[Tuple[Any, ...]], Any]] = None,
+    ) -> Iterator[Tuple[Tuple[Any, ...], Any]]:
+        queues: Dict[str, Deque[Tuple[Any, ...]]] = {}
+        for item in items:
+            domain = domain_of(item[1])
+            if domain in self.open_domains:
+                # Tripped in an earlier run on this scheduler
+                self.open_domains[domain] += 1
+                yield item, skipped(item) if skipped else None
+                continue
+            queues.setdefault(domain, deque()).append(item)
+
+        # (time the domain may be hit again, tie breaker, domain)
+        ready: List[Tuple[float, int, str]] = []
+        seq = 0
+        for domain in queues:
+            ready.append((0.0, seq, domain))
+            seq += 1
+        heapq.heapify(ready)
+
+        in_flight: Dict[Future, Tuple[str, Tuple[Any, ...]]] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while ready or in_flight:
+                now = time.monotonic()
+                while len(in_flight) < self.concurrency and ready and ready[0][0] <= now:
+                    _, _, domain = heapq.heappop(ready)
+                    item = queues[domain].popleft()
+                    in_flight[pool.submit(fetch, item)] = (domain, item)
+
+                if not in_flight:
+                    time.sleep(max(0.0, ready[0][0] - now))
+                    continue
+
+                timeout = None
+                if ready and len(in_flight) < self.concurrency:
+                    timeout = max(0.0, ready[0][0] - now)
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    domain, item = in_flight.pop(future)
+                    result = future.result()
+                    tripped = failed is not None and self.trip(domain, failed(result))
+                    if queues[domain] and not tripped:
+                        heapq.heappush(ready, (time.monotonic() + self.domain_delay, seq, domain))
+                        seq += 1
+                    yield item, result
+
+                    if tripped:
+                        self.open_domains[domain] = len(queues[domain])
+                        print(f"    [warn] Giving up on {domain} after {self.breaker_threshold} failures "
+                              f"in a row, skipping {len(queues[domain])} more items")
+                        while queues[domain]:
+                            skipped_item = queues[domain].popleft()
+                            yield skipped_item, skipped(skipped_item) if skipped else None
+
+    def trip(self, domain: str, failure: bool) -> bool:
+        """Count a fetch for the circuit breaker; True when it opens the domain's circuit."""
+        if not failure:
+            self.failures[domain] = 0
+            return False
+        self.failures[domain] = self.failures.get(domain, 0) + 1
+        return 0 < self.breaker_threshold <= self.failures[domain] and domain not in self.open_domains
@@ -1,16 +1,17 @@
 # projects/usaid-media/get_media_cloud.py
 import os
+import threading
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from typing import Any, Dict, List, Optional, Tuple
 
 import duckdb
-import pandas as pd
-from pathlib import Path
-import mediacloud.api
 
-from .db_connection import connect ## for Dagster
-##from db_connection import connect  ## For F5
+from .db_connection import connection ## for Dagster
+##from db_connection import connection  ## For F5
+from .fetch_scheduler import RateLimiter
+from .metrics import StageMetrics
 
 load_dotenv()
 
@@ -34,80 +35,250 @@ def parse_date(date_str: Optional[str]) -> Optional[dt.datetime]:
     return None
 
 
-def get_media_cloud_stories(conn: duckdb.DuckDBPyConnection) -> List[Dict[str, Any]]:
-    search_api: mediacloud.api.SearchApi = mediacloud.api.SearchApi(os.environ['MEDIACLOUD_API_KEY'])
-
-    collection_ids: List[int] = [
-        34412234,   # United States - National
-        262985232,  # US College Papers
-        262985236,  # US Most Visited New Online (Mar 2025)
-        186572435,  # U.S. Top Newspapers 2018
-        186572516,  # U.S. Top Sources 2018
-        231013063,  # Tweeted Mostly by Democrat Voters 2018
-        231013089,  # Tweeted Somewhat More by Democrat Voters 2018
-        231013108,  # Tweeted Evenly by Republican/Democrat Voters 2018
-        231013109,  # Tweeted Somewhat More by Republican Voters 2018
-        231013110,  # Tweeted Mostly by Republican Voters 2018
-    ]
-    terms: List[str] = ["opensecrets"]
-    ored_terms: str = " OR ".join(f'"{term}"' for term in terms)
+COLLECTION_IDS: List[int] = [
+    34412234,   # United States - National
+    262985232,  # US College Papers
+    262985236,  # US Most Visited New Online (Mar 2025)
+    186572435,  # U.S. Top Newspapers 2018
+    186572516,  # U.S. Top Sources 2018
+    231013063,  # Tweeted Mostly by Democrat Voters 2018
+    231013089,  # Tweeted Somewhat More by Democrat Voters 2018
+    231013108,  # Tweeted Evenly by Republican/Democrat Voters 2018
+    231013109,  # Tweeted Somewhat More by Republican Voters 2018
+    231013110,  # Tweeted Mostly by Republican Voters 2018
+]
+TERMS: List[str] = ["opensecrets"]
+
+
+def ensure_checkpoint_table(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS media_cloud_checkpoint (
+            shard_key        VARCHAR   PRIMARY KEY,
+            collection_ids   VARCHAR   NOT NULL,
+            start_date       DATE      NOT NULL,
+            end_date         DATE      NOT NULL,
+            pagination_token VARCHAR,
+            pages_done       INTEGER   NOT NULL DEFAULT 0,
+            stories_seen     INTEGER   NOT NULL DEFAULT 0,
+            completed        BOOLEAN   NOT NULL DEFAULT FALSE,
+            updated_at       TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def plan_shards(
+    start_date: dt.date,
+    end_date: dt.date,
+    window_days: int = 7,
+    shard_by_collection: bool = False,
+) -> List[Dict[str, Any]]:
+    """Split the search into date windows, and optionally one shard per collection."""
+    collection_groups = [[c] for c in COLLECTION_IDS] if shard_by_collection else [COLLECTION_IDS]
+    shards = []
+    window_start = start_date
+    while window_start <= end_date:
+        window_end = min(window_start + dt.timedelta(days=window_days - 1), end_date)
+        for collections in collection_groups:
+            collection_ids = ",".join(str(c) for c in collections)
+            label = collection_ids if shard_by_collection else "all"
+            shards.append({
+                "shard_key": f"{window_start}:{window_end}:{label}",
+                "collection_ids": collection_ids,
+                "start_date": window_start,
+                "end_date": window_end,
+            })
+        window_start = window_end + dt.timedelta(days=1)
+    return shards
 
-    max_date_str = conn.execute("SELECT MAX(publish_date) FROM stage_story").fetchone()[0]
-    # start_date = dt.date(2024, 9, 26) To backfill.. 
-    start_date = dt.datetime.strptime(max_date_str, '%Y-%m-%d').date()   #!
-    end_date: dt.date = dt.date.today()    
-    print(f"Searching for stories from {start_date} to {end_date}")
 
-    all_stories: List[Dict[str, Any]] = []
-    more_stories: bool = True
-    pagination_token: Optional[str] = None
+def register_shards(conn: duckdb.DuckDBPyConnection, shards: List[Dict[str, Any]]) -> List[Tuple]:
+    """Record planned shards and return every unfinished one, including those left
+    over from an interrupted run.
 
+    A finished shard whose window had not closed when it ran is harvested again.
+    """
+    conn.executemany("""
+        INSERT INTO media_cloud_checkpoint (shard_key, collection_ids, start_date, end_date)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (shard_key) DO UPDATE SET
+            pagination_token = NULL,
+            pages_done = 0,
+            stories_seen = 0,
+            completed = FALSE,
+            updated_at = now()
+        WHERE media_cloud_checkpoint.completed
+          AND media_cloud_checkpoint.end_date >= CAST(media_cloud_checkpoint.updated_at AS DATE)
+    """, [[s["shard_key"], s["collection_ids"], s["start_date"], s["end_date"]] for s in shards])
+
+    return conn.execute("""
+        SELECT shard_key, collection_ids, start_date, end_date, pagination_token, pages_done
+        FROM media_cloud_checkpoint
+        WHERE NOT completed
+        ORDER BY start_date, shard_key
+    """).fetchall()
+
+
+def media_cloud_client() -> Any:
+    import mediacloud.api
+    return mediacloud.api.SearchApi(os.environ['MEDIACLOUD_API_KEY'])
+
+
+def harvest_shard(
+    conn: duckdb.DuckDBPyConnection,
+    shard: Tuple,
+    limiter: RateLimiter,
+    write_lock: threading.Lock,
+    search_api: Optional[Any] = None,
+    metrics: Optional[StageMetrics] = None,
+) -> int:
+    """Page through one shard, saving each page and its pagination token together."""
+    shard_key, collection_ids, start_date, end_date, pagination_token, pages_done = shard
+    search_api = search_api or media_cloud_client()
+    metrics = metrics or StageMetrics("media_cloud")
+    ored_terms: str = " OR ".join(f'"{term}"' for term in TERMS)
+    cursor = conn.cursor()
+
+    inserted = 0
+    more_stories = True
     while more_stories:
+        limiter.wait()
         page: List[Dict[str, Any]]
-        page, pagination_token = search_api.story_list(
-            ored_terms,
-            start_date,
-            end_date,
-            collection_ids=collection_ids,
-            pagination_token=pagination_token
-        )
-        all_stories += page
+        with metrics.timer("page_seconds"):
+            page, pagination_token = search_api.story_list(
+                ored_terms,
+                start_date,
+                end_date,
+                collection_ids=[int(c) for c in collection_ids.split(",")],
+                pagination_token=pagination_token
+            )
         more_stories = pagination_token is not None
+        pages_done += 1
+        metrics.count("pages")
+        metrics.count("stories_seen", len(page))
+
+        # One writer at a time, so shards sharing stories can't both insert them
+        with write_lock:
+            cursor.begin()
+            try:
+                inserted += save_stories(cursor, page)
+                cursor.execute("""
+                    UPDATE media_cloud_checkpoint
+                    SET pagination_token = ?, pages_done = ?, stories_seen = stories_seen + ?,
+                        completed = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE shard_key = ?
+                """, [pagination_token, pages_done, len(page), not more_stories, shard_key])
+                cursor.commit()
+            except Exception:
+                cursor.rollback()
+                raise
 
-    return all_stories
+    print(f"Shard {shard_key}: {pages_done} pages, {inserted} new stories")
+    metrics.count("shards")
+    cursor.close()
+    return inserted
+
+
+def harvest_media_cloud(
+    conn: duckdb.DuckDBPyConnection,
+    start_date: Optional[dt.date] = None,
+    window_days: int = 7,
+    shard_by_collection: bool = False,
+    concurrency: int = 4,
+    requests_per_second: float = 1.0,
+    search_api: Optional[Any] = None,
+    metrics: Optional[StageMetrics] = None,
+) -> int:
+    """search_api defaults to a Media Cloud SearchApi per shard; anything with the same
+    story_list() can be passed instead, e.g. the benchmark stand-in."""
+    metrics = metrics or StageMetrics("media_cloud")
+    if start_date is None:
+        max_date_str = conn.execute("SELECT MAX(publish_date) FROM stage_story").fetchone()[0]
+        # start_date = dt.date(2024, 9, 26) To backfill.. 
+        start_date = dt.datetime.strptime(str(max_date_str), '%Y-%m-%d').date()   #!
+    end_date: dt.date = dt.date.today()    
+    print(f"Searching for stories from {start_date} to {end_date}")
+
+    ensure_checkpoint_table(conn)
+    shards = register_shards(conn, plan_shards(start_date, end_date, window_days, shard_by_collection))
+    print(f"Harvesting {len(shards)} shards with concurrency={concurrency}")
+
+    limiter = RateLimiter(requests_per_second)
+    write_lock = threading.Lock()
+    inserted = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [
+            pool.submit(harvest_shard, conn, shard, limiter, write_lock, search_api, metrics)
+            for shard in shards
+        ]
+        for future in as_completed(futures):
+            inserted += future.result()
+    metrics.count("rows_written", inserted)
+    metrics.save(conn)
+    return inserted
+
+
+def ensure_story_id_index(conn: duckdb.DuckDBPyConnection) -> bool:
+    """Unique index on stage_story.id, so duplicates are rejected by an index lookup.
+    Returns False if existing duplicate ids prevent creating it."""
+    try:
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS stage_story_id_idx ON stage_story (id)")
+        return True
+    except duckdb.ConstraintException:
+        return False
 
 
 # Excludes those with duplicate IDs 
 def save_stories(conn: duckdb.DuckDBPyConnection, stories: List[Dict[str, Any]]) -> int: 
-    df: pd.DataFrame = pd.DataFrame(stories)
-    existing_ids: set = set(
-        conn.execute("SELECT id FROM stage_story").fetchdf()['id'].tolist()
-    )
-    
-    # Filter out stories with existing IDs
-    df_filtered: pd.DataFrame = df[~df['id'].isin(existing_ids)]
+    import pyarrow as pa
+
+    if not stories:
+        return 0
+    batch = pa.Table.from_pylist(stories)
+    conn.register("story_batch", batch)
+    try:
+        if ensure_story_id_index(conn):
+            sql = "INSERT OR IGNORE INTO stage_story SELECT DISTINCT ON (id) * FROM story_batch"
+        else:
+            sql = """
+                INSERT INTO stage_story
+                SELECT DISTINCT ON (id) * FROM story_batch b
+                WHERE NOT EXISTS (SELECT 1 FROM stage_story s WHERE s.id = b.id)
+            """
+        to_insert = conn.execute(sql).fetchone()[0]
+    finally:
+        conn.unregister("story_batch")
     
-    to_insert = len(df_filtered)
     if to_insert > 0:
-        conn.register("df_filtered", df_filtered)
-        conn.execute("INSERT INTO stage_story SELECT * FROM df_filtered")
-        print(f"Saved {to_insert} new stories (skipped {len(df) - to_insert} duplicates)")
+        print(f"Saved {to_insert} new stories (skipped {len(stories) - to_insert} duplicates)")
     else:
-        print(f"No new stories to save ({len(df)} were duplicates)")
+        print(f"No new stories to save ({len(stories)} were duplicates)")
     
     return to_insert 
 
 
-def get_media_cloud() -> int: 
-    conn = connect()
-    try:
-        stories: List[Dict[str, Any]] = get_media_cloud_stories(conn)
-        inserted = save_stories(conn, stories)
-        return inserted
-    finally:
-        conn.close()
+def get_media_cloud(
+    start_date: Optional[dt.date] = None,
+    window_days: int = 7,
+    shard_by_collection: bool = False,
+    concurrency: int = 4,
+    requests_per_second: float = 1.0,
+    conn: Optional[duckdb.DuckDBPyConnection] = None,
+    search_api: Optional[Any] = None,
+    metrics: Optional[StageMetrics] = None,
+) -> int: 
+    with connection(conn) as conn:
+        return harvest_media_cloud(
+            conn,
+            start_date=start_date,
+            window_days=window_days,
+            shard_by_collection=shard_by_collection,
+            concurrency=concurrency,
+            requests_per_second=requests_per_second,
+            search_api=search_api,
+            metrics=metrics,
+        )
 
 
 if __name__ == "__main__":
-    stories: List[Dict[str, Any]] = get_media_cloud()
-    print(f"Processed {len(stories)} stories")
\ No newline at end of file
+    inserted = get_media_cloud()
+    print(f"Processed {inserted} stories")
\ No newline at end of file
@@ -1,14 +1,34 @@
 # data/assets/get_newspaper.py
 import time
 import os
-import random
+import sys
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from datetime import datetime, date
-from typing import Any, Dict, Iterable, Tuple, Optional
-from dotenv import load_dotenv
+from typing import Any, Dict, Iterable, List, Tuple, Optional
 
 import duckdb
 
-from .db_connection import connect
+from .db_connection import connection
+from .fetch_scheduler import DomainScheduler, domain_of
+from .fast_extract import extract_article
+from .fetch_retry import (
+    DOMAIN_FAILURES,
+    FETCH_DUE_QUERY,
+    classify_error,
+    classify_failure,
+    ensure_fetch_retry_table,
+    record_fetch_results,
+)
+from .html_archive import HtmlArchive, ensure_archive_table, iter_archived
+from .metrics import StageMetrics
+from .staging import StagingWriter, merge_staging
+from .work_queue import LEASED_QUERY, Heartbeat, WorkQueue, ensure_work_queue_table
+
+
+PROFILES = ("fast", "full")
 
 
 def normalize_timestamp(value) -> Optional[datetime]:
@@ -23,22 +43,44 @@ def normalize_timestamp(value) -> Optional[datetime]:
 
 
 def get_stories_without_newspaper(conn: duckdb.DuckDBPyConnection) -> Iterable[Tuple[str, str]]:
-    sql = """
-        SELECT s.id, s.url
-        FROM stage_story s
-        WHERE s.id NOT IN (SELECT n.media_cloud_id FROM stage_newspaper n)
+    """Stories never fetched or due a retry, that no queue worker holds."""
+    ensure_work_queue_table(conn)
+    ensure_fetch_retry_table(conn)
+    sql = f"""
+        SELECT id, url FROM ({FETCH_DUE_QUERY})
+        WHERE id NOT IN ({LEASED_QUERY})
     """
-    return conn.execute(sql).fetchall()
+    return conn.execute(sql, {"queue": "newspaper"}).fetchall()
 
 
-def insert_stage_row(
+def stage_row(media_cloud_id: str, article: Dict[str, Any], imported_at: datetime) -> List[Any]:
+    """stage_newspaper column values for an article, in table order."""
+    return [
+        str(media_cloud_id),
+        imported_at,
+        (article.get("title") or "").strip(),
+        article.get("text") or "",
+        normalize_timestamp(article.get("publish_date")),
+        article.get("authors") or "",
+        article.get("top_image") or "",
+        article.get("summary") or "",
+        bool(article.get("success")),
+        article.get("error"),
+    ]
+
+
+def insert_stage_rows(
     conn: duckdb.DuckDBPyConnection,
-    media_cloud_id: str,
-    article: Dict[str, Any],
+    rows: List[Tuple[str, Dict[str, Any]]],
     imported_at: datetime,
+    replace: bool = False,
 ) -> None:
-    sql = """
-    INSERT OR IGNORE INTO stage_newspaper (
+    """Write (media_cloud_id, article) pairs to stage_newspaper in one statement."""
+    if not rows:
+        return
+    conflict = "REPLACE" if replace else "IGNORE"
+    sql = f"""
+    INSERT OR {conflict} INTO stage_newspaper (
         media_cloud_id,
         import_date,
         title,
@@ -51,146 +93,556 @@ def insert_stage_row(
         error
     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
-    params = [
-        str(media_cloud_id),
-        imported_at,
-        (article.get("title") or "").strip(),
-        article.get("text") or "",
-        normalize_timestamp(article.get("publish_date")),
-        article.get("authors") or "",
-        article.get("top_image") or "",
-        article.get("summary") or "",
-        bool(article.get("success")),
-        article.get("error"),
-    ]
-    conn.execute(sql, params)
+    conn.executemany(sql, [stage_row(media_cloud_id, article, imported_at) for media_cloud_id, article in rows])
+
+
+def insert_stage_row(
+    conn: duckdb.DuckDBPyConnection,
+    media_cloud_id: str,
+    article: Dict[str, Any],
+    imported_at: datetime,
+    replace: bool = False,
+) -> None:
+    insert_stage_rows(conn, [(media_cloud_id, article)], imported_at, replace)
+
+
+def empty_article(error: Optional[str]) -> Dict[str, Any]:
+    return {
+        "title": "",
+        "text": "",
+        "publish_date": None,
+        "authors": "",
+        "top_image": "",
+        "summary": "",
+        "success": False,
+        "error": error,
+    }
+
+
+def newspaper_config():
+    from newspaper import Config
+
+    cfg = Config()
+    cfg.browser_user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0 Safari/537.36"
+    cfg.request_timeout = 5
+    cfg.number_threads = 1
+    cfg.memoize_articles = False
+    cfg.fetch_images = False
+    return cfg
+
+
+def download_html(url: str) -> str:
+    from newspaper import Article
+    import urllib3
+
+    # Disable urllib3 warnings about unverified HTTPS
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    art = Article(url, config=newspaper_config())
+    art.download()
+    art.throw_if_not_downloaded_verbose()
+    return art.html
+
+
+def parse_html(url: str, html: str) -> Dict[str, Any]:
+    """Extract article fields from already downloaded HTML. No network I/O."""
+    from newspaper import Article
+
+    art = Article(url, config=newspaper_config())
+    art.download(input_html=html)
+    art.parse()
+
+    # build() would download the page again, so only run the NLP step
+    try:
+        art.nlp()
+    except Exception as e:
+        print(f"    [warn] Could not build article metadata for {url}: {e}")
+
+    pub = normalize_timestamp(getattr(art, "publish_date", None))
+    return {
+        "title": getattr(art, "title", "") or "",
+        "text": getattr(art, "text", "") or "",
+        "publish_date": pub,
+        "authors": ", ".join(getattr(art, "authors", []) or []),
+        "top_image": getattr(art, "top_image", "") or "",
+        "summary": getattr(art, "summary", "") or "",
+        "success": True,
+        "error": None,
+    }
+
 
 def process_url(url: str) -> Dict[str, Any]:
+    """Download and parse url. The raw page is returned under "html" for the archive."""
     try:
-        from newspaper import Article, Config
-        import requests.adapters
-        import urllib3
+        import newspaper  # noqa: F401
+    except Exception as e:
+        return empty_article(f"ImportError: {type(e).__name__}: {e}")
 
-        # Disable urllib3 warnings about unverified HTTPS
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    try:
+        html = download_html(url)
+    except Exception as e:
+        return empty_article(f"{type(e).__name__}: {e}")
 
-        cfg = Config()
-        cfg.browser_user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0 Safari/537.36"
-        cfg.request_timeout = 5
-        cfg.number_threads = 1
-        cfg.memoize_articles = False
-        cfg.fetch_images = False
+    try:
+        article = parse_html(url, html)
+    except Exception as e:
+        article = empty_article(f"{type(e).__name__}: {e}")
+    article["html"] = html
+    return article
 
-        art = Article(url, config=cfg)
-        try:
-            art.download()
-            art.parse()
 
-            try:
-                art.build()
-            except Exception as e:
-                print(f"    [warn] Could not build article metadata for {url}: {e}")
-
-            pub = normalize_timestamp(getattr(art, "publish_date", None))
-            return {
-                "title": getattr(art, "title", "") or "",
-                "text": getattr(art, "text", "") or "",
-                "publish_date": pub,
-                "authors": ", ".join(getattr(art, "authors", []) or []),
-                "top_image": getattr(art, "top_image", "") or "",
-                "summary": getattr(art, "summary", "") or "",
-                "success": True,
-                "error": None,
-            }
-        except Exception as e:
-            error_msg = f"{type(e).__name__}: {e}"
-            return {
-                "title": "",
-                "text": "",
-                "publish_date": None,
-                "authors": "",
-                "top_image": "",
-                "summary": "",
-                "success": False,
-                "error": error_msg,
-            }
+def fetch_story(story: Tuple[str, str]) -> Tuple[Optional[str], Optional[str]]:
+    """Download stage: returns (html, None) or (None, error)."""
+    try:
+        return download_html(story[1]), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def fetch_failed(result: Tuple[Optional[str], Optional[str]]) -> bool:
+    """Whether a fetch_story result counts against its domain's circuit breaker."""
+    html, error = result
+    return html is None and classify_error(error) in DOMAIN_FAILURES
+
+
+def circuit_open(story: Tuple[str, str]) -> Tuple[Optional[str], Optional[str]]:
+    """fetch_story result for a story skipped because its domain's circuit is open."""
+    return None, f"CircuitOpen: gave up on {domain_of(story[1])} for this run"
 
+
+def parse_story(url: str, html: str, profile: str = "fast") -> Dict[str, Any]:
+    """Parse stage, run in a worker process.
+
+    The "fast" profile only extracts the fields the site needs in one lxml pass and
+    leaves summary empty for backfill_summaries. "full" runs newspaper3k parse and NLP.
+    """
+    try:
+        if profile == "fast":
+            return extract_article(url, html)
+        return parse_html(url, html)
     except Exception as e:
+        return empty_article(f"{type(e).__name__}: {e}")
+
+
+class PipelineStats:
+    """Per-stage counts and rates so the slow stage is visible in the progress lines."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.start_time = time.time()
+        self.downloaded = 0
+        self.parsed = 0
+        self.written = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.failures: Counter = Counter()
+
+    def rates(self) -> Dict[str, float]:
+        elapsed = max(time.time() - self.start_time, 1e-9)
         return {
-            "title": "",
-            "text": "",
-            "publish_date": None,
-            "authors": "",
-            "top_image": "",
-            "summary": "",
-            "success": False,
-            "error": f"ImportError: {type(e).__name__}: {e}",
+            "download_per_min": self.downloaded / elapsed * 60,
+            "parse_per_min": self.parsed / elapsed * 60,
+            "write_per_min": self.written / elapsed * 60,
         }
 
+    def record(self, metrics: StageMetrics) -> None:
+        metrics.count("stories_downloaded", self.downloaded)
+        metrics.count("stories_parsed", self.parsed)
+        metrics.count("rows_written", self.written)
+        metrics.count("stories_succeeded", self.succeeded)
+        metrics.count("stories_failed", self.failed)
+        for error_class, count in self.failures.items():
+            metrics.count("stories_failed", count, error_class)
 
-def get_newspaper():
-    conn = connect()
-    
-    stories = get_stories_without_newspaper(conn)
-    total = len(stories)
-    print(f"Found {total} stories to without newspaper data.")
+    def report(self, parse_queue_depth: int, queue_size: int, parsing: int) -> None:
+        rates = self.rates()
+        print(
+            f"  === Progress: {self.written}/{self.total} written "
+            f"(download {rates['download_per_min']:.1f}/min, parse {rates['parse_per_min']:.1f}/min, "
+            f"write {rates['write_per_min']:.1f}/min) "
+            f"parse queue {parse_queue_depth}/{queue_size}, parsing {parsing} ==="
+        )
+        # A full queue means parsing can't keep up, an empty one means downloads are the limit
+        if parse_queue_depth >= queue_size:
+            print("  === Bottleneck: parse ===")
+        elif parse_queue_depth == 0 and parsing == 0 and self.downloaded < self.total:
+            print("  === Bottleneck: download ===")
 
-    processed_ok = 0
-    processed_fail = 0
-    now = datetime.now()
-    start_time = time.time()
 
-    for idx, (story_id, url) in enumerate(stories, start=1):
-        print(f"[{idx}/{total}] Processing ID={story_id} :: {url}")
-        
+def run_newspaper_pipeline(
+    conn: duckdb.DuckDBPyConnection,
+    source: Iterable[Tuple[str, str, Optional[str], Optional[str]]],
+    total: int,
+    parse_workers: Optional[int] = None,
+    queue_size: int = 200,
+    batch_size: int = 50,
+    archive: Optional[HtmlArchive] = None,
+    replace: bool = False,
+    profile: str = "fast",
+    record_retries: bool = False,
+) -> PipelineStats:
+    """Parse (media_cloud_id, url, html, error) tuples from source on a process pool.
+
+    source is drained on a background thread into a bounded queue, so downloads keep
+    going while pages are parsed. This thread is the only one touching conn: it hands
+    pages to the pool and writes finished articles to stage_newspaper in batches, along
+    with their fetch_retry state when record_retries is set.
+    """
+    parse_workers = parse_workers or os.cpu_count() or 1
+    stats = PipelineStats(total)
+    parse_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    imported_at = datetime.now()
+    batch: List[Tuple[str, Dict[str, Any]]] = []
+    outcomes: List[Tuple[str, Optional[str], Optional[str]]] = []
+
+    def produce():
         try:
-            article = process_url(url)
-            insert_stage_row(conn, story_id, article, now)
-            
-            if article.get("success"):
-                processed_ok += 1
-                print(f"  ✓ Success: {(article.get('title') or '')[:50]}...")
-            else:
-                processed_fail += 1
-                print(f"  ✗ Failed: {article.get('error', 'Unknown error')}")
-                
-        except Exception as e:
-            err = f"{type(e).__name__}: {e}"
-            print(f"  [error] ID={story_id} :: {err}")
-            
-            fallback = {
-                "title": "",
-                "text": "",
-                "publish_date": None,
-                "authors": "",
-                "top_image": "",
-                "summary": "",
-                "success": False,
-                "error": err,
-            }
+            for entry in source:
+                parse_queue.put(entry)
+                stats.downloaded += 1
+        finally:
+            parse_queue.put(None)
+
+    def write(media_cloud_id: str, url: str, html: Optional[str], article: Dict[str, Any]) -> None:
+        if archive is not None and html:
+            archive.add(media_cloud_id, url, html, imported_at)
+        batch.append((media_cloud_id, article))
+        error_class = classify_failure(html, article)
+        outcomes.append((media_cloud_id, error_class, article.get("error")))
+        if error_class is None:
+            stats.succeeded += 1
+        else:
+            stats.failed += 1
+            stats.failures[error_class] += 1
+        if len(batch) >= batch_size:
+            flush()
+
+    def flush():
+        insert_stage_rows(conn, batch, imported_at, replace)
+        if record_retries:
+            record_fetch_results(conn, outcomes)
+        stats.written += len(batch)
+        batch.clear()
+        outcomes.clear()
+
+    producer = threading.Thread(target=produce, name="newspaper-download", daemon=True)
+    producer.start()
+
+    parsing: Dict[Future, Tuple[str, str, str]] = {}
+    sources_done = False
+    last_report = time.time()
+    last_checkpoint = 0
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+        while not sources_done or parsing:
+            # Keep every worker busy, with one page queued behind each
+            while not sources_done and len(parsing) < parse_workers * 2:
+                try:
+                    entry = parse_queue.get(timeout=0 if parsing else 0.5)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    sources_done = True
+                    break
+                media_cloud_id, url, html, error = entry
+                if html is None:
+                    write(media_cloud_id, url, None, empty_article(error))
+                    stats.parsed += 1
+                    continue
+                parsing[pool.submit(parse_story, url, html, profile)] = (media_cloud_id, url, html)
+
+            if parsing:
+                done, _ = wait(parsing, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    media_cloud_id, url, html = parsing.pop(future)
+                    try:
+                        article = future.result()
+                    except Exception as e:
+                        article = empty_article(f"{type(e).__name__}: {e}")
+                    stats.parsed += 1
+                    write(media_cloud_id, url, html, article)
+
+            if stats.written - last_checkpoint >= 100:
+                # Force write from wal to data.duckdb
+                conn.execute("CHECKPOINT")
+                last_checkpoint = stats.written
+
+            if time.time() - last_report >= 30:
+                stats.report(parse_queue.qsize(), queue_size, len(parsing))
+                last_report = time.time()
+
+    flush()
+    if archive is not None:
+        archive.close()
+    producer.join()
+    stats.report(parse_queue.qsize(), queue_size, 0)
+    return stats
+
+
+def get_newspaper(
+    concurrency: int = 8,
+    domain_delay: float = 2.0,
+    parse_workers: Optional[int] = None,
+    queue_size: int = 200,
+    batch_size: int = 50,
+    profile: str = "fast",
+    breaker_threshold: int = 5,
+    conn: Optional[duckdb.DuckDBPyConnection] = None,
+    metrics: Optional[StageMetrics] = None,
+):
+    """Fetch and parse stories that have no newspaper row, or whose fetch failed and is
+    due a retry (see fetch_retry.py). A domain with breaker_threshold site-wide failures
+    in a row (timeouts, 5xx, blocking) is skipped for the rest of the run.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown extraction profile {profile!r}, expected one of {PROFILES}")
+    metrics = metrics or StageMetrics("newspaper")
+
+    def timed_fetch(story: Tuple[str, str]) -> Tuple[Optional[str], Optional[str]]:
+        with metrics.timer("fetch_seconds", domain_of(story[1])):
+            html, error = fetch_story(story)
+        if html:
+            metrics.count("bytes_downloaded", len(html.encode("utf-8", "surrogatepass")))
+        return html, error
+
+    with connection(conn) as conn:
+        # Rows from queue workers first, so their stories aren't fetched again
+        merge_staging(conn, ("stage_newspaper", "html_archive"))
+        stories = get_stories_without_newspaper(conn)
+        total = len(stories)
+        print(f"Found {total} stories to without newspaper data.")
+        print(f"Fetching with concurrency={concurrency}, {domain_delay}s delay per domain")
+
+        scheduler = DomainScheduler(
+            concurrency=concurrency, domain_delay=domain_delay, breaker_threshold=breaker_threshold
+        )
+        downloads = (
+            (story_id, url, html, error)
+            for (story_id, url), (html, error) in scheduler.run(
+                stories, timed_fetch, failed=fetch_failed, skipped=circuit_open
+            )
+        )
+
+        stats = run_newspaper_pipeline(
+            conn,
+            downloads,
+            total,
+            parse_workers=parse_workers,
+            queue_size=queue_size,
+            batch_size=batch_size,
+            archive=HtmlArchive(conn),
+            replace=True,
+            profile=profile,
+            record_retries=True,
+        )
+
+        elapsed = time.time() - stats.start_time
+        print(f"Done in {elapsed/60:.1f} minutes. Success: {stats.succeeded}, Failed: {stats.failed}")
+        stats.record(metrics)
+        metrics.set("circuit_open_domains", len(scheduler.open_domains))
+        metrics.save(conn)
+        return {
+            "stories_found": stats.succeeded,
+            "stories_not_found": stats.failed,
+            **stats.rates(),
+        }
+
+
+def newspaper_worker(
+    batch_size: int = 100,
+    concurrency: int = 8,
+    domain_delay: float = 2.0,
+    parse_workers: Optional[int] = None,
+    profile: str = "fast",
+    lease_seconds: float = 300,
+    owner: Optional[str] = None,
+    breaker_threshold: int = 5,
+) -> Dict[str, int]:
+    """Download and parse stories claimed from the newspaper work queue until it is empty.
+
+    Any number of these can run at once, on one machine against the same DuckDB file.
+    Each claims a batch, fetches and parses it, and appends the rows and archived HTML
+    to staging files of its own; the database is only opened briefly to claim and
+    complete batches. merge_staging (run by get_newspaper, or on its own) loads the
+    files. A worker that dies leaves its batch to be reclaimed when the lease expires.
+    domain_delay is per worker, so N workers may hit a domain N times as often, and
+    each worker keeps its own circuit breakers.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown extraction profile {profile!r}, expected one of {PROFILES}")
+    work_queue = WorkQueue("newspaper", owner=owner, lease_seconds=lease_seconds)
+    queued = work_queue.enqueue()
+    print(f"Worker {work_queue.owner}: {queued} stories newly queued")
+
+    scheduler = DomainScheduler(
+        concurrency=concurrency, domain_delay=domain_delay, breaker_threshold=breaker_threshold
+    )
+    rows = StagingWriter("stage_newspaper", work_queue.owner)
+    archive = HtmlArchive(None, staging=StagingWriter("html_archive", work_queue.owner))
+    totals = {"stories_found": 0, "stories_not_found": 0}
+    with ProcessPoolExecutor(max_workers=parse_workers or os.cpu_count() or 1) as pool:
+        while True:
+            ids = work_queue.claim(batch_size)
+            if not ids:
+                break
             try:
-                insert_stage_row(conn, story_id, fallback, now)
-            except Exception as e2:
-                print(f"  [fatal-insert] ID={story_id} :: {type(e2).__name__}: {e2}")
-            processed_fail += 1
-        
-        time.sleep(2)        
-        if idx % 100 == 0:
-            # Force write from wal to data.duckdb 
-            conn.execute("CHECKPOINT")
-            elapsed = time.time() - start_time
-            rate = idx / elapsed * 60
-            success_rate = processed_ok / idx * 100
-            print(f"  === Progress: Inserted:{processed_ok}  {idx}/{total} ({success_rate:.1f}% success, {rate:.1f} items/min) ===")
-
-    elapsed = time.time() - start_time
-    print(f"Done in {elapsed/60:.1f} minutes. Success: {processed_ok}, Failed: {processed_fail}")
-    conn.close()
-    return {
-        "stories_found": processed_ok,
-        "stories_not_found": processed_fail
-    }
+                with Heartbeat(work_queue, ids):
+                    with work_queue.session() as conn:
+                        stories = conn.execute(
+                            "SELECT id, url FROM stage_story WHERE id IN (SELECT UNNEST(?))", [ids]
+                        ).fetchall()
+                    parsing = {}
+                    for (story_id, url), (html, error) in scheduler.run(
+                        stories, fetch_story, failed=fetch_failed, skipped=circuit_open
+                    ):
+                        if html is None:
+                            parsing[story_id] = (url, None, empty_article(error))
+                        else:
+                            parsing[story_id] = (url, html, pool.submit(parse_story, url, html, profile))
+                    articles = []
+                    for story_id, (url, html, article) in parsing.items():
+                        if isinstance(article, Future):
+                            try:
+                                article = article.result()
+                            except Exception as e:
+                                article = empty_article(f"{type(e).__name__}: {e}")
+                        articles.append((story_id, url, html, article))
+
+                imported_at = datetime.now()
+                for story_id, url, html, article in articles:
+                    archive.add(story_id, url, html, imported_at)
+                    rows.add(stage_row(story_id, article, imported_at))
+                # Archive rows first: a batch is only done once its newspaper rows are staged
+                archive.close()
+                archive.staging.flush()
+                rows.flush()
+                with work_queue.session() as conn:
+                    record_fetch_results(conn, [
+                        (story_id, classify_failure(html, article), article.get("error"))
+                        for story_id, _, html, article in articles
+                    ])
+                work_queue.complete(ids)
+            except BaseException:
+                work_queue.release(ids)
+                raise
+
+            found = sum(1 for *_, article in articles if article.get("success"))
+            totals["stories_found"] += found
+            totals["stories_not_found"] += len(articles) - found
+            print(f"Worker {work_queue.owner}: {len(articles)} stories written, {found} found")
+    return totals
+
+
+def reparse_from_archive(
+    media_cloud_ids: Optional[Iterable[str]] = None,
+    parse_workers: Optional[int] = None,
+    profile: str = "fast",
+    conn: Optional[duckdb.DuckDBPyConnection] = None,
+    metrics: Optional[StageMetrics] = None,
+):
+    """Rebuild stage_newspaper rows from archived HTML without touching the network."""
+    metrics = metrics or StageMetrics("newspaper_reparse")
+    with connection(conn) as conn:
+        ensure_archive_table(conn)
+
+        if media_cloud_ids is None:
+            total = conn.execute("SELECT COUNT(*) FROM html_archive").fetchone()[0]
+        else:
+            media_cloud_ids = list(media_cloud_ids)
+            total = len(media_cloud_ids)
+
+        # The archive is read on the pipeline's download thread, so give it its own cursor
+        archived = (
+            (story_id, url, html, None)
+            for story_id, url, html in iter_archived(conn.cursor(), media_cloud_ids=media_cloud_ids)
+        )
+        stats = run_newspaper_pipeline(
+            conn, archived, total, parse_workers=parse_workers, replace=True, profile=profile
+        )
+
+        elapsed = time.time() - stats.start_time
+        print(f"Reparsed archive in {elapsed/60:.1f} minutes. Success: {stats.succeeded}, Failed: {stats.failed}")
+        stats.record(metrics)
+        metrics.save(conn)
+        return {
+            "stories_found": stats.succeeded,
+            "stories_not_found": stats.failed,
+            **stats.rates(),
+        }
+
+
+def summarize(title: str, text: str) -> str:
+    """The summary step of newspaper3k's Article.nlp(), without keyword extraction."""
+    from newspaper import nlp
+
+    cfg = newspaper_config()
+    nlp.load_stopwords(cfg.get_language())
+    return "\n".join(nlp.summarize(title=title, text=text, max_sents=cfg.MAX_SUMMARY_SENT))
+
+
+def ensure_summary_attempt_table(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS summary_attempt (
+            media_cloud_id  VARCHAR   PRIMARY KEY,
+            attempted_at    TIMESTAMP NOT NULL   -- Tried again once the article's import_date passes this
+        )
+    """)
+
+
+def backfill_summaries(batch_size: int = 100, conn: Optional[duckdb.DuckDBPyConnection] = None) -> int:
+    """Fill in summaries for articles stored by the fast profile.
+
+    Every article tried is recorded in summary_attempt, so one the summarizer returns
+    nothing for (or fails on) isn't tried on every run, only after it is refetched.
+    """
+    with connection(conn) as conn:
+        ensure_summary_attempt_table(conn)
+        rows = conn.execute("""
+            SELECT n.media_cloud_id, n.title, n.text
+            FROM stage_newspaper n
+            LEFT JOIN summary_attempt a ON a.media_cloud_id = n.media_cloud_id
+            WHERE n.success AND n.summary = '' AND n.text <> ''
+            AND (a.attempted_at IS NULL OR a.attempted_at < n.import_date)
+        """).fetchall()
+        print(f"Found {len(rows)} articles without a summary")
+
+        # Bump import_date so the incremental story merge picks the new summary up
+        sql = "UPDATE stage_newspaper SET summary = ?, import_date = ? WHERE media_cloud_id = ?"
+        now = datetime.now()
+        updated = 0
+        batch: List[Tuple[str, datetime, str]] = []
+        attempted: List[Tuple[str, datetime]] = []
+
+        def flush():
+            if batch:
+                conn.executemany(sql, batch)
+            conn.executemany("INSERT OR REPLACE INTO summary_attempt VALUES (?, ?)", attempted)
+            batch.clear()
+            attempted.clear()
+
+        for media_cloud_id, title, text in rows:
+            attempted.append((media_cloud_id, now))
+            try:
+                summary = summarize(title or "", text)
+            except Exception as e:
+                print(f"    [warn] Could not summarize {media_cloud_id}: {e}")
+                summary = ""
+            if summary:
+                batch.append((summary, now, media_cloud_id))
+                updated += 1
+            if len(attempted) >= batch_size:
+                flush()
+        if attempted:
+            flush()
+
+        print(f"Added {updated} summaries")
+        return updated
 
 
 if __name__ == "__main__":
-    get_newspaper()
\ No newline at end of file
+    if "--reparse" in sys.argv:
+        reparse_from_archive()
+    elif "--worker" in sys.argv:
+        newspaper_worker()
+    else:
+        get_newspaper()
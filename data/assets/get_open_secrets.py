@@ -1,29 +1,39 @@
 #!/usr/bin/env python3
 """
 OpenSecrets.org News Scraper - DuckDB Version
-Writes article data directly to DuckDB database
+Stages article data in Parquet files and merges them into DuckDB at the end of a crawl
 """
 
 import os
-import time
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
 import hashlib
 
 import duckdb
-import pandas as pd
-from playwright.sync_api import sync_playwright
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
-#from db_connection import connect  ## for dagster
-from db_connection import connect ## for F5
+from .db_connection import connect  # dagster
+#from db_connection import connect   # vscode
+from .fetch_scheduler import RateLimiter
+from .staging import StagingWriter, merge_staging
 
 
 load_dotenv()
 
-BASE_URL = "https://www.opensecrets.org/news/page/{}"
+# OPENSECRETS_BASE_URL points the scraper at a stand-in server (data/benchmarks/http_standin.py)
+SITE_ROOT = os.getenv("OPENSECRETS_BASE_URL", "https://www.opensecrets.org").rstrip("/")
+BASE_URL = SITE_ROOT + "/news/page/{}"
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+FETCH_MODES = ("auto", "http", "browser")
+
+# Bot-protection interstitials that only a real browser gets past
+CHALLENGE_MARKERS = ("just a moment", "cf-challenge", "challenge-platform", "enable javascript and cookies")
 
 
 def parse_index_page(html_content: str, page_num: int) -> List[Dict[str, Any]]:
@@ -32,6 +42,7 @@ def parse_index_page(html_content: str, page_num: int) -> List[Dict[str, Any]]:
     
     soup = BeautifulSoup(html_content, 'lxml')
     articles = []
+    seen = set()
     article_links = soup.find_all('a', href=True)
     
     for link in article_links:
@@ -48,10 +59,11 @@ def parse_index_page(html_content: str, page_num: int) -> List[Dict[str, Any]]:
         )
         
         if is_article:
-            full_url = urljoin('https://www.opensecrets.org', href)
+            full_url = urljoin(SITE_ROOT, href)
             title = link.get_text(strip=True)
             
-            if title and len(title) > 10 and full_url not in [a['url'] for a in articles]:
+            if title and len(title) > 10 and full_url not in seen:
+                seen.add(full_url)
                 articles.append({
                     'url': full_url,
                     'title': title,
@@ -61,60 +73,231 @@ def parse_index_page(html_content: str, page_num: int) -> List[Dict[str, Any]]:
     return articles
 
 
-def scrape_article_details(page, url: str) -> Optional[Dict[str, Any]]:
+def parse_article_details(html: str) -> Dict[str, Any]:
+    soup = BeautifulSoup(html, 'lxml')
+
+    details = {
+        'publish_date': None,
+        'author': None,
+        'photo_url': None
+    }
+
+    date_elem = soup.find('time')
+    if date_elem:
+        details['publish_date'] = date_elem.get('datetime') or date_elem.get_text(strip=True)
+    else:
+        meta_date = soup.find('meta', {'property': 'article:published_time'})
+        if not meta_date:
+            meta_date = soup.find('meta', {'name': 'publish-date'})
+        if meta_date:
+            details['publish_date'] = meta_date.get('content')
+
+    meta_author = soup.find('meta', {'name': 'author'})
+    if meta_author:
+        details['author'] = meta_author.get('content')
+    else:
+        author_elem = soup.find(class_=['author', 'byline', 'author-name'])
+        if author_elem:
+            details['author'] = author_elem.get_text(strip=True)
+        else:
+            author_link = soup.find('a', {'rel': 'author'})
+            if author_link:
+                details['author'] = author_link.get_text(strip=True)
+
+    meta_img = soup.find('meta', {'property': 'og:image'})
+    if meta_img:
+        details['photo_url'] = meta_img.get('content')
+    else:
+        img = soup.find('img', class_=['featured-image', 'article-image', 'wp-post-image'])
+        if img:
+            details['photo_url'] = img.get('src')
+
+    return details
+
+
+def scrape_article_details(fetcher: "PageFetcher", url: str) -> Optional[Dict[str, Any]]:
     try:
-        response = page.goto(url, wait_until='networkidle', timeout=30000)
-        
-        if not response or response.status != 200:
+        html = fetcher.fetch(url)
+        if not html:
             return None
-        
-        page.wait_for_timeout(1000)
-        html = page.content()
-        soup = BeautifulSoup(html, 'lxml')
-        
-        details = {
-            'publish_date': None,
-            'author': None,
-            'photo_url': None
-        }
-        
-        date_elem = soup.find('time')
-        if date_elem:
-            details['publish_date'] = date_elem.get('datetime') or date_elem.get_text(strip=True)
-        else:
-            meta_date = soup.find('meta', {'property': 'article:published_time'})
-            if not meta_date:
-                meta_date = soup.find('meta', {'name': 'publish-date'})
-            if meta_date:
-                details['publish_date'] = meta_date.get('content')
-        
-        meta_author = soup.find('meta', {'name': 'author'})
-        if meta_author:
-            details['author'] = meta_author.get('content')
-        else:
-            author_elem = soup.find(class_=['author', 'byline', 'author-name'])
-            if author_elem:
-                details['author'] = author_elem.get_text(strip=True)
-            else:
-                author_link = soup.find('a', {'rel': 'author'})
-                if author_link:
-                    details['author'] = author_link.get_text(strip=True)
-        
-        meta_img = soup.find('meta', {'property': 'og:image'})
-        if meta_img:
-            details['photo_url'] = meta_img.get('content')
-        else:
-            img = soup.find('img', class_=['featured-image', 'article-image', 'wp-post-image'])
-            if img:
-                details['photo_url'] = img.get('src')
-        
-        return details
-        
+        return parse_article_details(html)
+
     except Exception as e:
         print(f"  Error scraping article details: {e}")
         return None
 
 
+def looks_blocked(status: int, html: str) -> bool:
+    if status in (403, 429, 503):
+        return True
+    head = html[:5000].lower()
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+class HttpFetcher:
+    """Plain GETs over one pooled requests.Session; returns None when a browser is needed."""
+
+    def __init__(self, pool_size: int = 8, timeout: float = 20.0):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT, 'Accept-Language': 'en-US,en;q=0.9'})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Page HTML, "" when the page does not exist, or None when only a browser will get it."""
+        response = self.session.get(url, timeout=self.timeout)
+        if response.status_code in (404, 410):
+            return ""
+        if looks_blocked(response.status_code, response.text):
+            return None
+        response.raise_for_status()
+        return response.text
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class BrowserPool:
+    """N Playwright pages, each owned by its own thread (the sync API is not thread-safe).
+
+    Pages are opened when the first URL is submitted, so a crawl that never needs a
+    browser never starts Chromium.
+    """
+
+    def __init__(self, size: int = 2, timeout_ms: int = 30000):
+        self.size = max(1, size)
+        self.timeout_ms = timeout_ms
+        self.jobs: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self.threads: List[threading.Thread] = []
+        self.lock = threading.Lock()
+
+    def _start(self) -> None:
+        with self.lock:
+            if self.threads:
+                return
+            for i in range(self.size):
+                thread = threading.Thread(target=self._worker, name=f"browser-{i}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def _worker(self) -> None:
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+            browser = p.chromium.launch(
+                headless=True,
+                args=['--disable-blink-features=AutomationControlled']
+            )
+            context = browser.new_context(
+                viewport={'width': 1920, 'height': 1080},
+                user_agent=USER_AGENT,
+                locale='en-US',
+            )
+            page = context.new_page()
+            try:
+                page.goto(SITE_ROOT + '/', wait_until='domcontentloaded', timeout=self.timeout_ms)
+            except Exception as e:
+                print(f"Warning: Could not initialize session: {e}")
+
+            while True:
+                job = self.jobs.get()
+                if job is None:
+                    break
+                url, future = job
+                try:
+                    future.set_result(self._load(page, url))
+                except Exception as e:
+                    future.set_exception(e)
+            browser.close()
+
+    def _load(self, page, url: str) -> Optional[str]:
+        response = page.goto(url, wait_until='domcontentloaded', timeout=self.timeout_ms)
+        status = response.status if response else 0
+
+        # Challenge pages reload themselves once the check passes; poll instead of sleeping a fixed time
+        deadline = datetime.now().timestamp() + self.timeout_ms / 1000
+        html = page.content()
+        while looks_blocked(0, html) and datetime.now().timestamp() < deadline:
+            try:
+                page.wait_for_load_state('load', timeout=2000)
+            except Exception:
+                pass
+            page.wait_for_timeout(250)
+            html = page.content()
+
+        # status is the first response's, so a passed challenge still shows 403/503
+        if looks_blocked(0, html) or (status >= 400 and status not in (403, 429, 503)):
+            return None
+        return html
+
+    def fetch(self, url: str) -> Optional[str]:
+        self._start()
+        future: Future = Future()
+        self.jobs.put((url, future))
+        return future.result()
+
+    def close(self) -> None:
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+
+class PageFetcher:
+    """HTTP first, browser only when the HTTP response is a challenge or error page.
+
+    All requests, either way, go through one RateLimiter so concurrency never turns into
+    more load on the site than requests_per_second.
+    """
+
+    def __init__(self, mode: str = "auto", browser_pages: int = 2, requests_per_second: float = 2.0):
+        if mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode {mode!r}; expected one of {FETCH_MODES}")
+        self.mode = mode
+        self.limiter = RateLimiter(requests_per_second)
+        self.http = HttpFetcher() if mode != "browser" else None
+        self.browser = BrowserPool(browser_pages) if mode != "http" else None
+        self.http_pages = 0
+        self.browser_pages = 0
+        self.stats_lock = threading.Lock()
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Page HTML, "" when the site says it does not exist, or None when it could not be fetched."""
+        if self.http:
+            self.limiter.wait()
+            try:
+                html = self.http.fetch(url)
+            except Exception as e:
+                if not self.browser:
+                    raise
+                print(f"  HTTP failed for {url} ({e}), trying browser")
+                html = None
+            if html is not None:
+                with self.stats_lock:
+                    self.http_pages += 1
+                return html
+            if not self.browser:
+                return None
+
+        self.limiter.wait()
+        html = self.browser.fetch(url)
+        with self.stats_lock:
+            self.browser_pages += 1
+        return html
+
+    def close(self) -> None:
+        if self.http:
+            self.http.close()
+        if self.browser:
+            self.browser.close()
+
+
 def normalize_timestamp(value) -> Optional[datetime]:
     """Convert various date formats to datetime"""
     if value is None:
@@ -137,17 +320,77 @@ def normalize_timestamp(value) -> Optional[datetime]:
     return None
 
 
-def get_existing_urls(conn: duckdb.DuckDBPyConnection) -> set:    
-    try:
-        result = conn.execute("SELECT url FROM stage_story").fetchall()
-        return {row[0] for row in result}
-    except:
-        return set()
+def ensure_story_url_index(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute("CREATE INDEX IF NOT EXISTS stage_story_url_idx ON stage_story (url)")
 
 
-# Insert into both stage_story and stage_newpaper
-def insert_article(
+def get_site_urls(conn: duckdb.DuckDBPyConnection) -> set:
+    """Every stage_story URL on this site, as index pages link to them."""
+    result = conn.execute(
+        "SELECT url FROM stage_story WHERE starts_with(url, ?)",
+        [SITE_ROOT + '/']
+    ).fetchall()
+    return {row[0] for row in result}
+
+
+def ensure_crawl_state_table(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS opensecrets_crawl_state (
+            id                   INTEGER PRIMARY KEY,
+            newest_url           VARCHAR,
+            newest_publish_date  DATE,
+            pages_crawled        INTEGER   NOT NULL,
+            articles_saved       INTEGER   NOT NULL,
+            incremental          BOOLEAN   NOT NULL,
+            crawled_at           TIMESTAMP NOT NULL
+        )
+    """)
+
+
+def get_high_water_mark(conn: duckdb.DuckDBPyConnection) -> Optional[Dict[str, Any]]:
+    ensure_crawl_state_table(conn)
+    row = conn.execute(
+        "SELECT newest_url, newest_publish_date, crawled_at FROM opensecrets_crawl_state WHERE id = 1"
+    ).fetchone()
+    return dict(zip(("newest_url", "newest_publish_date", "crawled_at"), row)) if row else None
+
+
+def save_high_water_mark(
     conn: duckdb.DuckDBPyConnection,
+    articles: List[Dict[str, Any]],
+    pages_crawled: int,
+    incremental: bool
+) -> None:
+    """Record the newest article seen by this crawl; keeps the previous mark if nothing newer was saved."""
+    previous = get_high_water_mark(conn) or {}
+    newest_url, newest_date = previous.get("newest_url"), previous.get("newest_publish_date")
+    for article in articles:
+        published = normalize_timestamp(article.get('publish_date'))
+        if published and (newest_date is None or published.date() > newest_date):
+            newest_url, newest_date = article['url'], published.date()
+
+    conn.execute(
+        "INSERT OR REPLACE INTO opensecrets_crawl_state VALUES (1, ?, ?, ?, ?, ?, ?)",
+        [newest_url, newest_date, pages_crawled, len(articles), incremental, datetime.now()]
+    )
+
+
+def reached_high_water_mark(articles: List[Dict[str, Any]], mark: Optional[Dict[str, Any]]) -> bool:
+    """Whether an index page reaches the last crawl's newest article: it lists that
+    article, or every article on it whose date we know is older."""
+    if not mark or not mark.get("newest_url"):
+        return False
+    if any(article['url'] == mark["newest_url"] for article in articles):
+        return True
+    dates = [normalize_timestamp(article.get('publish_date')) for article in articles]
+    dates = [published.date() for published in dates if published]
+    return bool(dates) and all(published < mark["newest_publish_date"] for published in dates)
+
+
+# Stage rows for both stage_story and stage_newpaper; merge_staging loads them
+def insert_article(
+    stories: StagingWriter,
+    newspapers: StagingWriter,
     article: Dict[str, Any],
     imported_at: datetime
 ) -> None:
@@ -155,151 +398,188 @@ def insert_article(
     publish_date = datetime.strptime(article['publish_date'], '%Y-%m-%d').date()
     url = article.get('url').rstrip('/')
     url_hash = hashlib.sha256(url.encode()).hexdigest()  
-    sql = """
-    INSERT INTO stage_story (
-        id,
-        indexed_date,
-        language,
-        media_name,
-        media_url,
-        publish_date,
-        title,
-        url
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """
-    params = [
+    indexed_date = normalize_timestamp(article.get('publish_date'))
+    # stage_story columns are all VARCHAR, as written by Media Cloud imports
+    stories.add([
         url_hash,
-        normalize_timestamp(article.get('publish_date')),
+        str(indexed_date) if indexed_date else None,
         'en',
         'OpenSecrets',
         'opensecrets.org',
-        publish_date,
+        str(publish_date),
         article.get('title') or '',
         article.get('url')
-    ]
-    conn.execute(sql, params)
-
-    sql = """
-    INSERT INTO stage_newspaper (
-        media_cloud_id,
-        import_date,
-        title,
-        text,
-        publish_date,        
-        authors,
-        top_image,
-        summary,
-        success,
-        error
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
-    params = [
+    ])
+
+    newspapers.add([
         url_hash,
         imported_at,  # Use imported_at parameter, not publish_date
         article.get('title') or '',
         '',  # text (empty)
-        publish_date,
+        datetime.combine(publish_date, datetime.min.time()),
         article.get('author') or '',
         article.get('photo_url') or '',
         '',     # summary
         True,   # success
         None    # error
-    ]
-    conn.execute(sql, params)
+    ])
+
+
+def scrape_opensecrets_articles(
+    max_articles: int = 1,
+    mode: str = "auto",
+    concurrency: int = 4,
+    browser_pages: int = 2,
+    requests_per_second: float = 2.0,
+    max_pages: int = 240,
+    incremental: bool = True,
+    stop_after_known_pages: int = 2
+) -> int:
+    """Walk the news index from page 1, saving articles not yet in stage_story.
 
+    Index pages list newest first, so in incremental mode the crawl stops at the page
+    that reaches the previous crawl's newest article (its high-water mark), after
+    stop_after_known_pages consecutive pages with nothing new, or at the end of the
+    index. incremental=False walks all max_pages, for backfills.
 
-def scrape_opensecrets_articles(max_articles: int = 1) -> int:
+    Known URLs are read up front and articles are staged to Parquet files, so the
+    database is only open at the start and for the merge at the end, leaving it free
+    for other writers while the crawl runs.
+    """
     conn = connect()
     
     print(f"\nOpenSecrets.org News Scraper - Scraping {max_articles} article(s)\n")
     
-    existing_urls = get_existing_urls(conn)
-    print(f"Found {len(existing_urls)} existing articles in database")
+    try:
+        # Leftovers from an interrupted crawl, so their URLs count as known
+        merge_staging(conn, ("stage_story", "stage_newspaper"))
+        ensure_story_url_index(conn)
+        existing_count = conn.execute("SELECT COUNT(*) FROM stage_story").fetchone()[0]
+        print(f"Found {existing_count} existing articles in database")
+        high_water_mark = get_high_water_mark(conn)
+        if high_water_mark:
+            print(f"Last crawl {high_water_mark['crawled_at']:%Y-%m-%d %H:%M}, newest article {high_water_mark['newest_publish_date']}")
+        existing_urls = get_site_urls(conn)
+    finally:
+        conn.close()
+    worker = f"opensecrets-{os.getpid()}"
+    stories = StagingWriter("stage_story", worker)
+    newspapers = StagingWriter("stage_newspaper", worker)
+    known_pages = 0
+    pages_crawled = 0
     
     all_articles = []
     imported_at = datetime.now()
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        
-        context = browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            locale='en-US',
-        )
-        
-        page = context.new_page()        
-        try:
-            page.goto('https://www.opensecrets.org/', wait_until='networkidle', timeout=30000)
-            time.sleep(1)
-        except Exception as e:
-            print(f"Warning: Could not initialize session: {e}")
-        
-        for page_num in range(1, 241):  #241
+    fetcher = PageFetcher(mode, browser_pages, requests_per_second)
+
+    # Article pages are fetched concurrently; inserts stay on this thread
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for page_num in range(1, max_pages + 1):
             if len(all_articles) >= max_articles:
                 break
                 
+            if incremental and known_pages >= stop_after_known_pages:
+                print(f"Stopping: {known_pages} consecutive pages with no new articles")
+                break
+
             url = BASE_URL.format(page_num)
             print(f"Page {page_num}: {url}")            
             try:
-                response = page.goto(url, wait_until='networkidle', timeout=20000)
-                
-                if response and response.status == 200:
-                    page.wait_for_timeout(2000)
-                    html = page.content()
-                    articles = parse_index_page(html, page_num)
-                    
-                    print(f"  Found {len(articles)} articles") 
-                    for article in articles:
-                        if len(all_articles) >= max_articles:
-                            break
-
-                        if article['url'] in existing_urls:
-                            print(f"    Skipping (exists): {article['title'][:50]}...")
-                            continue
-                        
-                        print(f"    Scraping: {article['title'][:50]}...")                        
-                        try:
-                            details = scrape_article_details(page, article['url'])
-                            if details:
-                                article.update(details)
-                                insert_article(conn, article, imported_at)
-                                existing_urls.add(article['url'])  # Track this URL
-                                all_articles.append(article)
-                                print(f"      Saved to database")
-                                time.sleep(1)
-                        except Exception as e:
-                            print(f"      Error saving: {e}")
-                            existing_urls.add(article['url'])
+                html = fetcher.fetch(url)
+                pages_crawled += 1
+                if html == "":
+                    print("  Not found")
+                    if incremental:
+                        print("Stopping: end of the index")
+                        break
+                    continue
+                if not html:
+                    print("  Failed (blocked or no response)")
+                    continue
+
+                articles = parse_index_page(html, page_num)
+                print(f"  Found {len(articles)} articles") 
+                if incremental and not articles:
+                    print("Stopping: end of the index")
+                    break
+                if all(article['url'] in existing_urls for article in articles):
+                    known_pages += 1
                 else:
-                    print(f"  Failed (Status: {response.status if response else 'No response'})")
+                    known_pages = 0
+
+                to_scrape = []
+                for article in articles:
+                    if article['url'] in existing_urls:
+                        print(f"    Skipping (exists): {article['title'][:50]}...")
+                        continue
+                    if len(all_articles) + len(to_scrape) >= max_articles:
+                        break
+                    to_scrape.append(article)
+
+                futures = [(article, pool.submit(scrape_article_details, fetcher, article['url'])) for article in to_scrape]
+                for article, future in futures:
+                    print(f"    Scraping: {article['title'][:50]}...")                        
+                    try:
+                        details = future.result()
+                        if details:
+                            article.update(details)
+                            insert_article(stories, newspapers, article, imported_at)
+                            existing_urls.add(article['url'])  # Track this URL
+                            all_articles.append(article)
+                            print("      Staged")
+                    except Exception as e:
+                        print(f"      Error saving: {e}")
+                        existing_urls.add(article['url'])
+
+                # Stories before newspaper rows, so a crash never stages a row without its story
+                stories.flush()
+                newspapers.flush()
+
+                if incremental and reached_high_water_mark(articles, high_water_mark):
+                    print(f"Stopping: reached the last crawl's newest article ({high_water_mark['newest_publish_date']})")
+                    break
                     
             except Exception as e:
                 print(f"  Error: {e}")
-            
-            if len(all_articles) < max_articles:
-                time.sleep(.5)
         
-        browser.close()    
-    conn.close()
+    fetcher.close()
+    conn = connect()
+    try:
+        merge_staging(conn, ("stage_story", "stage_newspaper"))
+        save_high_water_mark(conn, all_articles, pages_crawled, incremental)
+    finally:
+        conn.close()
     
     print(f"\n{'='*50}")
     print(f"SUMMARY")
     print(f"{'='*50}")
     print(f"Articles saved: {len(all_articles)}")
+    print(f"Index pages crawled: {pages_crawled}")
+    print(f"Pages fetched over HTTP: {fetcher.http_pages}, with browser: {fetcher.browser_pages}")
     print(f"{'='*50}\n")
     
     return len(all_articles)
 
 
-def get_opensecrets() -> int:
+def get_opensecrets(
+    mode: str = "auto",
+    concurrency: int = 4,
+    browser_pages: int = 2,
+    incremental: bool = True,
+    stop_after_known_pages: int = 2
+) -> int:
     """Main entry point matching the pattern of get_media_cloud and get_newspaper"""
-    return scrape_opensecrets_articles(max_articles=100000)
+    return scrape_opensecrets_articles(
+        max_articles=100000,
+        mode=mode,
+        concurrency=concurrency,
+        browser_pages=browser_pages,
+        incremental=incremental,
+        stop_after_known_pages=stop_after_known_pages
+    )
 
 
 if __name__ == "__main__":
-    count = get_opensecrets()
+    import sys
+    count = get_opensecrets(incremental="--full" not in sys.argv)
     print(f"Processed {count} article(s)")
\ No newline at end of file
@@ -1,19 +1,54 @@
-import spacy
+import re
 import unicodedata
-import sys
 from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import duckdb
 
-from .db_connection import connect
+from .db_connection import connection
+from .metrics import StageMetrics
+from .staging import StagingWriter, merge_staging
+from .work_queue import LEASED_QUERY, Heartbeat, WorkQueue, ensure_work_queue_table
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("spaCy en_core_web_sm model not found. Please install it with:")
-    print("uv pip install https://github.com/explosion/spacy-models/releases/download/en_core_web_sm-3.8.0/en_core_web_sm-3.8.0-py3-none-any.whl")
-    sys.exit(1)
+SEGMENTERS = ("senter", "parser")
+
+# Same test as longest_matching_sentence: "opensecrets" once periods are dropped
+MATCH_RE = re.compile(r"\.*".join("opensecrets"), re.IGNORECASE)
+
+
+def load_nlp(segmenter: str = "senter"):
+    """en_core_web_sm with only what sentence boundaries need.
+
+    "senter" is the small statistical sentence recognizer that ships disabled in the
+    model, "parser" keeps the dependency parser (slower, slightly better boundaries).
+    """
+    import spacy
+
+    if segmenter not in SEGMENTERS:
+        raise ValueError(f"Unknown segmenter {segmenter!r}, expected one of {SEGMENTERS}")
+
+    unused = ["tagger", "attribute_ruler", "lemmatizer", "ner"]
+    if segmenter == "senter":
+        nlp = spacy.load("en_core_web_sm", exclude=unused + ["parser"])
+        nlp.enable_pipe("senter")
+        if "tok2vec" in nlp.pipe_names and not nlp.get_pipe("tok2vec").listening_components:
+            nlp.remove_pipe("tok2vec")
+    else:
+        nlp = spacy.load("en_core_web_sm", exclude=unused)
+    return nlp
+
+
+@lru_cache(maxsize=None)
+def get_nlp(segmenter: str = "senter"):
+    """Load the spaCy model on first use and reuse it for the life of the process."""
+    try:
+        return load_nlp(segmenter)
+    except OSError as e:
+        raise RuntimeError(
+            "spaCy en_core_web_sm model not found. Please install it with:\n"
+            "uv pip install https://github.com/explosion/spacy-models/releases/download/en_core_web_sm-3.8.0/en_core_web_sm-3.8.0-py3-none-any.whl"
+        ) from e
 
 
 def normalize_quotes(text):
@@ -26,16 +61,13 @@ def normalize_quotes(text):
     return text.strip()
 
 
-def extract_sentences(conn, media_cloud_id, body):
-    """Extract sentences containing 'opensecrets' and insert into stage_sentence."""
+def longest_matching_sentence(sentences: Iterable[str]) -> str:
+    """Longest sentence mentioning OpenSecrets (ignoring periods, as in OpenSecrets.org)."""
     longest_match = ""
     max_length = 0
 
-    # Process text with spaCy
-    doc = nlp(body)
-    
-    for sent in doc.sents:
-        sentence_text = sent.text.strip()
+    for sentence in sentences:
+        sentence_text = sentence.strip()
         normalized_text = sentence_text.replace(".", "")
         
         open_secrets_match = False
@@ -48,42 +80,230 @@ def extract_sentences(conn, media_cloud_id, body):
                 max_length = len(sentence_text)
                 longest_match = sentence_text
 
-    # Always insert a record - with the longest matching sentence or blank if none found
-    import_date = datetime.now()
-    sentence_to_insert = normalize_quotes(longest_match) if longest_match else ""
-    conn.execute(
-        "INSERT OR IGNORE INTO stage_sentence (media_cloud_id, import_date, sentence) VALUES (?, ?, ?)",
-        [media_cloud_id, import_date, sentence_to_insert]
+    return normalize_quotes(longest_match) if longest_match else ""
+
+
+def insert_sentences(conn: duckdb.DuckDBPyConnection, rows: List[Tuple[str, datetime, str]]) -> None:
+    if rows:
+        conn.executemany(
+            "INSERT OR IGNORE INTO stage_sentence (media_cloud_id, import_date, sentence) VALUES (?, ?, ?)",
+            rows
+        )
+
+
+def match_windows(body: str, window_chars: int) -> List[Tuple[int, int]]:
+    """Character ranges around each OpenSecrets mention, merged where they overlap."""
+    windows: List[Tuple[int, int]] = []
+    for match in MATCH_RE.finditer(body):
+        start = max(0, match.start() - window_chars)
+        end = min(len(body), match.end() + window_chars)
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], end)
+        else:
+            windows.append((start, end))
+    return windows
+
+
+def window_sentences(doc, start: int, end: int, body_length: int) -> Optional[List[str]]:
+    """Sentences of a window, or None if a matching sentence may have been cut off.
+
+    The first and last sentences of a window are only trusted when the window reaches
+    the start or end of the article.
+    """
+    sentences = []
+    for sent in doc.sents:
+        cut = (start > 0 and sent.start == 0) or (end < body_length and sent.end == len(doc))
+        if cut and MATCH_RE.search(sent.text):
+            return None
+        sentences.append(sent.text)
+    return sentences
+
+
+def iter_sentences(
+    nlp,
+    rows: Iterable[Tuple[str, str]],
+    batch_size: int = 64,
+    n_process: int = 1,
+    window_chars: int = 1000,
+    metrics: Optional[StageMetrics] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Yield (media_cloud_id, longest matching sentence or "") for (media_cloud_id, body) rows.
+
+    Bodies without a mention skip spaCy. Otherwise only a window of window_chars either
+    side of each mention is segmented, falling back to the whole body when a matching
+    sentence touches the edge of its window. window_chars=0 always segments whole bodies.
+    metrics, if given, counts spaCy docs and the bodies that skipped or fell back.
+    """
+    metrics = metrics or StageMetrics("sentence")
+    skipped: List[str] = []
+    in_progress: Dict[str, str] = {}
+    fallback: Dict[str, str] = {}
+
+    def windows() -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+        for media_cloud_id, body in rows:
+            spans = match_windows(body, window_chars) if window_chars else [(0, len(body))]
+            if not spans:
+                skipped.append(media_cloud_id)
+                metrics.count("bodies_skipped")
+                continue
+            in_progress[media_cloud_id] = body
+            for i, (start, end) in enumerate(spans):
+                yield body[start:end], (media_cloud_id, start, end, len(body), i == len(spans) - 1)
+
+    sentences: List[str] = []
+    ambiguous = False
+    docs = nlp.pipe(windows(), as_tuples=True, batch_size=batch_size, n_process=n_process)
+    for doc, (media_cloud_id, start, end, body_length, last) in docs:
+        metrics.count("spacy_docs")
+        metrics.count("spacy_chars", end - start)
+        while skipped:
+            yield skipped.pop(), ""
+
+        found = window_sentences(doc, start, end, body_length)
+        if found is None:
+            ambiguous = True
+        else:
+            sentences.extend(found)
+
+        if last:
+            body = in_progress.pop(media_cloud_id)
+            if ambiguous:
+                fallback[media_cloud_id] = body
+            else:
+                yield media_cloud_id, longest_matching_sentence(sentences)
+            sentences = []
+            ambiguous = False
+
+    while skipped:
+        yield skipped.pop(), ""
+
+    metrics.count("bodies_fallback", len(fallback))
+    docs = nlp.pipe(
+        ((body, media_cloud_id) for media_cloud_id, body in fallback.items()),
+        as_tuples=True,
+        batch_size=batch_size,
+        n_process=n_process,
     )
+    for doc, media_cloud_id in docs:
+        metrics.count("spacy_docs")
+        metrics.count("spacy_chars", len(doc.text))
+        yield media_cloud_id, longest_matching_sentence(sent.text for sent in doc.sents)
 
 
-def get_sentence():
-    conn = connect() 
-    
-    try:
-        # Get stories with no sentence record
-        result = conn.execute("""
+def extract_sentences(conn, media_cloud_id, body):
+    """Extract sentences containing 'opensecrets' and insert into stage_sentence."""
+    # Always insert a record - with the longest matching sentence or blank if none found
+    for _, sentence_to_insert in iter_sentences(get_nlp(), [(media_cloud_id, body)]):
+        insert_sentences(conn, [(media_cloud_id, datetime.now(), sentence_to_insert)])
+
+
+def get_sentence(
+    batch_size: int = 64,
+    n_process: int = 1,
+    segmenter: str = "senter",
+    write_batch_size: int = 500,
+    window_chars: int = 1000,
+    conn: Optional[duckdb.DuckDBPyConnection] = None,
+    metrics: Optional[StageMetrics] = None,
+):
+    metrics = metrics or StageMetrics("sentence")
+    with connection(conn) as conn:
+        ensure_work_queue_table(conn)
+        merge_staging(conn, ("stage_sentence",))
+        # Get stories with no sentence record, that no queue worker holds
+        result = conn.execute(f"""
             SELECT media_cloud_id, text 
                 FROM stage_newspaper
                 WHERE text <> '' 
                 AND media_cloud_id NOT IN (SELECT media_cloud_id FROM stage_sentence)
-        """).fetchall()
+                AND media_cloud_id NOT IN ({LEASED_QUERY})
+        """, {"queue": "sentence"}).fetchall()
         
         total = len(result)
         print(f"Found {total} stories to find sentences for")
-        
+
+        sentences = iter_sentences(
+            get_nlp(segmenter),
+            result,
+            batch_size=batch_size,
+            n_process=n_process,
+            window_chars=window_chars,
+            metrics=metrics,
+        )
+
         count = 0
-        for row in result:
-            extract_sentences(conn, row[0], row[1])  # media_cloud_id and text
+        pending: List[Tuple[str, datetime, str]] = []
+        for media_cloud_id, sentence in sentences:
+            # Always insert a record - with the longest matching sentence or blank if none found
+            pending.append((media_cloud_id, datetime.now(), sentence))
             count += 1
+            if sentence:
+                metrics.count("sentences_found")
+            if len(pending) >= write_batch_size:
+                insert_sentences(conn, pending)
+                pending.clear()
             if count % 100 == 0:
                 print(f"Checked {count} of {total} stories...")
+        insert_sentences(conn, pending)
                     
         print(f"Complete! Looked for sentences for {count} of {total} stories.")
-        
-    finally:
-        conn.close()
+        metrics.count("rows_written", count)
+        metrics.save(conn)
+        return count
+
+
+def sentence_worker(
+    batch_size: int = 500,
+    n_process: int = 1,
+    segmenter: str = "senter",
+    window_chars: int = 1000,
+    lease_seconds: float = 300,
+    owner: Optional[str] = None,
+) -> int:
+    """Find sentences for stories claimed from the sentence work queue until it is empty.
+
+    Like newspaper_worker, any number can run at once: each batch's rows go to this
+    worker's staging files, and get_sentence (or merge_staging) loads them.
+    """
+    work_queue = WorkQueue("sentence", owner=owner, lease_seconds=lease_seconds)
+    queued = work_queue.enqueue()
+    print(f"Worker {work_queue.owner}: {queued} stories newly queued")
+
+    nlp = get_nlp(segmenter)
+    staging = StagingWriter("stage_sentence", work_queue.owner)
+    count = 0
+    while True:
+        ids = work_queue.claim(batch_size)
+        if not ids:
+            break
+        try:
+            with Heartbeat(work_queue, ids):
+                with work_queue.session() as conn:
+                    rows = conn.execute(
+                        "SELECT media_cloud_id, text FROM stage_newspaper WHERE media_cloud_id IN (SELECT UNNEST(?))",
+                        [ids],
+                    ).fetchall()
+                found = 0
+                for media_cloud_id, sentence in iter_sentences(
+                    nlp, rows, n_process=n_process, window_chars=window_chars
+                ):
+                    staging.add((media_cloud_id, datetime.now(), sentence))
+                    found += 1
+
+            staging.flush()
+            work_queue.complete(ids)
+        except BaseException:
+            work_queue.release(ids)
+            raise
+
+        count += found
+        print(f"Worker {work_queue.owner}: looked for sentences in {found} stories")
+    return count
 
 
 if __name__ == "__main__":
-    get_sentence()
\ No newline at end of file
+    import sys
+    if "--worker" in sys.argv:
+        sentence_worker()
+    else:
+        get_sentence()
\ No newline at end of file
@@ -0,0 +1,155 @@
+# data/assets/html_archive.py
+import hashlib
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import duckdb
+
+from .db_connection import database_path
+from .staging import StagingWriter
+
+
+def default_archive_dir() -> Path:
+    """HTML_ARCHIVE_DIR if set, otherwise html_archive/ next to the DuckDB file."""
+    configured = os.getenv("HTML_ARCHIVE_DIR")
+    if configured:
+        return Path(configured)
+    return Path(database_path() or "db/data.duckdb").parent / "html_archive"
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def ensure_archive_table(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS html_archive (
+            media_cloud_id  VARCHAR PRIMARY KEY,
+            url             VARCHAR   NOT NULL,
+            url_hash        VARCHAR   NOT NULL,
+            content_hash    VARCHAR   NOT NULL,
+            shard           VARCHAR   NOT NULL,
+            byte_length     INTEGER   NOT NULL,
+            fetched_at      TIMESTAMP NOT NULL
+        )
+    """)
+
+
+class HtmlArchive:
+    """Append-only store of downloaded HTML.
+
+    Pages are buffered and written as zstd-compressed Parquet shards of
+    (content_hash, html), so identical pages are stored once. The html_archive
+    table maps each media_cloud_id to the shard holding its content.
+    """
+
+    def __init__(
+        self,
+        conn: Optional[duckdb.DuckDBPyConnection],
+        archive_dir: Optional[Path] = None,
+        shard_size: int = 500,
+        staging: Optional[StagingWriter] = None,
+    ):
+        """With conn=None, html_archive rows go to the staging writer instead, and
+        content is only deduplicated within each shard it writes."""
+        self.conn = conn
+        self.staging = staging
+        self.archive_dir = Path(archive_dir or default_archive_dir())
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        self.pending_html: Dict[str, str] = {}
+        self.pending_rows: List[Tuple] = []
+        if conn is not None:
+            ensure_archive_table(conn)
+        elif staging is None:
+            raise ValueError("HtmlArchive needs a connection or a staging writer")
+
+    def add(self, media_cloud_id: str, url: str, html: str, fetched_at: datetime) -> None:
+        if not html:
+            return
+        digest = content_hash(html)
+        self.pending_html[digest] = html
+        self.pending_rows.append(
+            (str(media_cloud_id), url, url_hash(url), digest, len(html.encode("utf-8", "surrogatepass")), fetched_at)
+        )
+        if len(self.pending_html) >= self.shard_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending_rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Content already archived by an earlier shard is referenced, not rewritten
+        digests = list(self.pending_html)
+        existing = dict(self.conn.execute("""
+            SELECT content_hash, ANY_VALUE(shard)
+            FROM html_archive
+            WHERE content_hash IN (SELECT UNNEST(?))
+            GROUP BY content_hash
+        """, [digests]).fetchall()) if self.conn is not None else {}
+
+        new_digests = [d for d in digests if d not in existing]
+        shard_name = f"shard-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        if new_digests:
+            table = pa.table({
+                "content_hash": new_digests,
+                "html": [self.pending_html[d] for d in new_digests],
+            })
+            pq.write_table(table, self.archive_dir / shard_name, compression="zstd", compression_level=9)
+
+        rows = [
+            (media_cloud_id, url, u_hash, digest, existing.get(digest, shard_name), size, fetched_at)
+            for media_cloud_id, url, u_hash, digest, size, fetched_at in self.pending_rows
+        ]
+        if self.conn is not None:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO html_archive VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        else:
+            for row in rows:
+                self.staging.add(row)
+        self.pending_html.clear()
+        self.pending_rows.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+
+def iter_archived(
+    conn: duckdb.DuckDBPyConnection,
+    archive_dir: Optional[Path] = None,
+    media_cloud_ids: Optional[Iterable[str]] = None,
+) -> Iterator[Tuple[str, str, str]]:
+    """Yield (media_cloud_id, url, html) for archived pages, one shard at a time."""
+    import pyarrow.parquet as pq
+
+    archive_dir = Path(archive_dir or default_archive_dir())
+    ensure_archive_table(conn)
+    sql = "SELECT shard, media_cloud_id, url, content_hash FROM html_archive"
+    params: List = []
+    if media_cloud_ids is not None:
+        sql += " WHERE media_cloud_id IN (SELECT UNNEST(?))"
+        params.append([str(i) for i in media_cloud_ids])
+    sql += " ORDER BY shard"
+
+    by_shard: Dict[str, List[Tuple[str, str, str]]] = {}
+    for shard, media_cloud_id, url, digest in conn.execute(sql, params).fetchall():
+        by_shard.setdefault(shard, []).append((media_cloud_id, url, digest))
+
+    for shard, entries in by_shard.items():
+        table = pq.read_table(archive_dir / shard)
+        html_by_hash = dict(zip(table.column("content_hash").to_pylist(), table.column("html").to_pylist()))
+        for media_cloud_id, url, digest in entries:
+            html = html_by_hash.get(digest)
+            if html is not None:
+                yield media_cloud_id, url, html
@@ -1,10 +1,43 @@
+import csv
 import duckdb
-from pathlib import Path
-import brotli
 import gzip
+import io
+import json
+import queue
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .db_connection import connection  # dagster
+from .metrics import StageMetrics
+#from db_connection import connection   # vscode
+
+
+EXPORT_QUERY = "SELECT * FROM story_web_view WHERE media_outlet <> 'Unspecified'"
 
-from .db_connection import connect  # dagster
-#from db_connection import connect   # vscode
+# Columns the charts filter on; they go in the first-paint index as integer codes
+FACET_COLUMNS = ("media_outlet", "bias_rating", "media_outlet_type", "state")
+# Columns only the story list needs; they go in id-range detail shards
+DETAIL_COLUMNS = ("title", "url", "authors", "image", "sentence")
+# Facet pairs precomputed for the aggregate cube: each chart's facet with bias_rating,
+# which the first-paint preview (showPreview in web/js/main.js) colors rows by
+FACET_PAIRS = (
+    ("media_outlet", "bias_rating"),
+    ("media_outlet_type", "bias_rating"),
+    ("state", "bias_rating"),
+)
+TIME_BUCKETS = ("day", "week", "month")
+
+# Parquet layout for range reads: rows sorted so date and facet filters hit few row groups,
+# each row group small enough that fetching one is cheap over HTTP
+PARQUET_SORT_COLUMNS = ("publish_date", "media_outlet_type", "bias_rating", "media_outlet")
+PARQUET_DICTIONARY_COLUMNS = (
+    "publish_date", "language", "media_outlet", "media_outlet_type",
+    "state", "state_code", "bias_rating", "syndicator",
+)
+PARQUET_ROW_GROUP_ROWS = 2048
 
 
 def to_camel_case(snake_str):
@@ -12,62 +45,517 @@ def to_camel_case(snake_str):
     return components[0] + ''.join(x.title() for x in components[1:])
 
 
+def camel_case_query(conn: duckdb.DuckDBPyConnection, query: str, params: Optional[List[Any]] = None) -> str:
+    """Wrap query so its columns come back camelCased, as the site expects."""
+    columns = [col[0] for col in conn.execute(f"SELECT * FROM ({query}) LIMIT 0", params or []).description]
+    select = ", ".join(f'"{col}" AS "{to_camel_case(col)}"' for col in columns)
+    return f"SELECT {select} FROM ({query})"
+
+
+class FileSink:
+    """Writes chunks to a file on its own thread, optionally through a streaming compressor.
+
+    The queue is bounded so a slow compressor applies back pressure instead of
+    letting the export buffer the whole table.
+    """
+
+    def __init__(self, path, compressor=None, queue_size: int = 8):
+        self.path = Path(path)
+        self.compressor = compressor
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.error: Optional[BaseException] = None
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=queue_size)
+        self.thread = threading.Thread(target=self._run, name=f"export-{self.path.name}", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        try:
+            with open(self.path, "wb") as f_out:
+                while True:
+                    chunk = self.queue.get()
+                    if chunk is None:
+                        break
+                    self.bytes_in += len(chunk)
+                    out = self.compressor.compress(chunk) if self.compressor else chunk
+                    f_out.write(out)
+                    self.bytes_out += len(out)
+                if self.compressor:
+                    out = self.compressor.finish()
+                    f_out.write(out)
+                    self.bytes_out += len(out)
+        except BaseException as e:
+            self.error = e
+            # Keep draining so the producer never blocks on a dead writer
+            while self.queue.get() is not None:
+                pass
+
+    def write(self, chunk: bytes) -> None:
+        self.queue.put(chunk)
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.thread.join()
+        if self.error:
+            raise self.error
+
+
+class GzipCompressor:
+    # wbits=31 writes a gzip container; zlib leaves mtime at 0, so output is reproducible
+    def __init__(self, level: int = 9):
+        self.obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self.obj.compress(chunk)
+
+    def finish(self) -> bytes:
+        return self.obj.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int = 11):
+        import brotli
+        self.obj = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self.obj.process(chunk)
+
+    def finish(self) -> bytes:
+        return self.obj.finish()
+
+
+class RowGroupWriter:
+    """ParquetWriter that buffers record batches into row groups of exactly row_group_rows,
+    with zstd, dictionaries only on low-cardinality columns, statistics and a page index."""
+
+    def __init__(self, path, schema, row_group_rows: int = PARQUET_ROW_GROUP_ROWS, sorting_columns=None):
+        import pyarrow.parquet as pq
+
+        self.row_group_rows = row_group_rows
+        dictionary = [to_camel_case(col) for col in PARQUET_DICTIONARY_COLUMNS]
+        self.writer = pq.ParquetWriter(
+            path,
+            schema,
+            compression="zstd",
+            compression_level=9,
+            use_dictionary=[name for name in schema.names if name in dictionary],
+            write_statistics=True,
+            write_page_index=True,
+            sorting_columns=sorting_columns,
+        )
+        self.pending = []
+        self.pending_rows = 0
+
+    def write_batch(self, batch) -> None:
+        self.pending.append(batch)
+        self.pending_rows += batch.num_rows
+        if self.pending_rows >= self.row_group_rows:
+            self._write(final=False)
+
+    def _write(self, final: bool) -> None:
+        import pyarrow as pa
+
+        table = pa.Table.from_batches(self.pending)
+        full = table.num_rows if final else table.num_rows - table.num_rows % self.row_group_rows
+        if full:
+            self.writer.write_table(table.slice(0, full), row_group_size=self.row_group_rows)
+        rest = table.slice(full)
+        self.pending = rest.to_batches() if rest.num_rows else []
+        self.pending_rows = rest.num_rows
+
+    def close(self) -> None:
+        if self.pending_rows:
+            self._write(final=True)
+        self.writer.close()
+
+
+def encode_csv(batch, include_header: bool) -> bytes:
+    """batch as CSV, quoting only values that need it, as pandas' to_csv did; Arrow's CSV
+    writer can only quote every string. Values are formatted by Arrow's string cast."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if include_header:
+        writer.writerow(batch.schema.names)
+    writer.writerows(zip(*(pc.cast(column, pa.string()).to_pylist() for column in batch.columns)))
+    return buffer.getvalue().encode("utf-8")
+
+
+def stream_export(
+    conn: duckdb.DuckDBPyConnection,
+    query: str,
+    params: Optional[List[Any]] = None,
+    csv_path = None,
+    parquet_path = None,
+    brotli_path = None,
+    gzip_path = None,
+    rows_per_batch: int = 10_000,
+    order_by: Sequence[str] = PARQUET_SORT_COLUMNS,
+    row_group_rows: int = PARQUET_ROW_GROUP_ROWS,
+) -> Dict[str, Any]:
+    """Stream query results as Arrow record batches into any of the four outputs.
+
+    Each batch is encoded to CSV once and handed to the plain, gzip and brotli
+    writers, which compress in parallel on their own threads; Parquet is written
+    in row groups on the calling thread. Only a few batches are in memory at once.
+
+    order_by only applies to Parquet, laying out its row groups for range reads; the CSV
+    outputs keep the query's own order, so with both the query runs twice.
+    """
+    import pyarrow.parquet as pq
+
+    csv_query = camel_case_query(conn, query, params)
+    parquet_query = csv_query
+    if order_by:
+        parquet_query = f"SELECT * FROM ({query}) ORDER BY {', '.join(order_by)}"
+        parquet_query = camel_case_query(conn, parquet_query, params)
+
+    sinks: Dict[str, FileSink] = {}
+    if csv_path:
+        sinks["csv"] = FileSink(csv_path)
+    if gzip_path:
+        sinks["gz"] = FileSink(gzip_path, GzipCompressor(9))
+    if brotli_path:
+        sinks["br"] = FileSink(brotli_path, BrotliCompressor(11))
+
+    def batches(sql: str):
+        return conn.execute(sql, params or []).fetch_record_batch(rows_per_batch)
+
+    def parquet_writer_for(reader):
+        sorting_columns = [
+            pq.SortingColumn(reader.schema.get_field_index(to_camel_case(col))) for col in order_by or ()
+        ]
+        return RowGroupWriter(parquet_path, reader.schema, row_group_rows, sorting_columns or None)
+
+    parquet_writer = None
+    rows = 0
+    try:
+        if parquet_path and sinks and order_by:
+            # The CSV outputs keep the query's order, so Parquet gets a pass of its own,
+            # finished before the next query replaces this result on the connection
+            parquet_reader = batches(parquet_query)
+            parquet_writer = parquet_writer_for(parquet_reader)
+            for batch in parquet_reader:
+                parquet_writer.write_batch(batch)
+            parquet_writer.close()
+            parquet_writer = None
+            reader = batches(csv_query)
+        else:
+            reader = batches(csv_query if sinks else parquet_query)
+            if parquet_path:
+                parquet_writer = parquet_writer_for(reader)
+
+        include_header = True
+        for batch in reader:
+            rows += batch.num_rows
+            if sinks:
+                chunk = encode_csv(batch, include_header)
+                include_header = False
+                for sink in sinks.values():
+                    sink.write(chunk)
+            if parquet_writer:
+                parquet_writer.write_batch(batch)
+
+        # An empty result still gets a header row
+        if include_header and sinks:
+            header = (",".join(reader.schema.names) + "\n").encode("utf-8")
+            for sink in sinks.values():
+                sink.write(header)
+    finally:
+        if parquet_writer:
+            parquet_writer.close()
+        for sink in sinks.values():
+            sink.close()
+
+    return {
+        "rows": rows,
+        "csv_bytes": next((sink.bytes_in for sink in sinks.values()), 0),
+        **{f"{name}_bytes": sink.bytes_out for name, sink in sinks.items() if name != "csv"},
+        "parquet_bytes": Path(parquet_path).stat().st_size if parquet_path else 0,
+    }
+
+
 def make_stories_parquet(
     csv_path = "web/data/stories.csv",
     parquet_path = "web/data/stories.parquet",
     brotli_path = "web/data/stories.csv.br",
-    gzip_path = "web/data/stories.csv.gz"
+    gzip_path = "web/data/stories.csv.gz",
+    site_dir = "web/data/site",
+    conn: Optional[duckdb.DuckDBPyConnection] = None,
+    metrics: Optional[StageMetrics] = None,
 ):
-    conn = connect()
-    df = conn.execute("""
-        SELECT * FROM story_web_view WHERE media_outlet <> 'Unspecified'
-    """).fetchdf()
-    conn.close()
-    story_count = len(df)  
-
-    df.columns = [to_camel_case(col) for col in df.columns]
-    
-    # Export CSV
-    df.to_csv(csv_path, index=False)
-    csv_size = Path(csv_path).stat().st_size
-    print(f"Exported {story_count} stories to {csv_path}")
-
-    # Export Parquet
-    df.to_parquet(parquet_path, index=False)
-    parquet_size = Path(parquet_path).stat().st_size
-    print(f"Exported {story_count} stories to {parquet_path}")
-
-    # Read CSV data once for compression
-    with open(csv_path, 'rb') as f_in:
-        csv_data = f_in.read()
-
-    # Export Brotli-compressed CSV
-    compressed_br = brotli.compress(csv_data, quality=11)
-    with open(brotli_path, 'wb') as f_out:
-        f_out.write(compressed_br)
-    
-    br_ratio = (1 - len(compressed_br) / len(csv_data)) * 100
-    print(f"Exported {story_count} stories to {brotli_path}")
-    print(f"Brotli compression: {len(csv_data):,} bytes -> {len(compressed_br):,} bytes ({br_ratio:.1f}% reduction)")
-
-    # Export Gzip-compressed CSV
-    with gzip.open(gzip_path, 'wb', compresslevel=9) as f_out:
-        f_out.write(csv_data)
-    
-    gz_size = Path(gzip_path).stat().st_size
-    gz_ratio = (1 - gz_size / len(csv_data)) * 100
-    print(f"Exported {story_count} stories to {gzip_path}")
-    print(f"Gzip compression: {len(csv_data):,} bytes -> {gz_size:,} bytes ({gz_ratio:.1f}% reduction)")
+    metrics = metrics or StageMetrics("export")
+    with connection(conn) as conn:
+        with metrics.step("stories"):
+            sizes = stream_export(
+                conn,
+                EXPORT_QUERY,
+                csv_path=csv_path,
+                parquet_path=parquet_path,
+                brotli_path=brotli_path,
+                gzip_path=gzip_path,
+            )
+        for output in ("csv", "parquet", "br", "gz"):
+            metrics.count("bytes_written", sizes.get(f"{output}_bytes", 0), output)
+        if site_dir:
+            with metrics.step("site_payload"):
+                payload = make_site_payload(conn, site_dir)
+            with metrics.step("aggregates"):
+                aggregates_path = Path(site_dir) / "aggregates.json"
+                make_aggregates(conn, aggregates_path)
+            metrics.count("bytes_written", payload["index_bytes"], "site_index")
+            metrics.count("bytes_written", payload["detail_bytes"], "site_details")
+            metrics.count("bytes_written", aggregates_path.stat().st_size, "aggregates")
+        metrics.count("stories", sizes["rows"])
+        metrics.save(conn)
+
+    story_count = sizes["rows"]
+    csv_size = sizes["csv_bytes"]
+    parquet_size = sizes["parquet_bytes"]
+    br_size = sizes["br_bytes"]
+    gz_size = sizes["gz_bytes"]
+    for path in (csv_path, parquet_path, brotli_path, gzip_path):
+        print(f"Exported {story_count} stories to {path}")
+
+    br_ratio = (1 - br_size / csv_size) * 100
+    gz_ratio = (1 - gz_size / csv_size) * 100
+    print(f"Brotli compression: {csv_size:,} bytes -> {br_size:,} bytes ({br_ratio:.1f}% reduction)")
+    print(f"Gzip compression: {csv_size:,} bytes -> {gz_size:,} bytes ({gz_ratio:.1f}% reduction)")
 
     # Summary comparison
     print("\n=== Compression Summary ===")
     print(f"Original CSV:    {csv_size:,} bytes")
     print(f"Parquet:         {parquet_size:,} bytes ({(1-parquet_size/csv_size)*100:.1f}% reduction)")
-    print(f"Brotli (.br):    {len(compressed_br):,} bytes ({br_ratio:.1f}% reduction)")
+    print(f"Brotli (.br):    {br_size:,} bytes ({br_ratio:.1f}% reduction)")
     print(f"Gzip (.gz):      {gz_size:,} bytes ({gz_ratio:.1f}% reduction)")
-    print(f"Brotli vs Gzip:  {((gz_size - len(compressed_br)) / gz_size * 100):.1f}% smaller")
+    print(f"Brotli vs Gzip:  {((gz_size - br_size) / gz_size * 100):.1f}% smaller")
 
     return story_count
 
+
+def write_json_gz(path: Path, data: Any) -> int:
+    payload = gzip.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"), compresslevel=9, mtime=0)
+    path.write_bytes(payload)
+    return len(payload)
+
+
+def make_site_payload(
+    conn: duckdb.DuckDBPyConnection,
+    out_dir = "web/data/site",
+    shard_size: int = 500
+) -> Dict[str, Any]:
+    """Write the files the site loads: a small index for the charts and detail shards for the list.
+
+    index.json.gz holds one column per field: id, publish date as days since 1970-01-01,
+    and an integer code into a lookup table for each facet. Text used only by the story
+    list is written to details-N.json.gz, where N is id // shard_size, and fetched on demand.
+    """
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    # NULL state is exported as '', as in the CSV
+    facets = ", ".join(f"COALESCE({col}, '') AS {col}" for col in FACET_COLUMNS)
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE site_export AS
+        SELECT id, publish_date, {facets}, {", ".join(DETAIL_COLUMNS)}
+        FROM ({EXPORT_QUERY})
+    """)
+
+    lookups: Dict[str, List[str]] = {}
+    for col in FACET_COLUMNS:
+        lookups[to_camel_case(col)] = [
+            row[0] for row in conn.execute(f"SELECT DISTINCT {col} FROM site_export ORDER BY {col}").fetchall()
+        ]
+
+    # dense_rank over the same ordering as the lookup gives each value its position in it
+    index_columns = ["id", "publishDay"] + [to_camel_case(col) for col in FACET_COLUMNS]
+    rows = conn.execute(f"""
+        SELECT
+            list(id ORDER BY id),
+            list(publish_date - DATE '1970-01-01' ORDER BY id),
+            {", ".join(f"list({col}_code ORDER BY id)" for col in FACET_COLUMNS)}
+        FROM (
+            SELECT id, publish_date,
+                {", ".join(f"dense_rank() OVER (ORDER BY {col}) - 1 AS {col}_code" for col in FACET_COLUMNS)}
+            FROM site_export
+        )
+    """).fetchone()
+    story_count = len(rows[0] or [])
+
+    index_bytes = write_json_gz(out_path / "index.json.gz", {
+        "shardSize": shard_size,
+        "lookups": lookups,
+        "columns": {name: values or [] for name, values in zip(index_columns, rows)},
+    })
+
+    # Detail shards, streamed in id order so only one shard is held at a time
+    written = set()
+    detail_bytes = 0
+    cursor = conn.execute(f"SELECT id, {', '.join(DETAIL_COLUMNS)} FROM site_export ORDER BY id")
+    shard, details = None, {}
+    while True:
+        batch = cursor.fetchmany(1000)
+        for row in batch:
+            if row[0] // shard_size != shard:
+                if details:
+                    detail_bytes += write_json_gz(out_path / f"details-{shard}.json.gz", details)
+                    written.add(f"details-{shard}.json.gz")
+                shard, details = row[0] // shard_size, {}
+            details[row[0]] = dict(zip((to_camel_case(col) for col in DETAIL_COLUMNS), row[1:]))
+        if not batch:
+            break
+    if details:
+        detail_bytes += write_json_gz(out_path / f"details-{shard}.json.gz", details)
+        written.add(f"details-{shard}.json.gz")
+
+    for stale in out_path.glob("details-*.json.gz"):
+        if stale.name not in written:
+            stale.unlink()
+
+    conn.execute("DROP TABLE site_export")
+    print(f"Site index: {story_count} stories, {index_bytes:,} bytes; {len(written)} detail shards, {detail_bytes:,} bytes")
+    return {"story_count": story_count, "index_bytes": index_bytes, "shards": len(written), "detail_bytes": detail_bytes}
+
+
+def make_aggregates(
+    conn: duckdb.DuckDBPyConnection,
+    path = "web/data/site/aggregates.json"
+) -> Dict[str, Any]:
+    """Write story counts by each facet, time bucket and FACET_PAIRS, from one GROUPING SETS query.
+
+    Keys are camelCased column names joined with "|" in the order the grouping set lists
+    them, e.g. "state" or "mediaOutlet|biasRating", and each entry is a list of
+    [value, ..., count] rows. Weeks start on Monday; dates are YYYY-MM-DD.
+    """
+    dimensions = list(FACET_COLUMNS) + list(TIME_BUCKETS)
+    grouping_sets = [()] + [(dim,) for dim in dimensions] + list(FACET_PAIRS)
+    sets_sql = ", ".join("(" + ", ".join(group) + ")" for group in grouping_sets)
+    set_order = {frozenset(group): group for group in grouping_sets}
+    facets = ", ".join(f"COALESCE({col}, '') AS {col}" for col in FACET_COLUMNS)
+
+    result = conn.execute(f"""
+        SELECT
+            {", ".join(f"GROUPING({dim}) AS g_{dim}" for dim in dimensions)},
+            {", ".join(dimensions)},
+            COUNT(*) AS stories
+        FROM (
+            SELECT
+                {facets},
+                strftime(publish_date, '%Y-%m-%d') AS day,
+                strftime(date_trunc('week', publish_date), '%Y-%m-%d') AS week,
+                strftime(publish_date, '%Y-%m') AS month
+            FROM ({EXPORT_QUERY})
+        )
+        GROUP BY GROUPING SETS ({sets_sql})
+        ORDER BY ALL
+    """).fetchall()
+
+    total = 0
+    groups: Dict[str, List[List[Any]]] = {}
+    for row in result:
+        flags = row[:len(dimensions)]
+        values = row[len(dimensions):-1]
+        grouped = [i for i, flag in enumerate(flags) if flag == 0]
+        if not grouped:
+            total = row[-1]
+            continue
+        # Key and values in the grouping set's own order, which is what the site looks up
+        grouped = [dimensions.index(dim) for dim in set_order[frozenset(dimensions[i] for i in grouped)]]
+        key = "|".join(to_camel_case(dimensions[i]) for i in grouped)
+        groups.setdefault(key, []).append([values[i] for i in grouped] + [row[-1]])
+
+    aggregates = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "total": total,
+        "groups": groups,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(aggregates, separators=(",", ":")))
+    print(f"Wrote aggregates for {total} stories to {path} ({path.stat().st_size:,} bytes)")
+    return aggregates
+
+
+def make_story_partitions(
+    out_dir = "web/data/partitions",
+    manifest_name = "manifest.json",
+    conn: Optional[duckdb.DuckDBPyConnection] = None,
+    metrics: Optional[StageMetrics] = None,
+) -> Dict[str, Any]:
+    """Export one file set per publish month, rewriting only months whose rows changed.
+
+    Each month is fingerprinted in DuckDB (row count and md5 of its rows as JSON), and
+    compared with the manifest from the last export, so unchanged months are never
+    fetched, written or recompressed.
+    """
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_path / manifest_name
+    previous = json.loads(manifest_path.read_text())["partitions"] if manifest_path.exists() else {}
+    metrics = metrics or StageMetrics("export_partitions")
+
+    with connection(conn) as conn:
+        fingerprints = conn.execute(f"""
+            SELECT
+                strftime(publish_date, '%Y-%m') AS partition,
+                COUNT(*) AS rows,
+                md5(string_agg(to_json(v)::VARCHAR, chr(10) ORDER BY v.id)) AS hash
+            FROM ({EXPORT_QUERY}) v
+            GROUP BY partition
+            ORDER BY partition
+        """).fetchall()
+
+        partitions: Dict[str, Any] = {}
+        rewritten = 0
+        for partition, rows, content_hash in fingerprints:
+            files = {
+                "gz": f"stories-{partition}.csv.gz",
+                "br": f"stories-{partition}.csv.br",
+                "parquet": f"stories-{partition}.parquet",
+            }
+            partitions[partition] = {"rows": rows, "hash": content_hash, "files": files}
+
+            unchanged = (
+                previous.get(partition, {}).get("hash") == content_hash
+                and all((out_path / name).exists() for name in files.values())
+            )
+            if unchanged:
+                continue
+
+            sizes = stream_export(
+                conn,
+                f"SELECT * FROM ({EXPORT_QUERY}) WHERE strftime(publish_date, '%Y-%m') = ?",
+                [partition],
+                parquet_path=out_path / files["parquet"],
+                brotli_path=out_path / files["br"],
+                gzip_path=out_path / files["gz"],
+            )
+            for output in files:
+                metrics.count("bytes_written", sizes[f"{output}_bytes"], output)
+            metrics.count("stories_rewritten", rows)
+            rewritten += 1
+            print(f"Exported {rows} stories to {files['gz']}")
+
+        metrics.count("partitions_rewritten", rewritten)
+        metrics.set("partitions", len(partitions))
+        metrics.save(conn)
+
+    # Months that no longer have stories
+    for partition in set(previous) - set(partitions):
+        for name in previous[partition]["files"].values():
+            (out_path / name).unlink(missing_ok=True)
+
+    manifest_path.write_text(json.dumps({
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "partitions": partitions,
+    }, indent=1))
+
+    story_count = sum(p["rows"] for p in partitions.values())
+    print(f"Rewrote {rewritten} of {len(partitions)} partitions ({story_count} stories)")
+    return {"story_count": story_count, "partitions": len(partitions), "rewritten": rewritten}
+
+
 if __name__ == "__main__":
     make_stories_parquet()
\ No newline at end of file
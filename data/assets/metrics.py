@@ -0,0 +1,175 @@
+# data/assets/metrics.py
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import duckdb
+
+# Upper bounds in seconds; anything slower lands in the overflow bucket
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def ensure_metrics_table(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_run_metrics (
+            run_id      VARCHAR   NOT NULL,
+            stage       VARCHAR   NOT NULL,
+            metric      VARCHAR   NOT NULL,
+            label       VARCHAR   NOT NULL DEFAULT '',  -- e.g. the domain for per-domain fetch latency
+            value       DOUBLE    NOT NULL,
+            recorded_at TIMESTAMP NOT NULL
+        )
+    """)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; quantiles are interpolated within a bucket."""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+        }
+
+
+class StageMetrics:
+    """Counters, gauges and latency histograms for one run of one pipeline stage.
+
+    Unlabelled counters get a per-second rate over the stage's run time. observe() with
+    a label (a domain, say) feeds both that label's histogram and the stage-wide one.
+    Safe to update from worker threads. save() writes everything to pipeline_run_metrics,
+    one row per value, under run_id (the Dagster run id when run as an asset).
+    """
+
+    def __init__(self, stage: str, run_id: Optional[str] = None):
+        self.stage = stage
+        self.run_id = run_id or uuid.uuid4().hex
+        self.counters: Dict[Tuple[str, str], float] = {}
+        self.gauges: Dict[Tuple[str, str], float] = {}
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.seconds: Optional[float] = None
+
+    def count(self, name: str, value: float = 1, label: str = "") -> None:
+        with self.lock:
+            self.counters[name, label] = self.counters.get((name, label), 0) + value
+
+    def set(self, name: str, value: float, label: str = "") -> None:
+        with self.lock:
+            self.gauges[name, label] = value
+
+    def observe(self, name: str, seconds: float, label: str = "") -> None:
+        with self.lock:
+            for key in {(name, ""), (name, label)}:
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram()
+                self.histograms[key].observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, label: str = "") -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, label)
+
+    @contextmanager
+    def step(self, label: str) -> Iterator[None]:
+        """Time one named part of the stage, recorded as the step_seconds gauge."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.set("step_seconds", time.perf_counter() - start, label)
+
+    def elapsed(self) -> float:
+        return self.seconds if self.seconds is not None else time.perf_counter() - self.started
+
+    def stop(self) -> None:
+        if self.seconds is None:
+            self.seconds = time.perf_counter() - self.started
+
+    def values(self) -> List[Tuple[str, str, float]]:
+        """(metric, label, value) for everything recorded, histograms as summary stats."""
+        elapsed = max(self.elapsed(), 1e-9)
+        with self.lock:
+            values = [("seconds", "", self.elapsed())]
+            for (name, label), value in sorted(self.counters.items()):
+                values.append((name, label, value))
+                if not label:
+                    values.append((f"{name}_per_second", label, value / elapsed))
+            values.extend((name, label, value) for (name, label), value in sorted(self.gauges.items()))
+            for (name, label), histogram in sorted(self.histograms.items()):
+                values.extend((f"{name}_{stat}", label, value) for stat, value in histogram.summary().items())
+                if not label:
+                    values.extend(
+                        (f"{name}_bucket", f"le={bound:g}", count)
+                        for bound, count in zip(histogram.bounds + (float("inf"),), histogram.counts)
+                    )
+        return values
+
+    def save(self, conn: duckdb.DuckDBPyConnection) -> None:
+        self.stop()
+        ensure_metrics_table(conn)
+        recorded_at = datetime.now()
+        conn.executemany(
+            "INSERT INTO pipeline_run_metrics VALUES (?, ?, ?, ?, ?, ?)",
+            [[self.run_id, self.stage, metric, label, value, recorded_at] for metric, label, value in self.values()],
+        )
+
+    def summary(self) -> Dict[str, float]:
+        """Values keyed by metric name, or "metric label" for labelled counters and gauges.
+        Labelled histograms (one per domain) and bucket counts are left out."""
+        with self.lock:
+            histograms = {name for name, _ in self.histograms}
+        summary = {}
+        for metric, label, value in self.values():
+            if not label:
+                summary[metric] = value
+            elif not any(metric.startswith(f"{name}_") for name in histograms):
+                summary[f"{metric} {label}"] = value
+        return summary
+
+    def slowest(self, name: str, limit: int = 10, min_count: int = 5) -> List[Tuple[str, Dict[str, float]]]:
+        """Labels with the highest p95 for histogram name, ignoring those with few samples."""
+        with self.lock:
+            labelled = [
+                (label, histogram.summary())
+                for (metric, label), histogram in self.histograms.items()
+                if metric == name and label and histogram.count >= min_count
+            ]
+        return sorted(labelled, key=lambda item: item[1]["p95"], reverse=True)[:limit]
@@ -0,0 +1,70 @@
+# data/assets/populate_story.py
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import duckdb
+
+from .db_connection import connection
+from .metrics import StageMetrics
+from .staging import merge_staging
+
+SCRIPTS_DIR = Path(__file__).parent / "scripts"
+
+
+def run_script(conn: duckdb.DuckDBPyConnection, name: str, params: Dict[str, Any] = None) -> Any:
+    sql = (SCRIPTS_DIR / name).read_text()
+    if params:
+        return conn.execute(sql, params)
+    return conn.execute(sql)
+
+
+def last_synced(conn: duckdb.DuckDBPyConnection) -> datetime:
+    row = conn.execute("SELECT synced_at FROM story_sync WHERE id = 1").fetchone()
+    return row[0] if row else datetime.min
+
+
+def populate_story(
+    full_rebuild: bool = False,
+    conn: Optional[duckdb.DuckDBPyConnection] = None,
+    metrics: Optional[StageMetrics] = None,
+) -> Dict[str, Any]:
+    """Merge new and changed staging rows into story, or rebuild it from scratch.
+
+    New stories are found by anti-joining stage_story with story, so they are never
+    missed. Updates to existing stories are found by import_date, which is set when
+    a newspaper or sentence row is (re)written.
+    """
+    metrics = metrics or StageMetrics("story_rebuild" if full_rebuild else "story_merge")
+    with connection(conn) as conn:
+        # Rows queue workers have staged but nobody has merged yet
+        merge_staging(conn)
+        try:
+            started = datetime.now()
+            conn.begin()
+            if full_rebuild:
+                conn.execute("DROP TABLE IF EXISTS story")
+                run_script(conn, "story_table.sql")
+                changed = run_script(conn, "populate_story.sql").fetchone()[0]
+            else:
+                run_script(conn, "story_table.sql")
+                changed = run_script(conn, "merge_story.sql", {"since": last_synced(conn)}).fetchone()[0]
+
+            conn.execute("INSERT OR REPLACE INTO story_sync (id, synced_at) VALUES (1, ?)", [started])
+            conn.commit()
+
+            story_count = conn.execute("SELECT COUNT(*) FROM story").fetchone()[0]
+            mode = "Rebuilt" if full_rebuild else "Merged"
+            print(f"{mode} story table: {changed} rows written, {story_count} stories")
+            metrics.count("rows_written", changed)
+            metrics.set("story_count", story_count)
+            metrics.save(conn)
+            return {"rows_written": changed, "story_count": story_count}
+        except Exception:
+            conn.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    import sys
+    populate_story(full_rebuild="--full" in sys.argv)
@@ -0,0 +1,96 @@
+# data/assets/profiler.py
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Trailing worker numbers, so a pool's threads share one root in the flamegraph
+THREAD_SUFFIX_RE = re.compile(r"[_-]\d+$")
+
+
+def frame_label(code) -> str:
+    """function (dir/file.py:first line), short enough to read in a flamegraph."""
+    parts = Path(code.co_filename).parts
+    return f"{code.co_name} ({'/'.join(parts[-2:])}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples the Python stack of every thread in this process every `interval` seconds
+    on a background thread, so the profiled code runs unmodified and overhead scales
+    with the sampling rate, not with how many calls it makes.
+
+    Only the thread that called start() and threads started after it are sampled, so
+    idle threads belonging to whatever hosts the code (Dagster, say) stay out of the
+    profile. Only this process is sampled: time spent in worker processes (the newspaper
+    parse pool, spaCy with n_process > 1) shows up as the main thread waiting on them.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.stopping = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.ignored: set = set()
+        self.started = 0.0
+        self.seconds = 0.0
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self.ignored = {t.ident for t in threading.enumerate()} - {threading.get_ident()}
+        self.thread = threading.Thread(target=self.run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.seconds = time.perf_counter() - self.started
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        labels: Dict[object, str] = {}
+        while not self.stopping.wait(self.interval):
+            names = {t.ident: THREAD_SUFFIX_RE.sub("", t.name) for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or ident in self.ignored:
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(f"thread {names.get(ident, ident)}")
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format, one "root;...;leaf count" line per
+        stack, as read by flamegraph.pl, speedscope and inferno."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write_collapsed(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.collapsed())
+        return path
+
+    def top(self, n: int = 20, thread_prefix: str = "") -> List[Tuple[str, int, int]]:
+        """(function, self samples, total samples) for the n functions with most self
+        samples. thread_prefix limits it to threads whose root starts with it."""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            if not frames[0].startswith(f"thread {thread_prefix}"):
+                continue
+            own[frames[-1]] += count
+            for frame in set(frames[1:]):
+                total[frame] += count
+        return [(frame, count, total[frame]) for frame, count in own.most_common(n)]
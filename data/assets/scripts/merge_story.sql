@@ -0,0 +1,73 @@
+-- Bring story up to date with stories that are new to it, or whose newspaper or
+-- sentence rows were imported after $since. Existing rows keep their id.
+MERGE INTO story AS st
+USING (
+    WITH changed AS (
+        SELECT media_cloud_id FROM stage_newspaper WHERE import_date > $since
+        UNION
+        SELECT media_cloud_id FROM stage_sentence WHERE import_date > $since
+        UNION
+        SELECT s.id FROM stage_story s
+        WHERE NOT EXISTS (SELECT 1 FROM story x WHERE x.media_cloud_id = s.id)
+    )
+    SELECT DISTINCT ON (v.url)
+        v.media_outlet_id,
+        v.media_cloud_id,
+        v.publish_date,
+        v.title,
+        v.url,
+        v.language,
+        v.authors,
+        v.image,
+        v.body,
+        v.summary,
+        v.sentence
+    FROM populate_story_view v
+    JOIN changed c ON c.media_cloud_id = v.media_cloud_id
+    -- Same url already stored under another id: the first one wins, as in a full rebuild
+    WHERE NOT EXISTS (
+        SELECT 1 FROM story x
+        WHERE x.url = v.url AND x.media_cloud_id <> v.media_cloud_id
+    )
+) AS src
+ON st.media_cloud_id = src.media_cloud_id
+WHEN MATCHED THEN UPDATE SET
+    edit_time       = CURRENT_TIMESTAMP,
+    media_outlet_id = src.media_outlet_id,
+    publish_date    = src.publish_date,
+    title           = src.title,
+    language        = src.language,
+    authors         = src.authors,
+    image           = src.image,
+    body            = src.body,
+    summary         = src.summary,
+    sentence        = src.sentence
+WHEN NOT MATCHED THEN INSERT (
+    syndicator_id,
+    media_outlet_id,
+    media_cloud_id,
+    publish_date,
+    title,
+    url,
+    language,
+    authors,
+    image,
+    body,
+    summary,
+    sentence,
+    active
+) VALUES (
+    1,                    -- syndicator_id (1 for now)
+    src.media_outlet_id,
+    src.media_cloud_id,
+    src.publish_date,
+    src.title,
+    src.url,
+    src.language,
+    src.authors,
+    src.image,
+    src.body,
+    src.summary,
+    src.sentence,
+    1                     -- active
+);
@@ -1,28 +1,3 @@
-DROP TABLE IF EXISTS story;
-
-
-CREATE SEQUENCE IF NOT EXISTS seq_story START 1;
-CREATE OR REPLACE TABLE story (
-    id                  INTEGER PRIMARY KEY DEFAULT nextval('seq_story'),
-    edit_time           TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    syndicator_id       INTEGER   NOT NULL DEFAULT 1,
-    media_outlet_id     INTEGER   NOT NULL DEFAULT 1,
-    media_cloud_id      VARCHAR   NOT NULL UNIQUE,
-    url                 VARCHAR   NOT NULL UNIQUE,
-    publish_date        DATE NOT NULL DEFAULT DATE '2000-01-01',
-    title               VARCHAR   NOT NULL,
-    language            VARCHAR   NOT NULL DEFAULT 'en',
-    authors             VARCHAR   NOT NULL DEFAULT '',
-    image               VARCHAR   NOT NULL DEFAULT '',
-    body                VARCHAR   NOT NULL DEFAULT '',
-    sentence            VARCHAR   NOT NULL DEFAULT '',
-    summary             VARCHAR   NOT NULL DEFAULT '',
-    active              BOOLEAN   NOT NULL DEFAULT TRUE,
-    FOREIGN KEY (syndicator_id)   REFERENCES syndicator(id),
-    FOREIGN KEY (media_outlet_id) REFERENCES media_outlet(id)
-);
-
-
 INSERT INTO story (
     syndicator_id,
     media_outlet_id,
@@ -0,0 +1,217 @@
+# data/assets/search_index.py
+import base64
+import json
+import re
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import duckdb
+
+from .db_connection import connection
+from .metrics import StageMetrics
+
+# Terms are sharded by their first PREFIX_LENGTH characters
+PREFIX_LENGTH = 2
+# A title match counts as this many body matches when ranking
+TITLE_WEIGHT = 3
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just me more most my myself no nor not now of off on once only or other our ours ourselves out
+over own said same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when where which while
+who whom why will with would you your yours yourself yourselves also its it's s t
+""".split())
+
+# Stories on the site, with the text to index
+INDEX_QUERY = """
+    SELECT s.id, s.title, s.sentence, s.body
+    FROM story s
+    JOIN story_web_view v ON v.id = s.id
+    WHERE v.media_outlet <> 'Unspecified'
+    ORDER BY s.id
+"""
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased, accent-folded alphanumeric tokens, without stopwords and single characters."""
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    return [t for t in TOKEN_RE.findall(folded) if len(t) > 1 and t not in STOPWORDS]
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_postings(postings: List[Tuple[int, int]]) -> str:
+    """(story id, weight) pairs sorted by id, as base64 varints of (id delta, weight)."""
+    out = bytearray()
+    previous = 0
+    for story_id, weight in postings:
+        encode_varint(story_id - previous, out)
+        encode_varint(weight, out)
+        previous = story_id
+    return base64.b64encode(bytes(out)).decode("ascii")
+
+
+def decode_postings(encoded: str) -> List[Tuple[int, int]]:
+    data = base64.b64decode(encoded)
+    values: List[int] = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+
+    postings = []
+    story_id = 0
+    for delta, weight in zip(values[0::2], values[1::2]):
+        story_id += delta
+        postings.append((story_id, weight))
+    return postings
+
+
+def shard_name(term: str) -> str:
+    return f"terms-{term[:PREFIX_LENGTH]}.json"
+
+
+def iter_documents(conn: duckdb.DuckDBPyConnection, batch_size: int = 500) -> Iterator[Tuple[int, str, str, str]]:
+    cursor = conn.execute(INDEX_QUERY)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from rows
+
+
+def build_search_index(
+    out_dir = "web/data/search",
+    conn: Optional[duckdb.DuckDBPyConnection] = None,
+    metrics: Optional[StageMetrics] = None,
+) -> Dict[str, int]:
+    """Build an inverted index over story title, sentence and body, sharded by term prefix.
+
+    Each shard is a JSON object of term -> encoded postings; manifest.json lists the shards
+    so the site (or SearchIndex) fetches only the one a query term falls in.
+    """
+    metrics = metrics or StageMetrics("search_index")
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    index: Dict[str, Dict[int, int]] = defaultdict(dict)
+    documents = 0
+    with connection(conn) as db:
+        for story_id, title, sentence, body in iter_documents(db):
+            documents += 1
+            weights: Dict[str, int] = defaultdict(int)
+            for term in tokenize(title):
+                weights[term] += TITLE_WEIGHT
+            for text in (sentence, body):
+                for term in tokenize(text):
+                    weights[term] += 1
+            for term, weight in weights.items():
+                index[term][story_id] = weight
+
+    shards: Dict[str, Dict[str, str]] = defaultdict(dict)
+    for term in sorted(index):
+        shards[shard_name(term)][term] = encode_postings(sorted(index[term].items()))
+
+    for name, terms in shards.items():
+        payload = json.dumps(terms, separators=(",", ":"))
+        (out_path / name).write_text(payload)
+        metrics.count("bytes_written", len(payload))
+    for stale in out_path.glob("terms-*.json"):
+        if stale.name not in shards:
+            stale.unlink()
+
+    (out_path / "manifest.json").write_text(json.dumps({
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "prefixLength": PREFIX_LENGTH,
+        "documents": documents,
+        "terms": len(index),
+        "stopwords": sorted(STOPWORDS),
+        "shards": sorted(shards),
+    }, indent=1))
+
+    print(f"Indexed {documents} stories: {len(index)} terms in {len(shards)} shards")
+    metrics.count("stories", documents)
+    metrics.set("terms", len(index))
+    metrics.set("shards", len(shards))
+    with connection(conn) as db:
+        metrics.save(db)
+    return {"documents": documents, "terms": len(index), "shards": len(shards)}
+
+
+class SearchIndex:
+    """Query API over the files written by build_search_index.
+
+    Shards are read on first use and kept in memory; postings are decoded per query term.
+    """
+
+    def __init__(self, index_dir = "web/data/search"):
+        self.index_dir = Path(index_dir)
+        manifest = json.loads((self.index_dir / "manifest.json").read_text())
+        self.shards = set(manifest["shards"])
+        self.documents = manifest["documents"]
+        self.load_shard = lru_cache(maxsize=None)(self._load_shard)
+
+    def _load_shard(self, name: str) -> Dict[str, str]:
+        if name not in self.shards:
+            return {}
+        return json.loads((self.index_dir / name).read_text())
+
+    def postings(self, term: str) -> List[Tuple[int, int]]:
+        encoded = self.load_shard(shard_name(term)).get(term)
+        return decode_postings(encoded) if encoded else []
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """Story ids containing every query term, best matches first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        scores: Optional[Dict[int, int]] = None
+        # Rarest term first keeps the running intersection small
+        for postings in sorted((self.postings(term) for term in terms), key=len):
+            if scores is None:
+                scores = dict(postings)
+            else:
+                scores = {story_id: scores[story_id] + weight for story_id, weight in postings if story_id in scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores, key=lambda story_id: (-scores[story_id], story_id))
+        return ranked[:limit] if limit else ranked
+
+
+@lru_cache(maxsize=4)
+def get_index(index_dir: str) -> SearchIndex:
+    return SearchIndex(index_dir)
+
+
+def search_stories(query: str, index_dir = "web/data/search", limit: Optional[int] = 20) -> List[int]:
+    return get_index(str(index_dir)).search(query, limit)
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        print(search_stories(" ".join(sys.argv[1:])))
+    else:
+        build_search_index()
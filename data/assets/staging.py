@@ -0,0 +1,194 @@
+# data/assets/staging.py
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import duckdb
+
+from .db_connection import connection, database_path
+
+# Columns staged per table, with Arrow types so every file has the same schema, and the
+# keys whose existing values a merge skips (the first one also dedupes across files).
+# Where several files stage the same key, "prefer" orders them, best first.
+# Existing rows matching "replace" are overwritten instead, e.g. failed fetches retried.
+# Listed in merge order: stories before the rows that hang off them.
+STAGED_TABLES: Dict[str, Dict[str, Any]] = {
+    "stage_story": {
+        "keys": ("id", "url"),
+        "columns": [
+            ("id", "string"), ("indexed_date", "string"), ("language", "string"),
+            ("media_name", "string"), ("media_url", "string"), ("publish_date", "string"),
+            ("title", "string"), ("url", "string"),
+        ],
+    },
+    "stage_newspaper": {
+        "keys": ("media_cloud_id",),
+        "prefer": "success DESC, import_date DESC",
+        "replace": "NOT success",
+        "columns": [
+            ("media_cloud_id", "string"), ("import_date", "timestamp"), ("title", "string"),
+            ("text", "string"), ("publish_date", "timestamp"), ("authors", "string"),
+            ("top_image", "string"), ("summary", "string"), ("success", "bool"), ("error", "string"),
+        ],
+    },
+    "stage_sentence": {
+        "keys": ("media_cloud_id",),
+        "prefer": "import_date DESC",
+        "columns": [("media_cloud_id", "string"), ("import_date", "timestamp"), ("sentence", "string")],
+    },
+    "html_archive": {
+        "keys": ("media_cloud_id",),
+        "prefer": "fetched_at DESC",
+        "columns": [
+            ("media_cloud_id", "string"), ("url", "string"), ("url_hash", "string"),
+            ("content_hash", "string"), ("shard", "string"), ("byte_length", "int32"),
+            ("fetched_at", "timestamp"),
+        ],
+    },
+}
+
+
+def default_staging_dir() -> Path:
+    """STAGING_DIR if set, otherwise staging/ next to the DuckDB file."""
+    configured = os.getenv("STAGING_DIR")
+    if configured:
+        return Path(configured)
+    return Path(database_path() or "db/data.duckdb").parent / "staging"
+
+
+def arrow_schema(table: str):
+    import pyarrow as pa
+
+    types = {"string": pa.string(), "timestamp": pa.timestamp("us"), "bool": pa.bool_(), "int32": pa.int32()}
+    return pa.schema([(name, types[kind]) for name, kind in STAGED_TABLES[table]["columns"]])
+
+
+def staged_files(table: str, staging_dir: Optional[Path] = None) -> List[Path]:
+    """Finished files for table; files still being written have a .tmp name."""
+    return sorted((Path(staging_dir or default_staging_dir()) / table).glob("*.parquet"))
+
+
+def staged_keys(table: str, staging_dir: Optional[Path] = None) -> List[str]:
+    """Key values waiting in staged files, for queues not to hand them out again."""
+    import pyarrow.parquet as pq
+
+    key = STAGED_TABLES[table]["keys"][0]
+    keys: List[str] = []
+    for path in staged_files(table, staging_dir):
+        keys.extend(pq.read_table(path, columns=[key]).column(key).to_pylist())
+    return keys
+
+
+class StagingWriter:
+    """Buffers rows for one staged table and writes them to Parquet files of this
+    writer's own, so any number of processes can produce rows with no database lock.
+
+    Each flush writes <staging dir>/<table>/<worker>-<n>.parquet under a temporary name
+    and renames it into place, so merge_staging never sees a partial file.
+    """
+
+    def __init__(self, table: str, worker: str, staging_dir: Optional[Path] = None):
+        self.table = table
+        self.worker = re.sub(r"[^\w.-]", "-", worker)
+        self.dir = Path(staging_dir or default_staging_dir()) / table
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.rows: List[Sequence[Any]] = []
+        self.files = 0
+
+    def add(self, row: Sequence[Any]) -> None:
+        """row holds the table's staged columns, in order."""
+        self.rows.append(row)
+
+    def flush(self) -> Optional[Path]:
+        if not self.rows:
+            return None
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = list(zip(*self.rows))
+        schema = arrow_schema(self.table)
+        table = pa.table(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema,
+        )
+        self.files += 1
+        path = self.dir / f"{self.worker}-{self.files:05d}.parquet"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+        self.rows.clear()
+        return path
+
+
+def merge_table(conn: duckdb.DuckDBPyConnection, table: str, files: List[Path]) -> int:
+    spec = STAGED_TABLES[table]
+    names = [name for name, _ in spec["columns"]]
+    # import_date becomes the merge time: populate_story picks up changes by import_date,
+    # and a row staged before its last sync but merged after it would otherwise be missed
+    selected = ", ".join("$merged_at" if name == "import_date" else name for name in names)
+    keys = spec["keys"]
+    # The preferred staged row per key wins, then the one from the last file by name, so
+    # the same files always merge to the same rows; rows already in the table are left alone
+    order = ", ".join(filter(None, (keys[0], spec.get("prefer"), "filename DESC")))
+    not_existing = " AND ".join(
+        f"NOT EXISTS (SELECT 1 FROM {table} t WHERE t.{key} = s.{key})" for key in keys
+    )
+    params: Dict[str, Any] = {"files": [str(f) for f in files]}
+    if spec.get("replace"):
+        conn.execute(f"""
+            DELETE FROM {table}
+            WHERE {spec["replace"]}
+            AND {keys[0]} IN (SELECT {keys[0]} FROM read_parquet($files))
+        """, params)
+    if "import_date" in names:
+        params["merged_at"] = datetime.now()
+    return conn.execute(f"""
+        INSERT INTO {table} ({", ".join(names)})
+        SELECT {selected} FROM (
+            SELECT DISTINCT ON ({keys[0]}) * FROM read_parquet($files, filename = true)
+            ORDER BY {order}
+        ) s
+        WHERE {not_existing}
+    """, params).fetchone()[0]
+
+
+def merge_staging(
+    conn: Optional[duckdb.DuckDBPyConnection] = None,
+    tables: Sequence[str] = tuple(STAGED_TABLES),
+    staging_dir: Optional[Path] = None,
+) -> Dict[str, int]:
+    """Bulk-load every finished staging file into its table in one transaction, then
+    delete the files. Running it again after a crash between the two is harmless,
+    since rows whose keys are already present are skipped."""
+    with connection(conn) as conn:
+        pending: List[Tuple[str, List[Path]]] = [
+            (table, staged_files(table, staging_dir)) for table in STAGED_TABLES if table in tables
+        ]
+        pending = [(table, files) for table, files in pending if files]
+        if not pending:
+            return {}
+
+        merged: Dict[str, int] = {}
+        conn.begin()
+        try:
+            if any(table == "html_archive" for table, _ in pending):
+                from .html_archive import ensure_archive_table
+                ensure_archive_table(conn)
+            for table, files in pending:
+                merged[table] = merge_table(conn, table, files)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        for table, files in pending:
+            for path in files:
+                path.unlink(missing_ok=True)
+            print(f"Merged {merged[table]} rows into {table} from {len(files)} staging files")
+        return merged
+
+
+if __name__ == "__main__":
+    merge_staging()
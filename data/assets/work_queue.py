@@ -0,0 +1,197 @@
+# data/assets/work_queue.py
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import duckdb
+
+from .db_connection import connect
+from .fetch_retry import FETCH_DUE_QUERY, ensure_fetch_retry_table
+from .staging import staged_keys
+
+# Stories each queue hands out: those its step hasn't written a row for yet, or, for
+# newspaper, whose fetch failed and is due a retry
+CANDIDATE_QUERIES: Dict[str, str] = {
+    "newspaper": f"SELECT id FROM ({FETCH_DUE_QUERY})",
+    "sentence": """
+        SELECT n.media_cloud_id FROM stage_newspaper n
+        WHERE n.text <> ''
+        AND NOT EXISTS (SELECT 1 FROM stage_sentence x WHERE x.media_cloud_id = n.media_cloud_id)
+    """,
+}
+# Where each queue's workers stage their results
+QUEUE_TABLES: Dict[str, str] = {"newspaper": "stage_newspaper", "sentence": "stage_sentence"}
+
+# Ids a live worker holds on queue $queue, for single-process runs to leave alone
+LEASED_QUERY = """
+    SELECT media_cloud_id FROM work_lease
+    WHERE queue = $queue AND NOT done AND owner IS NOT NULL AND lease_expires >= now()
+"""
+
+
+def ensure_work_queue_table(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS work_lease (
+            queue           VARCHAR   NOT NULL,
+            media_cloud_id  VARCHAR   NOT NULL,
+            owner           VARCHAR,              -- Worker holding the lease, NULL when free
+            lease_expires   TIMESTAMP,            -- Claimable by others once this passes
+            attempts        INTEGER   NOT NULL DEFAULT 0,
+            done            BOOLEAN   NOT NULL DEFAULT FALSE,
+            updated_at      TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (queue, media_cloud_id)
+        )
+    """)
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class WorkQueue:
+    """Hands out batches of story ids to any number of worker processes.
+
+    A claim leases ids to one owner for lease_seconds. The owner extends the lease
+    while it works (see Heartbeat), marks ids done once their rows are staged, or
+    releases them to be claimed again. Leases that run out, because their worker
+    crashed or hung, are claimable by anyone.
+
+    DuckDB lets one process at a time open the database for writing, so every call
+    opens a connection just for its statement and retries while another process
+    holds the file. Workers write their results to staging files (see staging.py)
+    rather than to the database.
+    """
+
+    def __init__(
+        self,
+        queue: str,
+        owner: Optional[str] = None,
+        lease_seconds: float = 300,
+        lock_timeout: float = 120,
+    ):
+        if queue not in CANDIDATE_QUERIES:
+            raise ValueError(f"Unknown queue {queue!r}, expected one of {list(CANDIDATE_QUERIES)}")
+        self.queue = queue
+        self.owner = owner or worker_id()
+        self.lease_seconds = lease_seconds
+        self.lock_timeout = lock_timeout
+
+    @contextmanager
+    def session(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """A connection of our own, waiting with backoff while another process has the file."""
+        deadline = time.monotonic() + self.lock_timeout
+        delay = 0.05
+        while True:
+            try:
+                conn = connect()
+                break
+            except duckdb.IOException as e:
+                if "lock" not in str(e).lower() or time.monotonic() > deadline:
+                    raise
+                time.sleep(delay * random.uniform(0.5, 1.5))
+                delay = min(delay * 2, 2.0)
+        try:
+            ensure_work_queue_table(conn)
+            ensure_fetch_retry_table(conn)
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self) -> int:
+        """Add candidates that aren't queued yet. A done id that is a candidate again
+        (a failed fetch due a retry, say) is reopened, unless its row is staged but not merged."""
+        staged = staged_keys(QUEUE_TABLES[self.queue])
+        with self.session() as conn:
+            return conn.execute(f"""
+                INSERT INTO work_lease (queue, media_cloud_id)
+                SELECT ?, id FROM ({CANDIDATE_QUERIES[self.queue]}) c(id)
+                WHERE id NOT IN (SELECT UNNEST(?::VARCHAR[]))
+                ON CONFLICT (queue, media_cloud_id) DO UPDATE SET
+                    done = FALSE, owner = NULL, lease_expires = NULL, updated_at = now()
+                WHERE work_lease.done
+            """, [self.queue, staged]).fetchone()[0]
+
+    def claim(self, batch_size: int = 100) -> List[str]:
+        """Lease up to batch_size free or expired ids to this worker, fewest attempts first."""
+        with self.session() as conn:
+            return [row[0] for row in conn.execute("""
+                UPDATE work_lease SET
+                    owner = $owner,
+                    lease_expires = now() + to_seconds($lease_seconds),
+                    attempts = attempts + 1,
+                    updated_at = now()
+                WHERE queue = $queue AND media_cloud_id IN (
+                    SELECT media_cloud_id FROM work_lease
+                    WHERE queue = $queue AND NOT done AND (owner IS NULL OR lease_expires < now())
+                    ORDER BY attempts, media_cloud_id
+                    LIMIT $batch_size
+                )
+                RETURNING media_cloud_id
+            """, {
+                "owner": self.owner,
+                "lease_seconds": self.lease_seconds,
+                "queue": self.queue,
+                "batch_size": batch_size,
+            }).fetchall()]
+
+    def heartbeat(self, ids: List[str]) -> int:
+        """Extend this worker's leases on ids; returns how many it still held."""
+        if not ids:
+            return 0
+        with self.session() as conn:
+            return self._update(conn, "lease_expires = now() + to_seconds($lease_seconds)", ids)
+
+    def complete(self, ids: List[str]) -> int:
+        """Mark ids done once their rows are staged."""
+        if not ids:
+            return 0
+        with self.session() as conn:
+            return self._update(conn, "done = TRUE, owner = NULL, lease_expires = NULL", ids)
+
+    def release(self, ids: List[str]) -> int:
+        """Give ids back unprocessed, e.g. on shutdown."""
+        if not ids:
+            return 0
+        with self.session() as conn:
+            return self._update(conn, "owner = NULL, lease_expires = NULL", ids)
+
+    def _update(self, conn: duckdb.DuckDBPyConnection, assignments: str, ids: List[str]) -> int:
+        params = {"owner": self.owner, "queue": self.queue, "ids": ids}
+        if "$lease_seconds" in assignments:
+            params["lease_seconds"] = self.lease_seconds
+        return conn.execute(f"""
+            UPDATE work_lease SET {assignments}, updated_at = now()
+            WHERE queue = $queue AND owner = $owner AND media_cloud_id IN (SELECT UNNEST($ids))
+        """, params).fetchone()[0]
+
+
+class Heartbeat:
+    """Extends a worker's leases every lease_seconds / 3 on a background thread while
+    a batch is being processed."""
+
+    def __init__(self, work_queue: WorkQueue, ids: List[str]):
+        self.work_queue = work_queue
+        self.ids = ids
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="lease-heartbeat", daemon=True)
+
+    def run(self) -> None:
+        while not self.stopping.wait(self.work_queue.lease_seconds / 3):
+            try:
+                self.work_queue.heartbeat(self.ids)
+            except Exception as e:
+                # A missed beat only matters if the lease runs out before the next one
+                print(f"    [warn] Lease heartbeat failed: {e}")
+
+    def __enter__(self) -> "Heartbeat":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stopping.set()
+        self.thread.join()
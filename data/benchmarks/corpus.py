@@ -0,0 +1,149 @@
+# data/benchmarks/corpus.py
+# Deterministic synthetic stories, article bodies and HTML pages for the benchmarks.
+# Everything is derived from (seed, story index), so the stand-in servers can render
+# any page on request without storing the corpus.
+import csv
+import datetime as dt
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List
+
+import duckdb
+
+SETUP_DIR = Path(__file__).parent.parent / "setup"
+SCRIPTS_DIR = Path(__file__).parent.parent / "assets" / "scripts"
+
+WORDS = """
+campaign committee donors lobbying spending election senate house candidate fundraising
+super pac dark money contributions industry report analysis federal filings disclosure
+governor mayor race district council policy bill vote administration agency contract
+million billion percent quarter cycle record data shows according group nonprofit
+""".split()
+
+MENTIONS = [
+    "according to data from OpenSecrets, the group has spent more than {n} million dollars on lobbying",
+    "OpenSecrets, which tracks money in politics, found {n} donors gave to both campaigns",
+    "an analysis by Open Secrets shows outside spending topped {n} million in the race",
+]
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    stories: int = 1000
+    body_words: int = 600           # Words per article body
+    mention_density: float = 0.5    # Share of articles that mention OpenSecrets
+    start_date: dt.date = dt.date(2024, 1, 1)
+    days: int = 365
+    seed: int = 0
+
+
+@lru_cache(maxsize=1)
+def outlets() -> List[Dict[str, str]]:
+    """Real outlets from media_outlets.csv, so stories join to media_outlet like production."""
+    with open(SETUP_DIR / "media_outlets.csv", encoding="utf-8-sig") as f:
+        return [row for row in csv.DictReader(f) if row["domain_name"] not in ("", "None")]
+
+
+def rng_for(spec: CorpusSpec, index: int) -> random.Random:
+    return random.Random(spec.seed * 1_000_003 + index)
+
+
+def story_id(index: int) -> str:
+    return f"bench-{index}"
+
+
+def story_row(spec: CorpusSpec, index: int, base_url: str) -> Dict[str, Any]:
+    """A Media Cloud story_list() item; base_url is the stand-in server that serves its page."""
+    rng = rng_for(spec, index)
+    outlet = outlets()[rng.randrange(len(outlets()))]
+    published = spec.start_date + dt.timedelta(days=rng.randrange(spec.days))
+    return {
+        "id": story_id(index),
+        "media_name": outlet["name"],
+        "media_url": outlet["domain_name"],
+        "title": f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {rng.choice(WORDS)} story {index}",
+        "publish_date": published.isoformat(),
+        "url": f"{base_url}/{outlet['domain_name']}/story/{index}",
+        "language": "en",
+        "indexed_date": None,
+    }
+
+
+def article_body(spec: CorpusSpec, index: int) -> str:
+    rng = rng_for(spec, index)
+    rng.random()  # keep the body stream independent of story_row's draws
+    paragraphs: List[str] = []
+    words_left = spec.body_words
+    mention_at = rng.randrange(max(1, spec.body_words // 60)) if rng.random() < spec.mention_density else None
+
+    while words_left > 0:
+        sentences = []
+        for _ in range(rng.randint(2, 4)):
+            length = min(words_left, rng.randint(8, 22))
+            if length <= 0:
+                break
+            words = [rng.choice(WORDS) for _ in range(length)]
+            sentences.append(" ".join(words).capitalize() + ".")
+            words_left -= length
+        if mention_at is not None and len(paragraphs) == mention_at:
+            sentences.append(rng.choice(MENTIONS).format(n=rng.randint(2, 90)).capitalize() + ".")
+        paragraphs.append(" ".join(sentences))
+    return "\n\n".join(paragraphs)
+
+
+def article_html(spec: CorpusSpec, index: int, base_url: str) -> str:
+    story = story_row(spec, index, base_url)
+    body = "\n".join(f"<p>{p}</p>" for p in article_body(spec, index).split("\n\n"))
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{story['title']} | {story['media_name']}</title>
+  <meta property="og:title" content="{story['title']}">
+  <meta property="og:image" content="{base_url}/images/{index}.jpg">
+  <meta property="article:published_time" content="{story['publish_date']}T08:00:00Z">
+  <meta name="author" content="Staff Writer {index % 37}">
+</head>
+<body>
+  <header><nav><a href="/">Home</a> <a href="/politics">Politics</a></nav></header>
+  <article>
+    <h1>{story['title']}</h1>
+    <div class="story-body">
+{body}
+    </div>
+  </article>
+  <footer><p>Copyright {story['media_name']}. All rights reserved.</p></footer>
+</body>
+</html>
+"""
+
+
+def build_database(path: Path) -> None:
+    """Create an empty pipeline database at path with the production schema and outlets."""
+    path = Path(path)
+    if path.exists():
+        path.unlink()
+    conn = duckdb.connect(str(path))
+    try:
+        for script in ("010_make_staging_tables.sql", "015_functions_macros.sql",
+                       "020_make_reference_tables.sql", "030_populate_reference_tables.sql"):
+            conn.execute((SETUP_DIR / script).read_text())
+        conn.execute(f"""
+            CREATE OR REPLACE TABLE stage_media_outlet AS
+            SELECT * FROM read_csv_auto('{SETUP_DIR / "media_outlets.csv"}')
+        """)
+        # 030 inserts the Unspecified outlet with an explicit id
+        conn.execute("SELECT nextval('seq_media_outlet')")
+        conn.execute((SETUP_DIR / "050_populate_media_outlet.sql").read_text())
+        conn.execute("""
+            CREATE TABLE stage_story (
+                id VARCHAR, media_name VARCHAR, media_url VARCHAR, title VARCHAR,
+                publish_date VARCHAR, url VARCHAR, language VARCHAR, indexed_date VARCHAR
+            )
+        """)
+        conn.execute((SCRIPTS_DIR / "story_table.sql").read_text())
+        conn.execute((SETUP_DIR / "070 views.sql").read_text())
+    finally:
+        conn.close()
@@ -0,0 +1,103 @@
+# data/benchmarks/http_standin.py
+# Serves saved OpenSecrets index and article pages so the scraper can be run without
+# touching opensecrets.org:
+#
+#   python -m data.benchmarks.http_standin [--port 8766] [--challenge] [--latency 0.2]
+#   OPENSECRETS_BASE_URL=http://127.0.0.1:8766 python -m data.assets.get_open_secrets
+#
+# --challenge answers clients without a cookie with a 403 "Just a moment..." page whose
+# script sets the cookie and reloads, as bot protection does; only the browser fallback
+# gets past it. --latency adds a delay per response to make concurrency visible.
+import argparse
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Tuple
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "opensecrets"
+COOKIE = "standin=ok"
+
+CHALLENGE_PAGE = f"""<!doctype html>
+<html><head><title>Just a moment...</title></head>
+<body>
+<p>Checking your browser before accessing the site.</p>
+<script>document.cookie = "{COOKIE}; path=/"; location.reload();</script>
+</body></html>
+"""
+
+INDEX_RE = re.compile(r"^/news/page/(\d+)/?$")
+ARTICLE_RE = re.compile(r"^/news/\d{4}/\d{2}/([\w-]+)/?$")
+
+
+def fixture_for(path: str) -> Optional[Path]:
+    if path in ("/", "/news", "/news/"):
+        return FIXTURES_DIR / "index-1.html"
+    match = INDEX_RE.match(path)
+    if match:
+        return FIXTURES_DIR / f"index-{match.group(1)}.html"
+    match = ARTICLE_RE.match(path)
+    if match:
+        return FIXTURES_DIR / "articles" / f"{match.group(1)}.html"
+    return None
+
+
+def make_handler(challenge: bool, latency: float):
+    class StandinHandler(BaseHTTPRequestHandler):
+        requests_served = 0
+        lock = threading.Lock()
+
+        def do_GET(self):
+            with StandinHandler.lock:
+                StandinHandler.requests_served += 1
+            if latency:
+                time.sleep(latency)
+
+            if challenge and COOKIE not in (self.headers.get("Cookie") or ""):
+                self.respond(403, CHALLENGE_PAGE.encode())
+                return
+
+            fixture = fixture_for(self.path.split("?")[0])
+            if fixture is None or not fixture.exists():
+                self.respond(404, b"<html><body>Not found</body></html>")
+                return
+            self.respond(200, fixture.read_bytes())
+
+        def respond(self, status: int, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandinHandler
+
+
+def start(port: int = 0, challenge: bool = False, latency: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stand-in on a background thread; returns the server and its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(challenge, latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve saved OpenSecrets pages")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--challenge", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, url = start(args.port, args.challenge, args.latency)
+    print(f"Serving {FIXTURES_DIR} at {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# data/benchmarks/import_time.py
+# Fails when loading the Dagster code location gets slow or starts importing heavy
+# libraries that only some assets need.
+#
+#   python -m data.benchmarks.import_time [budget_seconds]
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+MODULE = "data.orchestration.definitions"
+DEFAULT_BUDGET_SECONDS = 2.5
+RUNS = 5
+
+# Imported inside the functions that use them, never at code-location load
+HEAVY_MODULES = ["spacy", "newspaper", "mediacloud", "pandas", "brotli", "pyarrow", "lxml", "playwright"]
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import {MODULE}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "heavy_modules": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_once() -> Dict[str, Any]:
+    # A fresh interpreter each time, so nothing is already in sys.modules
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(budget_seconds: float = DEFAULT_BUDGET_SECONDS, runs: int = RUNS) -> Dict[str, Any]:
+    samples: List[Dict[str, Any]] = [measure_once() for _ in range(runs)]
+    best = min(sample["seconds"] for sample in samples)
+    heavy = sorted({m for sample in samples for m in sample["heavy_modules"]})
+    return {
+        "module": MODULE,
+        "best_seconds": best,
+        "samples": [sample["seconds"] for sample in samples],
+        "budget_seconds": budget_seconds,
+        "heavy_modules": heavy,
+        "passed": best <= budget_seconds and not heavy,
+    }
+
+
+def main() -> int:
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else float(os.getenv("IMPORT_BUDGET_SECONDS", DEFAULT_BUDGET_SECONDS))
+    report = run(budget)
+
+    print(f"Import {report['module']}: best {report['best_seconds']:.3f}s of {RUNS} (budget {budget:.2f}s)")
+    if report["heavy_modules"]:
+        print(f"FAIL: heavy modules imported at load time: {', '.join(report['heavy_modules'])}")
+    elif not report["passed"]:
+        print("FAIL: import time over budget")
+    else:
+        print("OK")
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
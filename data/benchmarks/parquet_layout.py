@@ -0,0 +1,150 @@
+# data/benchmarks/parquet_layout.py
+# Compares the old stories.parquet layout (one unsorted snappy row group, as df.to_parquet
+# wrote it) with the sorted, row-group-tuned layout make_stories_parquet writes now.
+#
+# For a few typical site queries it reports how many bytes a range-reading client such as
+# DuckDB-Wasm has to fetch: the footer plus the selected column chunks of every row group
+# whose min/max statistics can't rule it out. Page indexes can skip further, so this is an
+# upper bound for the tuned file.
+#
+#   python -m data.benchmarks.parquet_layout [out_dir] [row_group_rows]
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from data.assets.db_connection import connect
+from data.assets.make_stories_parquet import (
+    EXPORT_QUERY,
+    PARQUET_ROW_GROUP_ROWS,
+    camel_case_query,
+    stream_export,
+)
+
+# Columns the story list needs once filters are applied
+LIST_COLUMNS = ["id", "publishDate", "title", "url", "image", "mediaOutlet", "biasRating", "sentence"]
+
+
+def write_baseline(conn, path: Path) -> None:
+    import pyarrow.parquet as pq
+
+    table = conn.execute(camel_case_query(conn, EXPORT_QUERY)).fetch_record_batch().read_all()
+    pq.write_table(table, path)
+
+
+def sample_queries(conn) -> List[Tuple[str, Dict[str, Tuple[Any, Any]]]]:
+    """(name, {column: (min, max)}) filters modelled on what the site's charts do."""
+    latest, outlet, bias = conn.execute(f"""
+        SELECT
+            (SELECT date_trunc('month', MAX(publish_date))::DATE FROM ({EXPORT_QUERY})),
+            (SELECT mode(media_outlet) FROM ({EXPORT_QUERY})),
+            (SELECT mode(bias_rating) FROM ({EXPORT_QUERY}))
+    """).fetchone()
+    return [
+        ("latest month", {"publishDate": (latest, None)}),
+        (f"bias = {bias}", {"biasRating": (bias, bias)}),
+        (f"outlet = {outlet}", {"mediaOutlet": (outlet, outlet)}),
+        ("latest month and bias", {"publishDate": (latest, None), "biasRating": (bias, bias)}),
+    ]
+
+
+def overlaps(stats, low, high) -> bool:
+    if stats is None or not stats.has_min_max:
+        return True
+    if low is not None and stats.max < low:
+        return False
+    if high is not None and stats.min > high:
+        return False
+    return True
+
+
+def bytes_fetched(path: Path, filters: Dict[str, Tuple[Any, Any]]) -> Dict[str, int]:
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.metadata
+    names = parquet_file.schema_arrow.names
+    wanted = [names.index(col) for col in set(LIST_COLUMNS) | set(filters)]
+    file_size = path.stat().st_size
+
+    fetched = metadata.serialized_size   # the footer is always read
+    groups_read = rows_scanned = 0
+    for i in range(metadata.num_row_groups):
+        group = metadata.row_group(i)
+        if all(overlaps(group.column(names.index(col)).statistics, low, high) for col, (low, high) in filters.items()):
+            groups_read += 1
+            rows_scanned += group.num_rows
+            fetched += sum(group.column(c).total_compressed_size for c in wanted)
+    return {
+        "file_bytes": file_size,
+        "bytes_fetched": fetched,
+        "row_groups": metadata.num_row_groups,
+        "row_groups_read": groups_read,
+        "rows_scanned": rows_scanned,
+    }
+
+
+def matching_rows(conn, path: Path, filters: Dict[str, Tuple[Any, Any]]) -> int:
+    clauses, params = [], []
+    for col, (low, high) in filters.items():
+        if low is not None:
+            clauses.append(f'"{col}" >= ?')
+            params.append(low)
+        if high is not None:
+            clauses.append(f'"{col}" <= ?')
+            params.append(high)
+    return conn.execute(
+        f"SELECT COUNT(*) FROM read_parquet('{path}') WHERE {' AND '.join(clauses)}", params
+    ).fetchone()[0]
+
+
+def run(out_dir: Path, row_group_rows: int = PARQUET_ROW_GROUP_ROWS) -> Dict[str, Any]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    baseline = out_dir / "stories-baseline.parquet"
+    tuned = out_dir / "stories-tuned.parquet"
+
+    conn = connect()
+    try:
+        write_baseline(conn, baseline)
+        stream_export(conn, EXPORT_QUERY, parquet_path=tuned, row_group_rows=row_group_rows)
+
+        results = []
+        for name, filters in sample_queries(conn):
+            matched = matching_rows(conn, tuned, filters)
+            assert matched == matching_rows(conn, baseline, filters), f"{name}: files disagree"
+            results.append({
+                "query": name,
+                "rows_matched": matched,
+                "baseline": bytes_fetched(baseline, filters),
+                "tuned": bytes_fetched(tuned, filters),
+            })
+    finally:
+        conn.close()
+
+    return {"row_group_rows": row_group_rows, "queries": results}
+
+
+def main() -> int:
+    out_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(tempfile.mkdtemp(prefix="parquet_layout_"))
+    row_group_rows = int(sys.argv[2]) if len(sys.argv) > 2 else PARQUET_ROW_GROUP_ROWS
+    report = run(out_dir, row_group_rows)
+
+    first = report["queries"][0]
+    print(f"Files in {out_dir}")
+    print(f"Baseline: {first['baseline']['file_bytes']:>12,} bytes, {first['baseline']['row_groups']} row groups")
+    print(f"Tuned:    {first['tuned']['file_bytes']:>12,} bytes, {first['tuned']['row_groups']} row groups "
+          f"of up to {report['row_group_rows']:,} rows")
+    print()
+    print(f"{'query':<40} {'rows':>7} {'baseline fetched':>18} {'tuned fetched':>15} {'amplification':>14}")
+    for result in report["queries"]:
+        base, tuned = result["baseline"], result["tuned"]
+        amplification = f"{base['bytes_fetched'] / tuned['bytes_fetched']:.1f}x less" if tuned["bytes_fetched"] else "-"
+        print(
+            f"{result['query'][:40]:<40} {result['rows_matched']:>7,} "
+            f"{base['bytes_fetched']:>18,} {tuned['bytes_fetched']:>15,} {amplification:>14}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
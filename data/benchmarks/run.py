@@ -0,0 +1,165 @@
+# data/benchmarks/run.py
+# End-to-end pipeline benchmark on a synthetic corpus, with the network replaced by local
+# stand-ins (data/benchmarks/standins.py), so runs are offline and repeatable.
+#
+#   python -m data.benchmarks.run [--scales 1000,10000,50000] [--stages newspaper,export]
+#   python -m data.benchmarks.run --compare benchmark-results/abc123.json benchmark-results/def456.json
+#
+# For each scale a fresh database is built, then every stage runs in its own process in
+# pipeline order (data.benchmarks.stages), reporting throughput, p50/p95 latency and peak
+# RSS. Results go to benchmark-results/<commit>.json.
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .corpus import CorpusSpec, build_database
+from .stages import STAGES
+from .standins import ArticleServers
+
+RESULTS_DIR = Path("benchmark-results")
+EXCEPTION_RE = re.compile(r"^[\w.]+(Error|Exception): ")
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_stage(stage: str, db_path: Path, spec: CorpusSpec, params: Dict[str, Any]) -> Dict[str, Any]:
+    config = {"spec": {**asdict(spec), "start_date": spec.start_date.isoformat()}, "params": params}
+    env = {**os.environ, "DUCKDB_PATH": str(db_path)}
+    completed = subprocess.run(
+        [sys.executable, "-m", "data.benchmarks.stages", stage, json.dumps(config)],
+        capture_output=True, text=True, env=env,
+    )
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines() or ["no output"]
+        # The exception line, not whatever the exception message ends with
+        error = next((line for line in reversed(lines) if EXCEPTION_RE.match(line)), lines[-1])
+        return {"stage": stage, "scale": spec.stories, "error": error}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_scale(spec: CorpusSpec, stages: List[str], hosts: int, latency: float, work_dir: Path) -> List[Dict[str, Any]]:
+    db_path = work_dir / f"bench_{spec.stories}.duckdb"
+    build_database(db_path)
+    servers = ArticleServers(spec, hosts=hosts, latency=latency)
+    results = []
+    try:
+        params = {"base_urls": servers.base_urls}
+        for stage in stages:
+            print(f"  {stage} ({spec.stories} stories)...", flush=True)
+            result = run_stage(stage, db_path, spec, params)
+            print_result(result)
+            results.append(result)
+    finally:
+        servers.close()
+    return results
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    if "error" in result:
+        print(f"    failed: {result['error']}")
+        return
+    print(
+        f"    {result['items']} items in {result['seconds']:.2f}s "
+        f"({result['items_per_second']}/s), p50 {result['p50_ms']}ms, p95 {result['p95_ms']}ms, "
+        f"peak RSS {result['peak_rss_mb']}MB (workers {result['peak_child_rss_mb']}MB)"
+    )
+
+
+def ratio(new: Optional[float], old: Optional[float]) -> str:
+    if not new or not old:
+        return "-"
+    return f"{new / old:.2f}x"
+
+
+def compare(old_path: Path, new_path: Path) -> None:
+    """Print new/old ratios per stage and scale; throughput above 1x and latency or RSS
+    below 1x are improvements."""
+    old, new = (json.loads(Path(p).read_text()) for p in (old_path, new_path))
+    old_results = {(r["stage"], r["scale"]): r for r in old["results"]}
+    print(f"{old['commit']} -> {new['commit']}")
+    print(f"{'stage':<15}{'scale':>8}{'throughput':>12}{'p50':>8}{'p95':>8}{'peak RSS':>10}")
+    for result in new["results"]:
+        before = old_results.get((result["stage"], result["scale"]))
+        if before is None or "error" in before or "error" in result:
+            print(f"{result['stage']:<15}{result['scale']:>8}  not comparable")
+            continue
+        print(
+            f"{result['stage']:<15}{result['scale']:>8}"
+            f"{ratio(result['items_per_second'], before['items_per_second']):>12}"
+            f"{ratio(result['p50_ms'], before['p50_ms']):>8}"
+            f"{ratio(result['p95_ms'], before['p95_ms']):>8}"
+            f"{ratio(result['peak_rss_mb'], before['peak_rss_mb']):>10}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline on a synthetic corpus")
+    parser.add_argument("--scales", default="1000,5000", help="Comma-separated story counts")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages, in pipeline order")
+    parser.add_argument("--body-words", type=int, default=CorpusSpec.body_words)
+    parser.add_argument("--mention-density", type=float, default=CorpusSpec.mention_density)
+    parser.add_argument("--hosts", type=int, default=16, help="Stand-in article servers (one per loopback address)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every article response")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="Results file (default benchmark-results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    stages = [s for s in args.stages.split(",") if s]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages {sorted(unknown)}, expected some of {list(STAGES)}")
+
+    commit = git_commit()
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_") as work_dir:
+        for scale in (int(s) for s in args.scales.split(",")):
+            spec = CorpusSpec(
+                stories=scale,
+                body_words=args.body_words,
+                mention_density=args.mention_density,
+                seed=args.seed,
+            )
+            print(f"Scale {scale}:")
+            results.extend(run_scale(spec, stages, args.hosts, args.latency, Path(work_dir)))
+
+    out = args.out or RESULTS_DIR / f"{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({
+        "commit": commit,
+        "created": dt.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "corpus": {"body_words": args.body_words, "mention_density": args.mention_density,
+                   "hosts": args.hosts, "latency": args.latency, "seed": args.seed},
+        "results": results,
+    }, indent=2))
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# data/benchmarks/stages.py
+# One pipeline stage against a benchmark database, run in its own process by
+# data.benchmarks.run so peak RSS is per stage:
+#
+#   DUCKDB_PATH=... python -m data.benchmarks.stages <stage> '<json config>'
+#
+# Prints one JSON line: items processed, wall seconds, per-item latencies summarised
+# as p50/p95, and peak RSS of the process and of any worker processes it started.
+import datetime as dt
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from .corpus import CorpusSpec, article_body, story_id, story_row
+
+# Items timed one at a time for latency, on top of the batch run used for throughput
+LATENCY_SAMPLE = 100
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def peak_rss_mb() -> Dict[str, Any]:
+    try:
+        import resource
+    except ImportError:   # Windows
+        return {"peak_rss_mb": None, "peak_child_rss_mb": None}
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024   # ru_maxrss is bytes on macOS, KB on Linux
+    return {
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "peak_child_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+def repeat(run: Callable[[], int], times: int) -> Dict[str, Any]:
+    latencies = []
+    items = 0
+    for _ in range(times):
+        start = time.perf_counter()
+        items = run()
+        latencies.append(time.perf_counter() - start)
+    return {"items": items * times, "seconds": sum(latencies), "latencies": latencies}
+
+
+def media_cloud(conn, spec: CorpusSpec, config: Dict[str, Any]) -> Dict[str, Any]:
+    from data.assets.get_media_cloud import COLLECTION_IDS, harvest_media_cloud
+    from .standins import FakeMediaCloud
+
+    fake = FakeMediaCloud(spec, config["base_urls"], COLLECTION_IDS, page_size=config.get("page_size", 1000))
+    start = time.perf_counter()
+    harvest_media_cloud(
+        conn,
+        start_date=spec.start_date,
+        window_days=config.get("window_days", 7),
+        concurrency=config.get("concurrency", 4),
+        requests_per_second=1000,
+        search_api=fake,
+    )
+    seconds = time.perf_counter() - start
+    items = conn.execute("SELECT COUNT(*) FROM stage_story").fetchone()[0]
+    return {"items": items, "seconds": seconds, "latencies": fake.page_seconds}
+
+
+def newspaper(conn, spec: CorpusSpec, config: Dict[str, Any]) -> Dict[str, Any]:
+    from data.assets.get_newspaper import fetch_story, get_newspaper, parse_story
+
+    start = time.perf_counter()
+    results = get_newspaper(
+        concurrency=config.get("concurrency", 16),
+        domain_delay=config.get("domain_delay", 0.0),
+        parse_workers=config.get("parse_workers"),
+        profile=config.get("profile", "fast"),
+        conn=conn,
+    )
+    seconds = time.perf_counter() - start
+
+    latencies = []
+    for index in range(min(LATENCY_SAMPLE, spec.stories)):
+        story = story_row(spec, index, config["base_urls"][index % len(config["base_urls"])])
+        began = time.perf_counter()
+        html, _ = fetch_story((story["id"], story["url"]))
+        parse_story(story["url"], html or "", config.get("profile", "fast"))
+        latencies.append(time.perf_counter() - began)
+    return {"items": results["stories_found"], "seconds": seconds, "latencies": latencies}
+
+
+def sentence(conn, spec: CorpusSpec, config: Dict[str, Any]) -> Dict[str, Any]:
+    from data.assets.get_sentence import get_nlp, get_sentence, iter_sentences
+
+    start = time.perf_counter()
+    items = get_sentence(
+        n_process=config.get("n_process", 1),
+        segmenter=config.get("segmenter", "senter"),
+        conn=conn,
+    )
+    seconds = time.perf_counter() - start
+
+    nlp = get_nlp(config.get("segmenter", "senter"))
+    latencies = []
+    for index in range(min(LATENCY_SAMPLE, spec.stories)):
+        began = time.perf_counter()
+        list(iter_sentences(nlp, [(story_id(index), article_body(spec, index))], batch_size=1, n_process=1))
+        latencies.append(time.perf_counter() - began)
+    return {"items": items, "seconds": seconds, "latencies": latencies}
+
+
+def story_rebuild(conn, spec: CorpusSpec, config: Dict[str, Any]) -> Dict[str, Any]:
+    from data.assets.populate_story import populate_story
+
+    return repeat(lambda: populate_story(full_rebuild=True, conn=conn)["story_count"], config.get("repeats", 3))
+
+
+def story_merge(conn, spec: CorpusSpec, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Incremental merge after 1% of the articles were re-imported."""
+    from data.assets.populate_story import populate_story
+
+    def merge() -> int:
+        conn.execute("""
+            UPDATE stage_newspaper SET import_date = now()
+            WHERE media_cloud_id IN (SELECT media_cloud_id FROM stage_newspaper USING SAMPLE 1 PERCENT (bernoulli))
+        """)
+        return populate_story(conn=conn)["rows_written"]
+
+    return repeat(merge, config.get("repeats", 5))
+
+
+def export(conn, spec: CorpusSpec, config: Dict[str, Any]) -> Dict[str, Any]:
+    from data.assets.make_stories_parquet import make_stories_parquet
+
+    out = Path(tempfile.mkdtemp(prefix="bench_export_"))
+    return repeat(lambda: make_stories_parquet(
+        csv_path=out / "stories.csv",
+        parquet_path=out / "stories.parquet",
+        brotli_path=out / "stories.csv.br",
+        gzip_path=out / "stories.csv.gz",
+        site_dir=out / "site",
+        conn=conn,
+    ), config.get("repeats", 3))
+
+
+def search_index(conn, spec: CorpusSpec, config: Dict[str, Any]) -> Dict[str, Any]:
+    from data.assets.search_index import build_search_index
+
+    out = Path(tempfile.mkdtemp(prefix="bench_search_"))
+    return repeat(lambda: build_search_index(out, conn=conn)["documents"], config.get("repeats", 3))
+
+
+# In pipeline order; each stage reads what the one before it wrote
+STAGES: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "media_cloud": media_cloud,
+    "newspaper": newspaper,
+    "sentence": sentence,
+    "story_rebuild": story_rebuild,
+    "story_merge": story_merge,
+    "export": export,
+    "search_index": search_index,
+}
+
+
+def main() -> int:
+    stage, config = sys.argv[1], json.loads(sys.argv[2])
+    spec = CorpusSpec(**{**config["spec"], "start_date": dt.date.fromisoformat(config["spec"]["start_date"])})
+
+    from data.assets.db_connection import connect
+
+    conn = connect()
+    try:
+        # Stage output goes to stderr so stdout carries only the result line
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        try:
+            measured = STAGES[stage](conn, spec, config.get("params", {}))
+        finally:
+            sys.stdout = stdout
+    finally:
+        conn.close()
+
+    latencies_ms = [s * 1000 for s in measured["latencies"]]
+    result = {
+        "stage": stage,
+        "scale": spec.stories,
+        "items": measured["items"],
+        "seconds": round(measured["seconds"], 3),
+        "items_per_second": round(measured["items"] / measured["seconds"], 1) if measured["seconds"] else None,
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "latency_samples": len(latencies_ms),
+        **peak_rss_mb(),
+    }
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# data/benchmarks/standins.py
+# Local stand-ins for the network: HTTP servers that render the synthetic articles, and a
+# Media Cloud client whose story_list() pages through the synthetic stories.
+import datetime as dt
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from .corpus import CorpusSpec, article_html, story_row
+
+
+def make_article_handler(spec: CorpusSpec, base_url: str, latency: float):
+    class ArticleHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            parts = self.path.strip("/").split("/")
+            if len(parts) == 3 and parts[1] == "story" and parts[2].isdigit() and int(parts[2]) < spec.stories:
+                body = article_html(spec, int(parts[2]), base_url).encode()
+                status = 200
+            else:
+                body = b"<html><body>Not found</body></html>"
+                status = 404
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ArticleHandler
+
+
+class ArticleServers:
+    """One server per loopback address (127.0.0.1, 127.0.0.2, ...), so the newspaper
+    step's per-domain politeness sees `hosts` different domains, as with real outlets.
+
+    Loopback addresses other than 127.0.0.1 only exist by default on Linux; elsewhere
+    this falls back to a single host.
+    """
+
+    def __init__(self, spec: CorpusSpec, hosts: int = 16, latency: float = 0.0):
+        self.servers: List[ThreadingHTTPServer] = []
+        self.base_urls: List[str] = []
+        for i in range(max(1, hosts)):
+            address = f"127.0.0.{i + 1}"
+            try:
+                server = ThreadingHTTPServer((address, 0), BaseHTTPRequestHandler)
+            except OSError:
+                if i == 0:
+                    raise
+                break
+            base_url = f"http://{address}:{server.server_address[1]}"
+            server.RequestHandlerClass = make_article_handler(spec, base_url, latency)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.servers.append(server)
+            self.base_urls.append(base_url)
+
+    def base_url_for(self, index: int) -> str:
+        return self.base_urls[index % len(self.base_urls)]
+
+    def close(self) -> None:
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+
+class FakeMediaCloud:
+    """Drop-in for mediacloud.api.SearchApi.story_list over the synthetic corpus.
+
+    Stories are assigned to collections round-robin, so sharding by collection splits
+    them without overlap. The time between successive calls on the same thread (saving
+    the previous page, waiting on the rate limiter) is recorded per page.
+    """
+
+    def __init__(self, spec: CorpusSpec, base_urls: List[str], collection_ids: List[int],
+                 page_size: int = 1000, latency: float = 0.0):
+        self.spec = spec
+        self.base_urls = base_urls
+        self.page_size = page_size
+        self.latency = latency
+        self.by_date: Dict[dt.date, List[Tuple[int, int]]] = {}
+        for index in range(spec.stories):
+            story = story_row(spec, index, self.base_url_for(index))
+            collection = collection_ids[index % len(collection_ids)]
+            self.by_date.setdefault(dt.date.fromisoformat(story["publish_date"]), []).append((index, collection))
+
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.page_seconds: List[float] = []
+        self.calls = 0
+
+    def base_url_for(self, index: int) -> str:
+        return self.base_urls[index % len(self.base_urls)]
+
+    def story_list(
+        self,
+        query: str,
+        start_date: dt.date,
+        end_date: dt.date,
+        collection_ids: Optional[List[int]] = None,
+        pagination_token: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        now = time.perf_counter()
+        last = getattr(self.local, "last_call", None)
+        with self.lock:
+            self.calls += 1
+            if last is not None:
+                self.page_seconds.append(now - last)
+        if self.latency:
+            time.sleep(self.latency)
+
+        wanted = set(collection_ids or [])
+        matches: List[int] = []
+        day = start_date
+        while day <= end_date:
+            matches.extend(i for i, c in self.by_date.get(day, []) if not wanted or c in wanted)
+            day += dt.timedelta(days=1)
+
+        offset = int(pagination_token or 0)
+        page = [story_row(self.spec, i, self.base_url_for(i)) for i in matches[offset:offset + self.page_size]]
+        next_offset = offset + self.page_size
+        self.local.last_call = time.perf_counter()
+        return page, (str(next_offset) if next_offset < len(matches) else None)
@@ -1,81 +1,241 @@
-from dagster import asset, AssetExecutionContext, MaterializeResult
-from pathlib import Path
+from dagster import asset, AssetExecutionContext, Config, MaterializeResult, MetadataValue
+import datetime as dt
+import functools
+from typing import Any, Callable, Dict
 
 from data.assets.get_media_cloud import get_media_cloud
-from data.assets.get_newspaper import get_newspaper
+from data.assets.get_newspaper import backfill_summaries, get_newspaper, reparse_from_archive
 from data.assets.get_sentence import get_sentence
-from data.assets.make_stories_parquet import make_stories_parquet
+from data.assets.make_stories_parquet import make_stories_parquet, make_story_partitions
+from data.assets.metrics import StageMetrics
+from data.assets.populate_story import populate_story
+from data.assets.search_index import build_search_index
+from data.orchestration.resources import DuckDBResource, ProfilerResource
 
-from data.assets.db_connection import connect
+
+def profiled(fn: Callable[..., MaterializeResult]) -> Callable[..., MaterializeResult]:
+    """Run the asset body under ProfilerResource.profile and add what it found to the
+    asset's metadata. Goes below @asset; the asset takes a `profiler: ProfilerResource`."""
+    @functools.wraps(fn)
+    def wrapper(context: AssetExecutionContext, **kwargs) -> MaterializeResult:
+        with kwargs["profiler"].profile(context) as profile:
+            result = fn(context, **kwargs)
+        if profile:
+            result = result._replace(metadata={**(result.metadata or {}), **profile})
+        return result
+    return wrapper
+
+
+def stage_metadata(metrics: StageMetrics, slowest: str = "") -> Dict[str, Any]:
+    """A stage's metrics as asset metadata. Numeric entries are plotted run over run in
+    the asset's Plots tab; slowest names a histogram to list its worst labels for."""
+    metadata: Dict[str, Any] = {
+        metric.replace("_", " ").capitalize(): round(value, 3)
+        for metric, value in metrics.summary().items()
+    }
+    if slowest:
+        rows = [
+            f"| {label} | {stats['count']} | {stats['p50'] * 1000:.0f} | {stats['p95'] * 1000:.0f} |"
+            for label, stats in metrics.slowest(slowest)
+        ]
+        metadata[f"Slowest {slowest.replace('_', ' ')}"] = MetadataValue.md(
+            "| | count | p50 ms | p95 ms |\n|---|---|---|---|\n" + "\n".join(rows)
+        )
+    return metadata
+
+
+class MediaCloudConfig(Config):
+    window_days: int = 7                # Days of stories per shard
+    shard_by_collection: bool = False   # Also split each window by collection
+    concurrency: int = 4                # Shards harvested at once
+    requests_per_second: float = 1.0    # Across all shards
+    start_date: str = ""                # YYYY-MM-DD to backfill from, default latest story
 
 
 @asset (
     description = "Gets latest stories using the Media Cloud api",
     group_name="Import"
 )
-def media_cloud_asset(context: AssetExecutionContext):
-    stories_added = get_media_cloud()
+@profiled
+def media_cloud_asset(context: AssetExecutionContext, config: MediaCloudConfig, duckdb: DuckDBResource, profiler: ProfilerResource):
+    metrics = StageMetrics("media_cloud", run_id=context.run_id)
+    stories_added = get_media_cloud(
+        start_date=dt.date.fromisoformat(config.start_date) if config.start_date else None,
+        window_days=config.window_days,
+        shard_by_collection=config.shard_by_collection,
+        concurrency=config.concurrency,
+        requests_per_second=config.requests_per_second,
+        conn=duckdb.get_connection(),
+        metrics=metrics
+    )
     return MaterializeResult(
-        metadata = {"New Media Cloud stories added": stories_added}
+        metadata = {"New Media Cloud stories added": stories_added, **stage_metadata(metrics)}
     )
     
 
+class NewspaperConfig(Config):
+    concurrency: int = 8        # Total downloads in flight
+    domain_delay: float = 2.0   # Seconds between requests to the same domain
+    parse_workers: int = 0      # Processes parsing HTML, 0 for one per core
+    queue_size: int = 200       # Downloaded pages waiting to be parsed
+    breaker_threshold: int = 5  # Failures in a row before a domain is skipped for the run, 0 to never skip
+    profile: str = "fast"       # "fast" (lxml only, summary backfilled later) or "full" (newspaper3k + NLP)
+    reparse_from_archive: bool = False  # Rebuild stage_newspaper from archived HTML, no downloads
+
+
 @asset (
     deps=[media_cloud_asset],
     description = "Visit story to get body and metadata using the newspaper3k",
     group_name="Transform"
 )
-def newspaper_asset(context: AssetExecutionContext):
-    results = get_newspaper()
+@profiled
+def newspaper_asset(context: AssetExecutionContext, config: NewspaperConfig, duckdb: DuckDBResource, profiler: ProfilerResource):
+    if config.reparse_from_archive:
+        metrics = StageMetrics("newspaper_reparse", run_id=context.run_id)
+        results = reparse_from_archive(
+            parse_workers=config.parse_workers or None,
+            profile=config.profile,
+            conn=duckdb.get_connection(),
+            metrics=metrics
+        )
+    else:
+        metrics = StageMetrics("newspaper", run_id=context.run_id)
+        results = get_newspaper(
+            concurrency=config.concurrency,
+            domain_delay=config.domain_delay,
+            parse_workers=config.parse_workers or None,
+            queue_size=config.queue_size,
+            profile=config.profile,
+            breaker_threshold=config.breaker_threshold,
+            conn=duckdb.get_connection(),
+            metrics=metrics
+        )
     return MaterializeResult(
         metadata = {
             "Stories visited by newspaper": results["stories_found"],
-            "Stories not visited":          results["stories_not_found"]
+            "Stories not visited":          results["stories_not_found"],
+            "Downloads per minute":         round(results["download_per_min"], 1),
+            "Parses per minute":            round(results["parse_per_min"], 1),
+            "Writes per minute":            round(results["write_per_min"], 1),
+            **stage_metadata(metrics, slowest="fetch_seconds")
         }
     )
     
 
+class SentenceConfig(Config):
+    batch_size: int = 64        # Documents per nlp.pipe batch
+    n_process: int = 1          # spaCy worker processes
+    segmenter: str = "senter"   # "senter" (fast) or "parser"
+    window_chars: int = 1000    # Text segmented either side of a match, 0 for whole articles
+
+
 @asset (
     deps=[newspaper_asset],
     description = 'Find the longest sentence that has the text "OpenSecrets"',
     group_name="Transform"
     
 )
-def sentence_asset(context: AssetExecutionContext):
-    get_sentence()
-    
+@profiled
+def sentence_asset(context: AssetExecutionContext, config: SentenceConfig, duckdb: DuckDBResource, profiler: ProfilerResource):
+    metrics = StageMetrics("sentence", run_id=context.run_id)
+    stories_checked = get_sentence(
+        batch_size=config.batch_size,
+        n_process=config.n_process,
+        segmenter=config.segmenter,
+        window_chars=config.window_chars,
+        conn=duckdb.get_connection(),
+        metrics=metrics
+    )
+    return MaterializeResult(
+        metadata = {"Stories checked for a sentence": stories_checked, **stage_metadata(metrics)}
+    )
+
 
+# Chained after sentence_asset, not beside it: sibling assets run in separate processes,
+# and only one process at a time can open the DuckDB file for writing
 @asset (
     deps=[sentence_asset],
-    description = "Run sql script to drop/create story table and populate it",
+    description = "Backfill newspaper3k summaries for articles extracted with the fast profile",
     group_name="Transform"
-    
 )
-def story_asset(context: AssetExecutionContext):
-    sql_file = Path(__file__).parent.parent / "assets" / "scripts" / "populate_story.sql"
-    print(f"DEBUG: Executing SQL file at {sql_file}")
-    sql = sql_file.read_text()
-    
-    conn = connect()
-    conn.execute(sql)
+@profiled
+def summary_asset(context: AssetExecutionContext, duckdb: DuckDBResource, profiler: ProfilerResource):
+    summaries_added = backfill_summaries(conn=duckdb.get_connection())
+    return MaterializeResult(
+        metadata = {"Summaries added": summaries_added}
+    )
+
 
-    story_count = conn.execute("SELECT COUNT(*) FROM story").fetchone()[0]
+class StoryConfig(Config):
+    full_rebuild: bool = False  # Drop and repopulate story instead of merging changes
 
-    conn.close()    
-    context.log.info(f"Executed {sql_file.name}")
+
+@asset (
+    deps=[summary_asset],
+    description = "Merge new and changed stories into the story table, or rebuild it",
+    group_name="Transform"
+    
+)
+@profiled
+def story_asset(context: AssetExecutionContext, config: StoryConfig, duckdb: DuckDBResource, profiler: ProfilerResource):
+    metrics = StageMetrics("story_rebuild" if config.full_rebuild else "story_merge", run_id=context.run_id)
+    results = populate_story(full_rebuild=config.full_rebuild, conn=duckdb.get_connection(), metrics=metrics)
+    context.log.info("Rebuilt story table" if config.full_rebuild else "Merged changes into story table")
 
     return MaterializeResult(
-        metadata = {"Stories in story table": story_count}
+        metadata = {
+            "Stories in story table": results["story_count"],
+            "Story rows written":     results["rows_written"],
+            **stage_metadata(metrics)
+        }
     )
 
 
+class ExportConfig(Config):
+    partitioned: bool = False   # Write per-month files under web/data/partitions, only for changed months
+
+
 @asset (
     deps=[story_asset],
     description = "Write stories.parquet and stories.csv from story_web_view",
     group_name="Export"
 )
-def parquet_asset(context: AssetExecutionContext):
-    story_count = make_stories_parquet()
+@profiled
+def parquet_asset(context: AssetExecutionContext, config: ExportConfig, duckdb: DuckDBResource, profiler: ProfilerResource):
+    if config.partitioned:
+        metrics = StageMetrics("export_partitions", run_id=context.run_id)
+        results = make_story_partitions(conn=duckdb.cursor(), metrics=metrics)
+        return MaterializeResult(
+            metadata = {
+                "Stories in partitions":  results["story_count"],
+                "Partitions":             results["partitions"],
+                "Partitions rewritten":   results["rewritten"],
+                **stage_metadata(metrics)
+            }
+        )
+
+    metrics = StageMetrics("export", run_id=context.run_id)
+    story_count = make_stories_parquet(conn=duckdb.cursor(), metrics=metrics)
+    return MaterializeResult(
+        metadata = {"Stories in stories.parquet": story_count, **stage_metadata(metrics)}
+    )
+
+
+# After parquet_asset, not beside it, so the two never hold the DuckDB file at once
+@asset (
+    deps=[parquet_asset],
+    description = "Build the keyword search index over story title, sentence and body",
+    group_name="Export"
+)
+@profiled
+def search_index_asset(context: AssetExecutionContext, duckdb: DuckDBResource, profiler: ProfilerResource):
+    metrics = StageMetrics("search_index", run_id=context.run_id)
+    results = build_search_index(conn=duckdb.cursor(), metrics=metrics)
     return MaterializeResult(
-        metadata = {"Stories in stories.parquet": story_count}
-    )
\ No newline at end of file
+        metadata = {
+            "Stories indexed":  results["documents"],
+            "Terms":            results["terms"],
+            "Shards":           results["shards"],
+            **stage_metadata(metrics)
+        }
+    )
@@ -2,19 +2,30 @@ from dagster import Definitions
 from .assets import (
     media_cloud_asset,
     newspaper_asset,
+    summary_asset,
     sentence_asset,
     story_asset,
-    parquet_asset
+    parquet_asset,
+    search_index_asset
 )
+from .resources import DuckDBResource, ProfilerResource
 
 defs = Definitions(
     assets = [
         media_cloud_asset,
         newspaper_asset,
+        summary_asset,
         sentence_asset,
         story_asset,
-        parquet_asset
-    ]
+        parquet_asset,
+        search_index_asset
+    ],
+    resources = {
+        # Engine settings can be overridden per deployment in the resource config
+        "duckdb": DuckDBResource(),
+        # Set enabled: true (or PIPELINE_PROFILE=1) to profile every asset in the run
+        "profiler": ProfilerResource()
+    }
 )
 
 
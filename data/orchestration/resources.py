@@ -0,0 +1,110 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import duckdb
+from dagster import AssetExecutionContext, ConfigurableResource, InitResourceContext, MetadataValue
+from pydantic import PrivateAttr
+
+from data.assets.db_connection import connect
+
+
+class DuckDBResource(ConfigurableResource):
+    """The pipeline's DuckDB database, with its engine settings in one place.
+
+    One connection is opened on first use and shared by everything in the step (all
+    assets, with the in-process executor), then closed when the step ends. Settings
+    left as None keep DuckDB's defaults.
+    """
+
+    threads: Optional[int] = None                # Worker threads; DuckDB uses all cores by default
+    memory_limit: Optional[str] = None           # e.g. "4GB"; DuckDB default is 80% of RAM
+    temp_directory: Optional[str] = None         # Where large joins, sorts and exports spill to disk
+    preserve_insertion_order: bool = True        # False lets unordered queries stream with less memory
+    checkpoint_threshold: Optional[str] = None   # WAL size that triggers a checkpoint, e.g. "256MB"
+
+    _conn: Optional[duckdb.DuckDBPyConnection] = PrivateAttr(default=None)
+
+    def engine_config(self) -> Dict[str, Any]:
+        config: Dict[str, Any] = {"preserve_insertion_order": self.preserve_insertion_order}
+        if self.threads is not None:
+            config["threads"] = self.threads
+        if self.memory_limit:
+            config["memory_limit"] = self.memory_limit
+        if self.temp_directory:
+            config["temp_directory"] = self.temp_directory
+        if self.checkpoint_threshold:
+            config["checkpoint_threshold"] = self.checkpoint_threshold
+        return config
+
+    def get_connection(self) -> duckdb.DuckDBPyConnection:
+        if self._conn is None:
+            self._conn = connect(config=self.engine_config())
+        return self._conn
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """A separate cursor on the shared connection, for the export steps.
+
+        It reads and writes like the connection itself (the exports save metrics and use
+        TEMP tables), but has its own transaction, so a long export sees one snapshot and
+        doesn't disturb the connection's transaction state. Like the connection, it only
+        exists in this process, so it is no help with DuckDB's one-writer-process lock:
+        assets that touch the database are chained so they never run at the same time.
+        """
+        return self.get_connection().cursor()
+
+    def teardown_after_execution(self, context: InitResourceContext) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class ProfilerResource(ConfigurableResource):
+    """Opt-in sampling profiler around asset bodies, for finding where a slow run's time
+    went. Off unless enabled in the resource config or PIPELINE_PROFILE=1 is set; when
+    off, profile() only checks those two and yields.
+
+    Each profiled run writes <out_dir>/<asset>-<run id>.collapsed, a collapsed-stack file
+    for flamegraph.pl or speedscope, and adds the hottest functions to the asset metadata.
+    """
+
+    enabled: bool = False       # Or set PIPELINE_PROFILE=1
+    interval_ms: float = 5.0    # Time between stack samples
+    top_n: int = 20             # Hot functions listed in the asset metadata
+    out_dir: str = "profiles"   # Where the collapsed stacks are written
+
+    def is_enabled(self) -> bool:
+        return self.enabled or os.getenv("PIPELINE_PROFILE", "") not in ("", "0")
+
+    @contextmanager
+    def profile(self, context: AssetExecutionContext) -> Iterator[Dict[str, Any]]:
+        """Yields a dict that holds the profile's metadata once the block exits."""
+        metadata: Dict[str, Any] = {}
+        if not self.is_enabled():
+            yield metadata
+            return
+
+        from data.assets.profiler import SamplingProfiler
+
+        profiler = SamplingProfiler(self.interval_ms / 1000)
+        profiler.start()
+        try:
+            yield metadata
+        finally:
+            profiler.stop()
+            name = context.asset_key.to_python_identifier()
+            path = profiler.write_collapsed(Path(self.out_dir) / f"{name}-{context.run_id}.collapsed")
+            rows = [
+                f"| `{frame}` | {own / profiler.samples:.1%} | {total / profiler.samples:.1%} |"
+                for frame, own, total in profiler.top(self.top_n)
+            ] if profiler.samples else []
+            metadata.update({
+                "Profile": MetadataValue.path(str(path.resolve())),
+                "Profile samples": profiler.samples,
+                "Hot functions": MetadataValue.md(
+                    "Share of samples in the function itself, and in it or anything it called, "
+                    "summed over threads.\n\n| function | self | total |\n|---|---|---|\n" + "\n".join(rows)
+                ),
+            })
+            context.log.info(f"Wrote {profiler.samples} stack samples to {path}")
@@ -1,14 +1,15 @@
 import os
 from dotenv import load_dotenv
+from functools import lru_cache
 
 import duckdb
 
 
-def connect(read_only: bool = False):
+@lru_cache(maxsize=None)
+def database_path():
     load_dotenv()
-    DUCKDB_PATH = os.getenv("DUCKDB_PATH")
+    return os.getenv("DUCKDB_PATH")
 
-    print(f"DEBUG: DUCKDB_PATH = {DUCKDB_PATH}")  
-    print(f"DEBUG: .env loaded from: {os.getcwd()}") 
 
-    return duckdb.connect(database=DUCKDB_PATH, read_only=read_only)
\ No newline at end of file
+def connect(read_only: bool = False):
+    return duckdb.connect(database=database_path(), read_only=read_only)
@@ -0,0 +1,53 @@
+# tests/test_fetch_scheduler.py
+from data.assets.fetch_scheduler import DomainScheduler
+
+SKIPPED = "skipped"
+
+
+def failing_fetch(fetched):
+    """Fails every fetch from blocked.example, recording what was fetched."""
+    def fetch(item):
+        fetched.append(item[0])
+        return "error" if "blocked.example" in item[1] else "ok"
+    return fetch
+
+
+def batch(prefix, count, host="blocked.example"):
+    return [(f"{prefix}{i}", f"https://{host}/{prefix}/{i}") for i in range(count)]
+
+
+def run(scheduler, items, fetch):
+    results = scheduler.run(items, fetch, failed=lambda result: result == "error", skipped=lambda item: SKIPPED)
+    return {item[0]: result for item, result in results}
+
+
+def test_breaker_skips_rest_of_domain():
+    scheduler = DomainScheduler(concurrency=1, domain_delay=0, breaker_threshold=2)
+    fetched = []
+    results = run(scheduler, batch("a", 5), failing_fetch(fetched))
+
+    assert fetched == ["a0", "a1"]
+    assert [key for key, result in results.items() if result == SKIPPED] == ["a2", "a3", "a4"]
+    assert scheduler.open_domains == {"blocked.example": 3}
+
+
+def test_breaker_stays_open_across_runs():
+    scheduler = DomainScheduler(concurrency=1, domain_delay=0, breaker_threshold=2)
+    fetched = []
+    run(scheduler, batch("a", 5), failing_fetch(fetched))
+    fetched.clear()
+
+    results = run(scheduler, batch("b", 5) + batch("c", 2, host="ok.example"), failing_fetch(fetched))
+
+    assert fetched == ["c0", "c1"]
+    assert all(results[f"b{i}"] == SKIPPED for i in range(5))
+    assert scheduler.open_domains == {"blocked.example": 8}
+
+
+def test_success_resets_failure_count():
+    scheduler = DomainScheduler(concurrency=1, domain_delay=0, breaker_threshold=2)
+    outcomes = iter(["error", "ok", "error", "ok", "error"])
+    results = run(scheduler, batch("a", 5), lambda item: next(outcomes))
+
+    assert SKIPPED not in results.values()
+    assert not scheduler.open_domains
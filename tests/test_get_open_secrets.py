@@ -0,0 +1,133 @@
+# tests/test_get_open_secrets.py
+import datetime
+
+import duckdb
+import pytest
+
+from data.assets import db_connection, get_open_secrets
+from data.assets.get_open_secrets import HttpFetcher, PageFetcher, scrape_opensecrets_articles
+from data.benchmarks import http_standin
+from data.benchmarks.corpus import build_database
+
+FIXTURE_ARTICLES = 6
+
+
+@pytest.fixture
+def standin():
+    server, url = http_standin.start()
+    yield url
+    server.shutdown()
+
+
+@pytest.fixture
+def challenge_standin():
+    server, url = http_standin.start(challenge=True)
+    yield url
+    server.shutdown()
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    path = tmp_path / "data.duckdb"
+    build_database(path)
+    monkeypatch.setenv("DUCKDB_PATH", str(path))
+    monkeypatch.setenv("STAGING_DIR", str(tmp_path / "staging"))
+    db_connection.database_path.cache_clear()
+    yield path
+    db_connection.database_path.cache_clear()
+
+
+@pytest.fixture
+def site(standin, monkeypatch):
+    monkeypatch.setattr(get_open_secrets, "SITE_ROOT", standin)
+    monkeypatch.setattr(get_open_secrets, "BASE_URL", standin + "/news/page/{}")
+    return standin
+
+
+def scrape(**kwargs):
+    return scrape_opensecrets_articles(max_articles=100, mode="http", requests_per_second=0, **kwargs)
+
+
+def pages_crawled(path) -> int:
+    with duckdb.connect(str(path)) as conn:
+        return conn.execute("SELECT pages_crawled FROM opensecrets_crawl_state WHERE id = 1").fetchone()[0]
+
+
+def test_scrape_stages_and_merges_articles(database, site, tmp_path):
+    assert scrape() == FIXTURE_ARTICLES
+
+    with duckdb.connect(str(database)) as conn:
+        stories = conn.execute("""
+            SELECT s.url, s.indexed_date, s.publish_date, n.success, n.authors
+            FROM stage_story s JOIN stage_newspaper n ON n.media_cloud_id = s.id
+            WHERE s.media_name = 'OpenSecrets'
+        """).fetchall()
+    assert len(stories) == FIXTURE_ARTICLES
+    for url, indexed_date, publish_date, success, authors in stories:
+        assert url.startswith(site + "/news/20")
+        assert indexed_date.startswith(publish_date)
+        assert success
+    # Everything staged was merged and the files removed
+    assert not list((tmp_path / "staging").rglob("*.parquet"))
+
+
+def set_high_water_mark(path, newest_url, newest_publish_date) -> None:
+    with duckdb.connect(str(path)) as conn:
+        get_open_secrets.ensure_crawl_state_table(conn)
+        conn.execute(
+            "INSERT OR REPLACE INTO opensecrets_crawl_state VALUES (1, ?, ?, 0, 0, TRUE, now())",
+            [newest_url, newest_publish_date]
+        )
+
+
+def test_incremental_crawl_stops_after_known_pages(database, site):
+    scrape()
+    assert pages_crawled(database) == 3  # Both index pages, then the missing third
+
+    # Without a high-water mark, only the run of known pages stops the crawl
+    set_high_water_mark(database, None, None)
+    assert scrape(stop_after_known_pages=1) == 0
+    assert pages_crawled(database) == 1
+
+    set_high_water_mark(database, None, None)
+    assert scrape(stop_after_known_pages=2) == 0
+    assert pages_crawled(database) == 2
+
+
+def test_incremental_crawl_stops_at_high_water_mark_url(database, site):
+    newest = site + "/news/2025/10/despite-a-surge-in-support-for-cuomo-mamdani-still-leads-nyc-mayoral-race/"
+    set_high_water_mark(database, newest, datetime.date(2025, 10, 16))
+
+    assert scrape() == 3  # The rest of page 1, then stop
+    assert pages_crawled(database) == 1
+
+
+def test_incremental_crawl_stops_at_older_articles(database, site):
+    set_high_water_mark(database, site + "/news/2025/10/elsewhere/", datetime.date(2025, 10, 1))
+
+    assert scrape() == FIXTURE_ARTICLES  # Page 2 is all September, so page 3 isn't asked for
+    assert pages_crawled(database) == 2
+
+
+def test_challenge_page_needs_browser(challenge_standin):
+    url = challenge_standin + "/news/page/1"
+    fetcher = HttpFetcher()
+    try:
+        assert fetcher.fetch(url) is None
+    finally:
+        fetcher.close()
+
+    pages = PageFetcher("http", requests_per_second=0)
+    try:
+        assert pages.fetch(url) is None
+        assert pages.http_pages == 0
+    finally:
+        pages.close()
+
+
+def test_missing_page_is_empty(standin):
+    fetcher = HttpFetcher()
+    try:
+        assert fetcher.fetch(standin + "/news/page/99") == ""
+    finally:
+        fetcher.close()
@@ -0,0 +1,66 @@
+# tests/test_make_aggregates.py
+import json
+from datetime import date, timedelta
+
+import duckdb
+import pytest
+
+from data.assets.make_stories_parquet import (
+    EXPORT_QUERY, FACET_COLUMNS, FACET_PAIRS, TIME_BUCKETS, make_aggregates, to_camel_case,
+)
+from data.benchmarks.corpus import build_database
+
+STORIES = 40
+
+# The same time buckets make_aggregates derives, each computed by its own GROUP BY below
+BUCKETS = {
+    "day": "strftime(publish_date, '%Y-%m-%d')",
+    "week": "strftime(date_trunc('week', publish_date), '%Y-%m-%d')",
+    "month": "strftime(publish_date, '%Y-%m')",
+}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    path = tmp_path / "data.duckdb"
+    build_database(path)
+    with duckdb.connect(str(path)) as conn:
+        # A spread of outlets, plus the Unspecified outlet (id 1) the export leaves out
+        outlet_ids = [1] + [row[0] for row in conn.execute(
+            "SELECT id FROM media_outlet WHERE id > 1 ORDER BY id LIMIT 7"
+        ).fetchall()]
+        conn.executemany(
+            "INSERT INTO story (media_outlet_id, media_cloud_id, url, publish_date, title) VALUES (?, ?, ?, ?, ?)",
+            [
+                [outlet_ids[i % len(outlet_ids)], f"s{i}", f"https://example.com/{i}",
+                 date(2024, 1, 25) + timedelta(days=i * 3 % 17), f"Story {i}"]
+                for i in range(STORIES)
+            ],
+        )
+        yield conn
+
+
+def expected_counts(conn, columns):
+    selected = ", ".join(BUCKETS.get(col, f"COALESCE({col}, '')") for col in columns)
+    return sorted(
+        list(row) for row in conn.execute(f"""
+            SELECT {selected}, COUNT(*) FROM ({EXPORT_QUERY}) GROUP BY ALL
+        """).fetchall()
+    )
+
+
+def test_aggregates_match_group_by(conn, tmp_path):
+    path = tmp_path / "aggregates.json"
+    aggregates = make_aggregates(conn, path)
+
+    assert json.loads(path.read_text()) == aggregates
+    exported = conn.execute(f"SELECT COUNT(*) FROM ({EXPORT_QUERY})").fetchone()[0]
+    assert 0 < exported < STORIES
+    assert aggregates["total"] == exported
+
+    groupings = [(col,) for col in FACET_COLUMNS + TIME_BUCKETS] + list(FACET_PAIRS)
+    keys = {"|".join(to_camel_case(col) for col in group): group for group in groupings}
+    assert set(aggregates["groups"]) == set(keys)
+    assert "mediaOutlet|biasRating" in keys
+    for key, group in keys.items():
+        assert sorted(aggregates["groups"][key]) == expected_counts(conn, group), key
@@ -0,0 +1,60 @@
+# tests/test_populate_story.py
+from datetime import datetime, timedelta
+
+import duckdb
+import pytest
+
+from data.assets.populate_story import last_synced, populate_story
+from data.benchmarks.corpus import build_database
+
+STORY = "INSERT INTO stage_story VALUES (?, 'Example', 'example.com', ?, '2024-05-01', ?, 'en', NULL)"
+NEWSPAPER = "INSERT OR REPLACE INTO stage_newspaper VALUES (?, ?, ?, ?, NULL, '', '', ?, TRUE, NULL)"
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    path = tmp_path / "data.duckdb"
+    build_database(path)
+    monkeypatch.setenv("STAGING_DIR", str(tmp_path / "staging"))
+    with duckdb.connect(str(path)) as conn:
+        yield conn
+
+
+def stage(conn, media_cloud_id, title, body, imported):
+    conn.execute(STORY, [media_cloud_id, title, f"https://example.com/{media_cloud_id}"])
+    conn.execute(NEWSPAPER, [media_cloud_id, imported, title, body, f"Summary of {body}"])
+
+
+def stories(conn):
+    return dict(conn.execute("SELECT media_cloud_id, body FROM story ORDER BY media_cloud_id").fetchall())
+
+
+def test_merge_updates_changed_and_inserts_new_stories(conn):
+    imported = datetime.now() - timedelta(days=1)
+    stage(conn, "s1", "First", "first body", imported)
+    stage(conn, "s2", "Second", "second body", imported)
+
+    assert populate_story(conn=conn)["rows_written"] == 2
+    first_sync = last_synced(conn)
+    ids = dict(conn.execute("SELECT media_cloud_id, id FROM story").fetchall())
+
+    # s1 is fetched again, s3 is new, s2 is untouched
+    conn.execute(NEWSPAPER, ["s1", datetime.now(), "First", "first body, revised", "Summary"])
+    stage(conn, "s3", "Third", "third body", imported)
+
+    result = populate_story(conn=conn)
+
+    assert result == {"rows_written": 2, "story_count": 3}
+    assert stories(conn) == {"s1": "first body, revised", "s2": "second body", "s3": "third body"}
+    # Updated stories keep their id
+    assert conn.execute("SELECT id FROM story WHERE media_cloud_id = 's1'").fetchone()[0] == ids["s1"]
+    assert last_synced(conn) > first_sync
+
+
+def test_merge_with_nothing_changed_writes_nothing(conn):
+    stage(conn, "s1", "First", "first body", datetime.now() - timedelta(days=1))
+    populate_story(conn=conn)
+    first_sync = last_synced(conn)
+
+    assert populate_story(conn=conn)["rows_written"] == 0
+    assert last_synced(conn) > first_sync
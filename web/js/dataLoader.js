@@ -20,7 +20,9 @@ async function initDuckDB() {
     return db;
 }
 
-export async function loadParquetData(relativePath) {
+// stories.parquet is sorted by publishDate, mediaOutletType, biasRating and mediaOutlet in
+// small row groups with statistics, so a `where` on those columns only fetches the matching ranges
+export async function loadParquetData(relativePath, where = null, columns = '*') {
     const db = await initDuckDB();
     const conn = await db.connect();
     
@@ -38,7 +40,8 @@ export async function loadParquetData(relativePath) {
     );
     
     // Query the parquet file
-    const result = await conn.query(`SELECT * FROM '${filename}'`);
+    const filter = where ? ` WHERE ${where}` : '';
+    const result = await conn.query(`SELECT ${columns} FROM '${filename}'${filter}`);
     
     // Convert to array of objects
     const data = result.toArray().map(row => Object.fromEntries(row));
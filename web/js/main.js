@@ -1,20 +1,69 @@
 import {formatDate, addCommas, scrollToTop, biasColors} from './shared.js';
 import {RowChart} from './rowChart.js';
+import {KeywordSearch} from './search.js';
 
 // Not used. Expensive to download
 // import {loadParquetData} from './dataLoader.js';
 
-async function loadGzipCsv(url) {
+async function fetchGunzip(url) {
   const { gunzipSync } = await import('https://cdn.jsdelivr.net/npm/fflate@0.8.2/esm/browser.js');
 
   const res = await fetch(url);
   if (!res.ok) throw new Error(`Fetch failed for ${url}: ${res.status} ${res.statusText}`);
 
   const gz = new Uint8Array(await res.arrayBuffer());
-  const csvBytes = gunzipSync(gz);
-  const csvText = new TextDecoder().decode(csvBytes);
+  return new TextDecoder().decode(gunzipSync(gz));
+}
+
+async function loadGzipCsv(url) {
+  return d3.csvParse(await fetchGunzip(url));
+}
+
+// Compact index written by make_site_payload: ids, days since 1970 and facet codes.
+// Title, url, image etc. are in details-N.json.gz shards, loaded by loadDetails.
+async function loadSiteIndex(url) {
+  let text;
+  try {
+    text = await fetchGunzip(url);
+  } catch (e) {
+    return null;
+  }
+
+  const index = JSON.parse(text);
+  const columns = index.columns;
+  const facets = Object.keys(index.lookups);
+  const dayMs = 24 * 60 * 60 * 1000;
+
+  const stories = columns.id.map((id, i) => {
+    const story = {id: id, publishDate: new Date(columns.publishDay[i] * dayMs).toISOString().slice(0, 10)};
+    facets.forEach(facet => story[facet] = index.lookups[facet][columns[facet][i]]);
+    return story;
+  });
+  stories.shardSize = index.shardSize;
+  return stories;
+}
+
+// Per-month files written by make_story_partitions, fetched in parallel
+async function loadPartitions(manifestUrl) {
+  const res = await fetch(manifestUrl);
+  if (!res.ok) return null;
+
+  const manifest = await res.json();
+  const base = manifestUrl.replace(/[^\/]*$/, '');
+  const parts = await Promise.all(
+    Object.values(manifest.partitions).map(p => loadGzipCsv(base + p.files.gz))
+  );
+  return parts.flat();
+}
 
-  return d3.csvParse(csvText);
+// Counts by facet, time bucket and facet pair, written by make_aggregates
+async function loadAggregates(url) {
+  try {
+    const res = await fetch(url);
+    return res.ok ? await res.json() : null;
+  } catch (e) {
+    return null;
+  }
 }
 
 export class Site {
@@ -26,8 +75,23 @@ export class Site {
     const overlay = document.getElementById('loading-overlay');
     overlay.classList.replace('loading-hidden','loading-visible');
 
+    this.detailShards = new Map();
+    this.listRequest = 0;
+
+    // Paint charts from the precomputed counts while the stories download
+    this.preview = null;
+    this.dataLoaded = false;
+    loadAggregates('data/site/aggregates.json').then(aggregates => {
+      if (!aggregates || this.dataLoaded) return;
+      this.showPreview(aggregates);
+      overlay.classList.replace('loading-visible','loading-hidden');
+    });
+
     this.getData().then(stories => {
+      this.dataLoaded = true;
+      this.removePreview();
       this.stories = stories;
+      this.shardSize = stories.shardSize;
       this.stories.forEach(story => {
         story.count = 1;
         story.date = new Date(story.publishDate);
@@ -49,7 +113,12 @@ export class Site {
   }
 
   async getData() {
+    const siteIndex = await loadSiteIndex('data/site/index.json.gz');
+    if (siteIndex) return siteIndex;
+
     // Brotli would be a better choice, but can';'t control headers on github pages. 
+    const partitioned = await loadPartitions('data/partitions/manifest.json');
+    if (partitioned) return partitioned;
     return await loadGzipCsv('data/stories.csv.gz');
 
     // Parquet is wrong choice for smalller mostly text csvs. Extra time to load parquetjs-wasm and decode
@@ -57,22 +126,110 @@ export class Site {
     // return await loadParquetData('data/stories.parquet');
   }
 
+  // Fetch the detail shards covering these stories (each shard once) and copy their fields in
+  async loadDetails(stories) {
+    if (!this.shardSize) return;
+
+    const missing = stories.filter(d => d.url === undefined);
+    const shards = [...new Set(missing.map(d => Math.floor(d.id / this.shardSize)))];
+    await Promise.all(shards.map(shard => {
+      if (!this.detailShards.has(shard)) {
+        this.detailShards.set(shard, fetchGunzip(`data/site/details-${shard}.json.gz`).then(JSON.parse));
+      }
+      return this.detailShards.get(shard);
+    }));
+
+    for (const d of missing) {
+      const details = await this.detailShards.get(Math.floor(d.id / this.shardSize));
+      Object.assign(d, details[d.id]);
+      if (d.title == '') {
+        d.title = 'Link to story';
+      }
+    }
+  }
+
   setupCharts() {
     dc.refresh = this.refresh;
 
-    this.rowCharts = [
-      new RowChart(this.facts, 'mediaOutlet', dc.leftWidth, 160, this.refresh, 'Media Outlet', null),
-      new RowChart(this.facts, 'biasRating', 160, 6, this.refresh, 'Political Orientation', null),
-      new RowChart(this.facts, 'mediaOutletType', 200, 9, this.refresh, 'Media Type', null),
-      new RowChart(this.facts, 'state', 200, 100, this.refresh, 'State/Country', null)
+    this.rowCharts = this.makeRowCharts(() => this.facts, this.refresh);
+    this.setupSearch();
+  }
+
+  setupSearch() {
+    this.keyword = '';
+    this.keywordDim = this.facts.dimension(d => d.id);
+    this.search = new KeywordSearch('data/search');
+
+    const input = d3.select('#keyword-search');
+    this.search.load().then(loaded => {
+      if (!loaded) return;
+      input.style('display', null);
+
+      let pending = 0;
+      input.on('input', async event => {
+        const query = event.target.value;
+        const request = ++pending;
+        const ids = await this.search.search(query);
+        if (request !== pending) return;
+
+        this.keyword = ids ? query.trim() : '';
+        if (ids) {
+          this.keywordDim.filterFunction(id => ids.has(id));
+        } else {
+          this.keywordDim.filterAll();
+        }
+        dc.redrawAll();
+        this.refresh();
+      });
+    });
+  }
+
+  makeRowCharts(factsFor, updateFunction) {
+    return [
+      new RowChart(factsFor('mediaOutlet'), 'mediaOutlet', dc.leftWidth, 160, updateFunction, 'Media Outlet', null),
+      new RowChart(factsFor('biasRating'), 'biasRating', 160, 6, updateFunction, 'Political Orientation', null),
+      new RowChart(factsFor('mediaOutletType'), 'mediaOutletType', 200, 9, updateFunction, 'Media Type', null),
+      new RowChart(factsFor('state'), 'state', 200, 100, updateFunction, 'State/Country', null)
     ];
   }
 
+  // Read-only charts built from aggregate rows, each on its own small crossfilter.
+  // Rows are paired with biasRating where available so outlet colors match the real charts.
+  showPreview(aggregates) {
+    const groups = aggregates.groups;
+    const factsFor = attribute => {
+      const paired = groups[`${attribute}|biasRating`];
+      const rows = paired
+        ? paired.map(([key, biasRating, count]) => ({[attribute]: key, biasRating: biasRating, count: count}))
+        : (groups[attribute] || []).map(([key, count]) => ({[attribute]: key, count: count}));
+      return new crossfilter(rows);
+    };
+
+    this.preview = this.makeRowCharts(factsFor, () => {});
+    this.preview.forEach(rowChart => rowChart.chart.onClick = () => {});
+    dc.renderAll();
+
+    d3.select('#filters').html(`
+      <span class='case-count'>${addCommas(aggregates.total)} OpenSecrets citations</span>
+    `);
+  }
+
+  removePreview() {
+    if (!this.preview) return;
+
+    this.preview.forEach(rowChart => {
+      dc.deregisterChart(rowChart.chart);
+      d3.select(rowChart.chart.anchor()).remove();
+    });
+    this.preview = null;
+  }
+
   refresh() {
     window.site.listStories();
     window.site.showFilters();
 
     d3.select('#clear-filters').on('click', function() {
+      window.site.clearKeyword();
       dc.filterAll();
       dc.redrawAll();
       dc.refresh();
@@ -80,8 +237,19 @@ export class Site {
     });
   }
 
+  clearKeyword() {
+    if (!this.keywordDim) return;
+
+    this.keyword = '';
+    this.keywordDim.filterAll();
+    d3.select('#keyword-search').property('value', '');
+  }
+
   showFilters() {
     const filterTypes = [];
+    if (this.keyword) {
+      filterTypes.push({name: 'Keyword', filters: [this.keyword]});
+    }
     this.rowCharts.forEach(rowChart => {
       const chartFilters = rowChart.chart.filters();
       if (chartFilters.length > 0) {
@@ -112,7 +280,7 @@ export class Site {
     `);
   }
 
-  listStories() {
+  async listStories() {
     const storiesToShow = 60;
     function storyResult(d) {
       return `
@@ -141,9 +309,16 @@ export class Site {
       `;
     }
 
-    let html = this.facts.allFiltered()
+    const stories = this.facts.allFiltered()
       .sort((a, b) => new Date(b.date) - new Date(a.date))
-      .slice(0, storiesToShow)
+      .slice(0, storiesToShow);
+
+    // Filters can change while shards are loading; only the latest request renders
+    const request = ++this.listRequest;
+    await this.loadDetails(stories);
+    if (request !== this.listRequest) return;
+
+    let html = stories
       .map(d => storyResult(d))
       .join('');
 
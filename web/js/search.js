@@ -0,0 +1,81 @@
+// Keyword search over the index written by data/assets/search_index.py.
+// Only the shard for each query term's prefix is fetched, once.
+
+function decodePostings(encoded) {
+  const bytes = Uint8Array.from(atob(encoded), c => c.charCodeAt(0));
+  const postings = new Map();
+  let values = [];
+  let value = 0;
+  let shift = 0;
+  for (const byte of bytes) {
+    value |= (byte & 0x7f) << shift;
+    if (byte & 0x80) {
+      shift += 7;
+    } else {
+      values.push(value);
+      value = 0;
+      shift = 0;
+    }
+  }
+
+  let id = 0;
+  for (let i = 0; i + 1 < values.length; i += 2) {
+    id += values[i];
+    postings.set(id, values[i + 1]);
+  }
+  return postings;
+}
+
+export class KeywordSearch {
+
+  constructor(baseUrl) {
+    this.baseUrl = baseUrl;
+    this.manifest = null;
+    this.shards = new Map();
+  }
+
+  async load() {
+    const res = await fetch(`${this.baseUrl}/manifest.json`);
+    if (!res.ok) return false;
+
+    this.manifest = await res.json();
+    this.stopwords = new Set(this.manifest.stopwords);
+    this.shardNames = new Set(this.manifest.shards);
+    return true;
+  }
+
+  // Same rules as tokenize() in search_index.py
+  tokenize(text) {
+    const folded = text.normalize('NFKD').replace(/[^\x00-\x7f]/g, '').toLowerCase();
+    return (folded.match(/[a-z0-9]+/g) || [])
+      .filter(t => t.length > 1 && !this.stopwords.has(t));
+  }
+
+  shard(term) {
+    const name = `terms-${term.slice(0, this.manifest.prefixLength)}.json`;
+    if (!this.shardNames.has(name)) return Promise.resolve({});
+
+    if (!this.shards.has(name)) {
+      this.shards.set(name, fetch(`${this.baseUrl}/${name}`).then(res => res.json()));
+    }
+    return this.shards.get(name);
+  }
+
+  // Ids of stories containing every term in the query, or null for an empty query
+  async search(query) {
+    const terms = [...new Set(this.tokenize(query))];
+    if (terms.length === 0) return null;
+
+    const postings = await Promise.all(terms.map(async term => {
+      const encoded = (await this.shard(term))[term];
+      return encoded ? decodePostings(encoded) : new Map();
+    }));
+    postings.sort((a, b) => a.size - b.size);
+
+    let ids = new Set(postings[0].keys());
+    for (const more of postings.slice(1)) {
+      ids = new Set([...ids].filter(id => more.has(id)));
+    }
+    return ids;
+  }
+}